@@ -9,16 +9,34 @@ VERSIÓN CON MODELO PROFESIONAL INTEGRADO
 """
 
 import os
+
+# ✅ MODO DEL SERVIDOR: 'threading' (desarrollo, Werkzeug) o 'eventlet'/'gevent' (producción)
+# El monkey patching debe ocurrir antes de importar cualquier otro módulo
+ASYNC_MODE = os.environ.get('PIANO_ASYNC_MODE', 'threading').lower()
+if ASYNC_MODE == 'eventlet':
+    try:
+        import eventlet
+        eventlet.monkey_patch()
+    except ImportError:
+        print("⚠️ eventlet no está instalado. Ejecuta: pip install eventlet")
+        ASYNC_MODE = 'threading'
+elif ASYNC_MODE == 'gevent':
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        print("⚠️ gevent no está instalado. Ejecuta: pip install gevent gevent-websocket")
+        ASYNC_MODE = 'threading'
+
 import sys
 import time
 import numpy as np
-import cv2
 import mediapipe as mp
 import pygame
 import tensorflow as tf
 import json
 import joblib  # ✅ AGREGADO para cargar scaler y encoder profesional
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, abort
 from flask_socketio import SocketIO, emit
 try:
     from flask_cors import CORS
@@ -26,7 +44,6 @@ try:
 except ImportError:
     CORS_AVAILABLE = False
     print("⚠️ flask-cors no está instalado. Ejecuta: pip install flask-cors")
-import base64
 import logging
 
 # Configurar logging
@@ -54,8 +71,19 @@ if not os.path.exists(PROFESSIONAL_MODEL_PATH):
 
 # Otras rutas
 AUDIO_DIR = os.path.join(BASE_DIR, 'dataset', 'dataset_audio')
+
+# ✅ SALIDA DE AUDIO: 'server' (altavoces del servidor), 'client' (el navegador
+# reproduce desde su caché de samples) o 'both'
+AUDIO_OUTPUT = os.environ.get('PIANO_AUDIO_OUTPUT', 'server').lower()
+# El motor de audio del servidor solo se crea si suena por sus altavoces
+SERVER_AUDIO = AUDIO_OUTPUT in ('server', 'both')
+JITTER_BUFFER_MS = int(os.environ.get('PIANO_JITTER_BUFFER_MS', 30))
 JSON_DATA_DIR = os.path.join(BASE_DIR, 'captured_data')
 
+# ✅ GRABACIÓN DE SESIONES: landmarks por cliente en JSONL para reproducirlos
+# offline (benchmarks/bench_filtro.py). Desactivado si no se define
+RECORD_DIR = os.environ.get('PIANO_RECORD_DIR')
+
 # Verificar existencia de archivos
 print(f"Verificando archivos:")
 print(f"- Modelo original: {'✅ Existe' if os.path.exists(MODEL_PATH) else '❌ No existe'}")
@@ -69,15 +97,19 @@ print(f"- JSON Data: {'✅ Existe' if os.path.exists(JSON_DATA_DIR) else '❌ No
 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
 
 # Inicializar MediaPipe
-try:
-    mp_hands = mp.solutions.hands
-    mp_drawing = mp.solutions.drawing_utils
-    hands = mp_hands.Hands(
+def create_hands_detector(max_num_hands=1):
+    """Crear el detector de manos de MediaPipe"""
+    return mp_hands.Hands(
         static_image_mode=False,
-        max_num_hands=1,
+        max_num_hands=max_num_hands,
         min_detection_confidence=0.7,
         min_tracking_confidence=0.5
     )
+
+try:
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    hands = create_hands_detector(max_num_hands=1)
     print("✅ MediaPipe inicializado correctamente")
 except Exception as e:
     print(f"⚠️ Error inicializando MediaPipe: {e}")
@@ -96,8 +128,63 @@ app.config['TEMPLATES_AUTO_RELOAD'] = True
 if CORS_AVAILABLE:
     CORS(app)
 
-# Inicializar SocketIO con modo threading
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# ✅ COLA DE MENSAJES para despliegue multi-proceso (servidor_multiproceso.py)
+# redis://host:6379/0 en producción o local://127.0.0.1:6380 con el broker local
+MESSAGE_QUEUE = os.environ.get('PIANO_MESSAGE_QUEUE')
+socketio_options = {}
+if MESSAGE_QUEUE and MESSAGE_QUEUE.startswith('local://'):
+    sys.path.append(BASE_DIR)
+    from utils.broker_utils import LocalBrokerManager
+    socketio_options['client_manager'] = LocalBrokerManager(MESSAGE_QUEUE)
+elif MESSAGE_QUEUE:
+    socketio_options['message_queue'] = MESSAGE_QUEUE
+
+# Inicializar SocketIO con el modo asíncrono seleccionado
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, **socketio_options)
+
+# Servidor
+SERVER_HOST = os.environ.get('PIANO_HOST', '127.0.0.1')
+SERVER_PORT = int(os.environ.get('PIANO_PORT', 5000))
+
+# ✅ DESCARGA DE TRABAJO CPU (decodificación, MediaPipe, inferencia)
+# En eventlet/gevent el trabajo pesado se ejecuta en hilos reales del sistema
+# para que el event loop siga atendiendo pings y otros clientes.
+CPU_WORKERS = int(os.environ.get('PIANO_CPU_WORKERS', 4))
+# El listener del broker local espera mensajes en un hilo del pool de forma permanente
+POOL_THREADS = CPU_WORKERS + (1 if 'client_manager' in socketio_options else 0)
+
+if ASYNC_MODE == 'eventlet':
+    from eventlet import tpool
+    tpool.set_num_threads(POOL_THREADS)
+elif ASYNC_MODE == 'gevent':
+    import gevent
+    gevent.get_hub().threadpool.maxsize = POOL_THREADS
+
+# MediaPipe Hands no es thread-safe: un detector por hilo de CPU (hasta
+# CPU_WORKERS) para que los frames de varios clientes se procesen en paralelo
+sys.path.append(BASE_DIR)
+from utils.native_threading import ResourcePool
+hands_pool = ResourcePool(lambda: create_hands_detector(max_num_hands=1), CPU_WORKERS)
+if hands is not None:
+    hands_pool.reset(hands_pool.factory, seed=hands)
+
+def run_cpu_bound(func, *args):
+    """
+    Ejecuta una función CPU-bound sin bloquear el servidor
+    
+    Args:
+        func: Función a ejecutar
+        *args: Argumentos de la función
+        
+    Returns:
+        Resultado de la función
+    """
+    if ASYNC_MODE == 'eventlet':
+        return tpool.execute(func, *args)
+    if ASYNC_MODE == 'gevent':
+        return gevent.get_hub().threadpool.apply(func, args)
+    # En modo threading cada evento ya corre en su propio hilo
+    return func(*args)
 
 # Variables globales para ML original
 model = None
@@ -108,11 +195,14 @@ label_encoder = None
 model_professional = None
 scaler_professional = None
 label_encoder_professional = None
+professional_input_features = 63  # 63 (una mano) o 126 (ambas manos), detectado del modelo
+feature_pipeline_professional = None  # Pipeline de features versionado guardado con el modelo
 
 # ✅ FUNCIÓN PARA CARGAR MODELO PROFESIONAL (NUEVO)
 def load_trained_professional_model():
     """Cargar el modelo profesional que entrenaste"""
     global model_professional, scaler_professional, label_encoder_professional
+    global professional_input_features, feature_pipeline_professional, hands
     
     print("\n🚀 CARGANDO TU MODELO PROFESIONAL ENTRENADO...")
     print("-" * 50)
@@ -135,6 +225,25 @@ def load_trained_professional_model():
         print(f"📥 Cargando modelo: {os.path.basename(PROFESSIONAL_MODEL_PATH)}")
         model_professional = tf.keras.models.load_model(PROFESSIONAL_MODEL_PATH, compile=False)
         
+        # Pipeline de features con el que se entrenó (raw-1 si el modelo no lo guarda)
+        feature_pipeline_professional = load_pipeline(pipeline_path_for(PROFESSIONAL_MODEL_PATH))
+        print(f"🧮 Pipeline de features: {feature_pipeline_professional.version}")
+        
+        # Detectar la forma de entrada soportada (una o dos manos por fila)
+        input_features = get_model_input_features(model_professional, feature_pipeline_professional.features_per_hand)
+        if input_features is None:
+            print(f"❌ Input shape no soportado por el pipeline {feature_pipeline_professional.version}: "
+                  f"{model_professional.input_shape}")
+            model_professional = None
+            return False
+        professional_input_features = input_features
+        
+        # Un modelo de dos manos necesita que MediaPipe detecte ambas
+        if professional_input_features == 2 * feature_pipeline_professional.features_per_hand and hands is not None:
+            hands = create_hands_detector(max_num_hands=2)
+            hands_pool.reset(lambda: create_hands_detector(max_num_hands=2), seed=hands)
+            print("✋✋ MediaPipe reconfigurado para detectar ambas manos")
+        
         # Recompilar para asegurar compatibilidad
         model_professional.compile(
             optimizer='adam',
@@ -145,6 +254,7 @@ def load_trained_professional_model():
         # Cargar scaler
         print(f"📏 Cargando scaler...")
         scaler_professional = joblib.load(PROFESSIONAL_SCALER_PATH)
+        check_compatibility(feature_pipeline_professional, professional_input_features, scaler_professional)
         
         # Cargar encoder
         print(f"🏷️ Cargando encoder...")
@@ -159,10 +269,11 @@ def load_trained_professional_model():
         
         # Realizar predicción de prueba
         print("🧪 Realizando predicción de prueba...")
-        test_features = np.random.random((1, 63)).astype(np.float32)
+        test_features = np.random.random((1, professional_input_features)).astype(np.float32)
         test_normalized = scaler_professional.transform(test_features)
-        test_prediction = model_professional.predict(test_normalized, verbose=0)
-        test_note_idx = np.argmax(test_prediction)
+        test_prediction = select_note_head(model_professional.predict(test_normalized, verbose=0),
+                                           len(label_encoder_professional.classes_))
+        test_note_idx = np.argmax(test_prediction[0])
         test_note = label_encoder_professional.inverse_transform([test_note_idx])[0]
         test_confidence = float(test_prediction[0][test_note_idx])
         print(f"✅ Predicción de prueba exitosa: {test_note} ({test_confidence:.3f})")
@@ -174,36 +285,50 @@ def load_trained_professional_model():
         model_professional = None
         scaler_professional = None
         label_encoder_professional = None
+        feature_pipeline_professional = None
         return False
 
 # ✅ FUNCIÓN PARA PREDECIR CON MODELO PROFESIONAL (NUEVO)
-def predict_with_professional_model(landmarks):
-    """Predecir nota usando tu modelo profesional entrenado"""
+def predict_with_professional_model(landmarks, hands_by_label=None):
+    """
+    Predecir nota usando tu modelo profesional entrenado
+    
+    Args:
+        landmarks: Landmarks de la mano principal (compatibilidad)
+        hands_by_label: dict opcional {'Left': landmarks, 'Right': landmarks}
+        
+    Returns:
+        tuple: (nota, confianza, método)
+    """
     global model_professional, scaler_professional, label_encoder_professional
     
     if not all([model_professional, scaler_professional, label_encoder_professional]):
         return None, 0.0, "model_not_loaded"
     
     try:
-        # Convertir landmarks a features (63 valores)
-        features = []
-        for landmark in landmarks:
-            if hasattr(landmark, 'x'):  # MediaPipe landmark
-                features.extend([landmark.x, landmark.y, landmark.z])
-            else:  # Lista de coordenadas
-                features.extend([landmark[0], landmark[1], landmark[2]])
-        
-        if len(features) != 63:
+        if not hands_by_label:
+            hands_by_label = {'Right': landmarks}
+        
+        # Construir features de todas las manos en una sola operación
+        features_batch, mask, row_labels = build_feature_batch(hands_by_label, professional_input_features,
+                                                               feature_pipeline_professional)
+        if features_batch is None:
             return None, 0.0, "invalid_features"
         
-        # Normalizar con tu scaler
-        features_array = np.array([features], dtype=np.float32)
-        features_normalized = scaler_professional.transform(features_array)
+        # Normalizar con tu scaler; las manos ausentes quedan en 0 (la media) tras normalizar
+        features_normalized = scaler_professional.transform(features_batch)
+        features_normalized = np.where(mask, features_normalized, 0.0).astype(np.float32)
         
-        # Predecir con tu modelo
-        prediction = model_professional.predict(features_normalized, verbose=0)
-        predicted_class = np.argmax(prediction[0])
-        confidence = float(prediction[0][predicted_class])
+        # Una sola pasada del modelo para todas las filas
+        prediction = select_note_head(model_professional.predict(features_normalized, verbose=0),
+                                      len(label_encoder_professional.classes_))
+        
+        # Quedarse con la fila (mano) más segura
+        predicted_classes = np.argmax(prediction, axis=1)
+        confidences = prediction[np.arange(len(predicted_classes)), predicted_classes]
+        best_row = int(np.argmax(confidences))
+        predicted_class = predicted_classes[best_row]
+        confidence = float(confidences[best_row])
         
         # Convertir a nota
         predicted_note = label_encoder_professional.inverse_transform([predicted_class])[0]
@@ -324,7 +449,8 @@ def load_gesture_data_from_folder(data_dir):
         print(f"❌ Carpeta de datos no encontrada: {data_dir}")
         return gesture_data
     
-    json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    # .json: una muestra por archivo; .jsonl: shard de sesión (una muestra por línea)
+    json_files = [f for f in os.listdir(data_dir) if f.endswith(('.json', '.jsonl'))]
     
     if not json_files:
         print(f"❌ No se encontraron archivos JSON en: {data_dir}")
@@ -339,6 +465,16 @@ def load_gesture_data_from_folder(data_dir):
         try:
             json_path = os.path.join(data_dir, json_file)
             with open(json_path, 'r', encoding='utf-8') as f:
+                if json_file.endswith('.jsonl'):
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            gesture_data.append(json.loads(line))
+                            successful_loads += 1
+                        except ValueError:
+                            errors += 1  # Línea truncada (p. ej. cierre abrupto)
+                    continue
                 data = json.load(f)
             gesture_data.append(data)
             successful_loads += 1
@@ -382,6 +518,9 @@ except Exception as e:
     print(f"❌ Error cargando datos de gestos: {e}")
 
 # Variables globales
+note_bank = None  # Banco de notas precargado (se construye al iniciar)
+prototype_classifier = None  # Fallback por prototipos sobre gesture_data (se construye al iniciar)
+intent_gate = None  # Compuerta de intención de tocar (se construye al iniciar)
 last_navigation_time = time.time()
 navigation_cooldown = 1.0  # segundos entre cambios de octava
 
@@ -413,8 +552,23 @@ def create_keyboard_config(h, w, octave_offset):
 sys.path.append(BASE_DIR)
 try:
     from utils.hands_utils import is_finger_bent, determine_note_from_position, detect_navigation_gesture
-    from utils.audio_utils import play_note, get_available_notes
+    from utils.audio_utils import play_note_async, stop_note, get_available_notes
+    from utils.audio_engine import get_audio_engine
+    from utils.note_bank import NoteBank, note_to_semitone
+    from config import (AUDIO_VOICES, AUDIO_RELEASE_MS, FINGER_INDICES, FINGER_BEND_THRESHOLD,
+                        LANDMARK_PREDICTION_MAX_MS, PROTOTYPE_MODE, PROTOTYPE_K, PROTOTYPE_MIN_CONFIDENCE,
+                        INTENT_GATE_ENABLED, INTENT_GATE_MIN_RECALL)
+    from routes.api_routes import register_api_routes
     from utils.gesture_utils import is_pointing_gesture
+    from utils.features_utils import (build_feature_batch, get_model_input_features,
+                                      select_note_head)
+    from utils.feature_pipeline import load_pipeline, pipeline_path_for, check_compatibility
+    from utils.prototype_classifier import PrototypeClassifier
+    from utils.intent_gate import IntentGate
+    from utils.session_utils import get_session, drop_session, set_record_dir
+    from utils.frame_utils import decode_frame
+    from utils.landmark_transform import LandmarkTransform, to_landmark_points
+    from utils.gesture_features import INDEX_FINGER
     print("✅ Módulos de utilidades importados correctamente")
 except Exception as e:
     print(f"❌ Error importando utilidades: {e}")
@@ -433,13 +587,8 @@ def index():
         'current_octave_offset': 1   # Comenzar mostrando octavas 3-4-5
     }
     
-    # Obtener notas disponibles
-    available_notes = []
-    for octave in range(2, 7):
-        octave_dir = os.path.join(AUDIO_DIR, f"octava{octave}")
-        if os.path.exists(octave_dir):
-            octave_notes = [os.path.splitext(f)[0] for f in os.listdir(octave_dir) if f.endswith('.wav')]
-            available_notes.extend(octave_notes)
+    # Obtener notas disponibles (catálogo en caché)
+    available_notes = get_available_notes(AUDIO_DIR)
     
     return render_template('index.html', piano_config=piano_config, available_notes=available_notes)
 
@@ -451,6 +600,16 @@ def about():
 @app.route('/test')
 def test():
     """Ruta de prueba para verificar el servidor"""
+    audio_summary = f'❌ No activo (salida de audio: {AUDIO_OUTPUT})'
+    if SERVER_AUDIO:
+        audio_latency = get_audio_engine().get_latency_stats()
+        audio_summary = (f"{audio_latency['count']} notas, latencia p50 {audio_latency['p50_ms']:.2f} ms / "
+                         f"p99 {audio_latency['p99_ms']:.2f} ms, voces robadas {audio_latency['voices_stolen']}")
+    intent_summary = '❌ No activa'
+    if intent_gate is not None:
+        intent_stats = intent_gate.get_stats()
+        intent_summary = (f"{intent_stats['frames_rejected']}/{intent_stats['frames_seen']} frames filtrados, "
+                          f"{intent_stats['gate_us']:.0f} µs/frame, ~{intent_stats['saved_ms']:.0f} ms ahorrados")
     return f"""
     <h1>🎹 Piano Virtual IA - Estado del Sistema</h1>
     <ul>
@@ -458,24 +617,71 @@ def test():
         <li>Modelo Profesional: {'✅ Cargado' if model_professional else '❌ No cargado'}</li>
         <li>Scaler: {'✅ Disponible' if scaler else '❌ No disponible'}</li>
         <li>Label Encoder: {'✅ Disponible' if label_encoder else '❌ No disponible'}</li>
-        <li>MediaPipe: {'✅ Inicializado' if hands else '❌ Error'}</li>
+        <li>MediaPipe: {f'✅ Inicializado ({hands_pool.created}/{hands_pool.size} detectores)' if hands else '❌ Error'}</li>
         <li>Pygame Audio: ✅ Inicializado</li>
+        <li>Motor de Audio: {audio_summary}</li>
         <li>Datos de Gestos: {'✅ ' + str(len(gesture_data)) + ' registros' if gesture_data else '❌ Sin datos'}</li>
+        <li>Compuerta de intención: {intent_summary}</li>
     </ul>
     <p><a href="/">← Volver al Piano</a></p>
     """
 
-# API básicas
-@app.route('/api/notes', methods=['GET'])
-def get_notes_api():
-    """Obtiene la lista de notas disponibles"""
-    notes = []
-    for octave in range(2, 7):
-        octave_dir = os.path.join(AUDIO_DIR, f"octava{octave}")
-        if os.path.exists(octave_dir):
-            octave_notes = [os.path.splitext(f)[0] for f in os.listdir(octave_dir) if f.endswith('.wav')]
-            notes.extend(octave_notes)
-    return jsonify({'notes': sorted(notes)})
+# ✅ AUDIO EN EL NAVEGADOR (modo cliente)
+def output_note(note, velocity=1.0):
+    """
+    Envía una nota a la salida de audio configurada
+    
+    Args:
+        note: Nota a reproducir (ej. "DO4")
+        velocity: Intensidad 0-1
+        
+    Returns:
+        tuple: (éxito, evento note_on para el cliente o None)
+    """
+    success = False
+    note_event = None
+    
+    if SERVER_AUDIO:
+        audio_path = os.path.join(AUDIO_DIR, f"octava{note[-1]}")
+        success = play_note_async(note, audio_path, velocity=velocity)
+    
+    if AUDIO_OUTPUT in ('client', 'both') and note_bank is not None and note in note_bank:
+        # El navegador ya tiene el sample precargado: basta con su ID
+        note_event = {
+            'note': note,
+            'sample_id': note_to_semitone(note),
+            'velocity': velocity,
+            'server_time': time.time() * 1000
+        }
+        success = True
+    
+    return success, note_event
+
+# API básicas (/api/notes, /api/play-note/<nota>): misma salida de audio que el socket
+register_api_routes(app, audio_dir=AUDIO_DIR, note_output=output_note)
+
+@app.route('/api/samples', methods=['GET'])
+def get_samples_manifest():
+    """Manifiesto de samples para precargar en el navegador"""
+    samples = {}
+    if note_bank is not None:
+        for note in note_bank.sounds:
+            samples[note_to_semitone(note)] = {'note': note, 'url': f'/api/samples/{note}.wav'}
+    return jsonify({
+        'audio_output': AUDIO_OUTPUT,
+        'jitter_buffer_ms': JITTER_BUFFER_MS,
+        'samples': samples
+    })
+
+@app.route('/api/samples/<note>.wav', methods=['GET'])
+def get_sample_wav(note):
+    """Sample de una nota en WAV (incluye notas sintetizadas)"""
+    wav_bytes = note_bank.get_wav_bytes(note) if note_bank is not None else None
+    if wav_bytes is None:
+        abort(404)
+    response = Response(wav_bytes, mimetype='audio/wav')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
 
 # Eventos de WebSocket
 @socketio.on('connect')
@@ -483,67 +689,110 @@ def handle_connect():
     """Cliente conectado"""
     client_ip = request.remote_addr if request else "desconocido"
     print(f'🔌 Cliente conectado desde: {client_ip}')
+    get_session(request.sid)
     emit('status', {'message': 'Conectado al servidor'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Cliente desconectado"""
+    drop_session(request.sid)
     print('🔌 Cliente desconectado')
 
-@socketio.on('process_frame')
-def handle_process_frame(data):
+@socketio.on('configure')
+def handle_configure(data):
+    """Negociación de opciones del cliente (p. ej. formato compacto de respuesta)"""
+    config = get_session(request.sid).configure(data or {})
+    print(f"⚙️ Cliente configurado: {config}")
+    emit('configured', config)
+
+def process_frame_data(data, session=None):
     """
     Procesa un frame enviado por el cliente - VERSIÓN MEJORADA CON MODELO PROFESIONAL
+    
+    Trabajo CPU-bound (decodificación, MediaPipe, inferencia); se ejecuta
+    mediante run_cpu_bound para no bloquear el event loop.
+    
+    Args:
+        data: Datos del evento process_frame
+        session: ClientSession del cliente (estado por conexión)
+        
+    Returns:
+        dict: Respuesta para el evento frame_processed
     """
     global last_navigation_time
     
-    try:
-        print('📷 Procesando frame...')
-        # Extraer datos
-        image_data = data['image'].split(',')[1]
-        octave_offset = int(data.get('octaveOffset', 1))
-        
-        # Decodificar imagen
-        img_bytes = base64.b64decode(image_data)
-        img_array = np.frombuffer(img_bytes, np.uint8)
-        frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-        
-        # Voltear horizontalmente
-        frame = cv2.flip(frame, 1)
-        
-        # Dimensiones
-        h, w = frame.shape[:2]
-        
-        # Convertir a RGB para MediaPipe
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Procesar con MediaPipe
-        results = hands.process(frame_rgb)
-        
-        # Preparar respuesta mejorada
-        response = {
-            'hand_detected': False,
-            'is_playing': False,
-            'note': None,
-            'position': None,
-            'navigation': None,
-            'octave_change': False,
-            'new_octave_offset': octave_offset,
-            'coordinates': [],  # ✅ NUEVO: Coordenadas de la mano
-            'confidence': 0.0,  # ✅ NUEVO: Confianza del modelo
-            'method': 'none',   # ✅ NUEVO: Método usado
-            'audio_success': False  # ✅ NUEVO: Si se reprodujo audio
-        }
+    frame_start = time.perf_counter()
+    print('📷 Procesando frame...')
+    # Extraer datos
+    image_data = data['image'].partition(',')[2]
+    octave_offset = int(data.get('octaveOffset', 1))
+    
+    # Decodificar y convertir a RGB para MediaPipe (conversión en el mismo
+    # buffer). La imagen no se voltea: el espejo se aplica a los landmarks
+    transform = session.transform if session is not None else LandmarkTransform()
+    frame_rgb = decode_frame(image_data)
+    if frame_rgb is None:
+        raise ValueError('No se pudo decodificar el frame')
+    
+    # Dimensiones
+    h, w = frame_rgb.shape[:2]
+    
+    # Procesar con MediaPipe
+    with hands_pool.borrow() as detector:
+        results = detector.process(frame_rgb)
+    
+    # Espejo / rotación / recorte en el espacio de landmarks
+    tracked_hands = transform.transform_results(results, w, h)
+    
+    # Preparar respuesta mejorada
+    response = {
+        'hand_detected': False,
+        'is_playing': False,
+        'note': None,
+        'position': None,
+        'navigation': None,
+        'octave_change': False,
+        'new_octave_offset': octave_offset,
+        'coordinates': [],  # ✅ NUEVO: Coordenadas de la mano
+        'confidence': 0.0,  # ✅ NUEVO: Confianza del modelo
+        'method': 'none',   # ✅ NUEVO: Método usado
+        'audio_success': False,  # ✅ NUEVO: Si se reprodujo audio
+        'note_on': None  # ✅ Evento de nota para reproducir en el navegador (modo cliente)
+    }
+    
+    # Verificar detección de manos
+    if tracked_hands:
+        response['hand_detected'] = True
+        print('👋 Mano detectada')
         
-        # Verificar detección de manos
-        if results.multi_hand_landmarks:
-            response['hand_detected'] = True
-            print('👋 Mano detectada')
-            
-            # Analizar landmarks
-            landmarks = results.multi_hand_landmarks[0].landmark
-            
-            # ✅ NUEVO: Extraer coordenadas para mostrar
+        # Analizar landmarks (puntos con .x/.y/.z como los de MediaPipe)
+        hand_label, hand_array = tracked_hands[0]
+        key_landmarks = None
+        if session is not None:
+            session.record_landmarks(frame_start, hand_array)
+            # ✅ FILTRO ONE-EURO: estabiliza la tecla sin subir los FPS del cliente
+            hand_array = session.landmark_filter.filter(hand_array, frame_start, key=hand_label)
+            # Predicción a corto plazo para compensar la latencia de proceso
+            horizon_ms = min(session.adaptive.processing_ms or 0.0, LANDMARK_PREDICTION_MAX_MS)
+            key_landmarks = to_landmark_points(session.landmark_filter.predict(horizon_ms / 1000))
+        landmarks = to_landmark_points(hand_array)
+        if key_landmarks is None:
+            key_landmarks = landmarks
+        
+        # Agrupar manos por etiqueta (mismo formato que captura_notas.py)
+        hands_by_label = {}
+        for label, array in tracked_hands:
+            if label is not None:
+                hands_by_label.setdefault(label, array)
+        
+        # ✅ NUEVO: Extraer coordenadas para mostrar
+        if session is not None and session.payload_format == 'compact':
+            # Formato compacto: keyframe int16 o delta int8 (binario)
+            packed, packed_format = session.encoder.encode(hand_array)
+            packed_format.update({'width': w, 'height': h, 'scale': session.encoder.scale})
+            response['landmarks_packed'] = packed
+            response['landmarks_format'] = packed_format
+        else:
             coordinates = []
             for i, landmark in enumerate(landmarks):
                 coord = {
@@ -555,92 +804,154 @@ def handle_process_frame(data):
                 coordinates.append(coord)
             response['coordinates'] = coordinates
             print(f"📊 Coordenadas extraídas: {len(coordinates)} puntos")
-            
-            # Verificar navegación por gestos
-            current_time = time.time()
-            if current_time - last_navigation_time > navigation_cooldown:
-                # Detectar gesto de navegación si el dedo índice está apuntando
-                if is_pointing_gesture(landmarks):
-                    navigation = detect_navigation_gesture(landmarks)
+        
+        # Verificar navegación por gestos
+        current_time = time.time()
+        if current_time - last_navigation_time > navigation_cooldown:
+            # Detectar gesto de navegación si el dedo índice está apuntando
+            if is_pointing_gesture(hand_array):
+                navigation = detect_navigation_gesture(hand_array)
+                
+                if navigation:
+                    response['navigation'] = navigation
+                    print(f'🧭 Navegación detectada: {navigation}')
                     
-                    if navigation:
-                        response['navigation'] = navigation
-                        print(f'🧭 Navegación detectada: {navigation}')
-                        
-                        # Calcular nuevo offset de octava
-                        new_offset = octave_offset
-                        if navigation == 'left' and octave_offset > 0:
-                            new_offset = octave_offset - 1
-                            response['octave_change'] = True
-                        elif navigation == 'right' and octave_offset < 2:  # Max offset para 5 octavas
-                            new_offset = octave_offset + 1
-                            response['octave_change'] = True
-                        
-                        if response['octave_change']:
-                            last_navigation_time = current_time
-                            response['new_octave_offset'] = new_offset
-            
-            # Verificar si el dedo está doblado para tocar
-            finger_indices = [8, 7, 6, 5]  # Dedo índice
-            threshold_angle = 120
-            
+                    # Calcular nuevo offset de octava
+                    new_offset = octave_offset
+                    if navigation == 'left' and octave_offset > 0:
+                        new_offset = octave_offset - 1
+                        response['octave_change'] = True
+                    elif navigation == 'right' and octave_offset < 2:  # Max offset para 5 octavas
+                        new_offset = octave_offset + 1
+                        response['octave_change'] = True
+                    
+                    if response['octave_change']:
+                        last_navigation_time = current_time
+                        response['new_octave_offset'] = new_offset
+        
+        # ✅ COMPUERTA DE INTENCIÓN: gestos que no son pulsaciones (mano abierta,
+        # puño, transición, fuera de zona...) no pasan a flexión, clasificación ni audio
+        intent_allowed = True
+        if intent_gate is not None:
+            intent_allowed, response['intent'] = intent_gate.allows(hand_array)
+        downstream_start = time.perf_counter()
+        
+        # Verificar si el dedo índice está doblado para tocar (ángulo PIP/DIP).
+        # is_playing es el estado (doblado); la nota solo suena en el flanco de pulsación
+        note_onset = False
+        if not intent_allowed:
+            response['method'] = 'intent_gate'
+            if session is not None:
+                # Sin reset, la histéresis previa al tramo rechazado dispararía una nota al volver
+                session.bend_detector.reset()
+        elif session is not None:
+            # Con histéresis el estado no parpadea con el jitter alrededor del umbral,
+            # y mantener el dedo doblado no repite la nota en cada frame
+            bent, pressed = session.bend_detector.update_with_onsets(hand_array)
+            response['is_playing'] = bool(bent[0, INDEX_FINGER])
+            note_onset = bool(pressed[0, INDEX_FINGER])
+        else:
+            # Sin sesión no hay frame anterior: cada frame doblado es una pulsación
             response['is_playing'] = is_finger_bent(
-                landmarks, 
-                finger_indices=finger_indices,
-                threshold_angle=threshold_angle
+                hand_array, 
+                finger_indices=FINGER_INDICES,
+                threshold_angle=FINGER_BEND_THRESHOLD
             )
+            note_onset = response['is_playing']
+        
+        if note_onset:
+            print('🎹 Dedo doblado - tocando nota')
             
-            if response['is_playing']:
-                print('🎹 Dedo doblado - tocando nota')
-                
-                # ✅ NUEVO: USAR MODELO PROFESIONAL PRIMERO
-                predicted_note, confidence, method = predict_with_professional_model(landmarks)
+            # ✅ NUEVO: USAR MODELO PROFESIONAL PRIMERO
+            predicted_note, confidence, method = predict_with_professional_model(landmarks, hands_by_label)
+            
+            if predicted_note and confidence > 0.6:  # Umbral de confianza
+                response['note'] = predicted_note
+                response['confidence'] = confidence
+                response['method'] = method
+                print(f'🤖 Predicción profesional: {predicted_note} (confianza: {confidence:.3f})')
+            else:
+                # ✅ FALLBACK 1: prototipos del dataset capturado
+                prototype_note, prototype_confidence = (
+                    prototype_classifier.predict_one(key_landmarks) if prototype_classifier else (None, 0.0))
                 
-                if predicted_note and confidence > 0.6:  # Umbral de confianza
-                    response['note'] = predicted_note
-                    response['confidence'] = confidence
-                    response['method'] = method
-                    print(f'🤖 Predicción profesional: {predicted_note} (confianza: {confidence:.3f})')
+                if prototype_confidence >= PROTOTYPE_MIN_CONFIDENCE:
+                    # Nota None = gana la clase de gestos negativos: no se toca
+                    response['note'] = prototype_note
+                    response['confidence'] = prototype_confidence
+                    response['method'] = 'prototype' if prototype_note else 'prototype_reject'
+                    print(f'🧩 Prototipos: {prototype_note or "gesto negativo"} '
+                          f'(confianza: {prototype_confidence:.3f})')
                 else:
-                    # ✅ FALLBACK: Usar método original
+                    # ✅ FALLBACK 2: posición geométrica del índice
                     keyboard_config = create_keyboard_config(h, w, octave_offset)
-                    
-                    note = determine_note_from_position(
-                      landmarks, w, h, keyboard_config, 
-                      gesture_data=gesture_data,
-                      model=model,  # Modelo original
-                      scaler=scaler,
-                      label_encoder=label_encoder
-                    )
+                    note = determine_note_from_position(key_landmarks, w, h, keyboard_config)
                     
                     response['note'] = note
                     response['confidence'] = 0.5  # Confianza moderada para fallback
                     response['method'] = 'fallback_original'
                     if note:
                         print(f'📍 Método original: {note}')
-                
-                # ✅ REPRODUCIR AUDIO si hay nota
-                if response['note']:
-                    print(f'🎵 Reproduciendo: {response["note"]}')
-                    # Extraer octava del nombre de la nota
-                    if response['note'] and response['note'][-1].isdigit():
-                        octave = response['note'][-1]
-                        octave_dir = f"octava{octave}"
-                        audio_path = os.path.join(AUDIO_DIR, octave_dir)
-                        success = play_note(response['note'], audio_path)
-                        response['audio_success'] = success
-                        if success:
-                            print(f"🔊 Audio reproducido exitosamente: {response['note']}")
-                        else:
-                            print(f"⚠️ Error reproduciendo audio: {response['note']}")
-                
-                # Posición del dedo
-                index_tip_x = landmarks[8].x * w
-                index_tip_y = landmarks[8].y * h
-                response['position'] = {'x': float(index_tip_x), 'y': float(index_tip_y)}
+            
+            # ✅ REPRODUCIR AUDIO si hay nota
+            if response['note']:
+                print(f'🎵 Reproduciendo: {response["note"]}')
+                # Extraer octava del nombre de la nota
+                if response['note'] and response['note'][-1].isdigit():
+                    success, note_event = output_note(response['note'])
+                    response['audio_success'] = success
+                    response['note_on'] = note_event
+                    if success:
+                        print(f"🔊 Audio reproducido exitosamente: {response['note']}")
+                    else:
+                        print(f"⚠️ Error reproduciendo audio: {response['note']}")
+        
+        if response['is_playing']:
+            # Posición del dedo
+            index_tip_x = key_landmarks[8].x * w
+            index_tip_y = key_landmarks[8].y * h
+            response['position'] = {'x': float(index_tip_x), 'y': float(index_tip_y)}
         
-        # Enviar respuesta al cliente
-        emit('frame_processed', response)
+        if intent_gate is not None and intent_allowed:
+            intent_gate.record_downstream(time.perf_counter() - downstream_start)
+    elif session is not None:
+        # Sin mano: el próximo frame compacto será un keyframe
+        session.encoder.reset()
+        session.bend_detector.reset()
+        session.landmark_filter.reset()
+    
+    # ✅ HINTS ADAPTATIVOS: resolución, calidad JPEG y FPS para el próximo envío
+    if session is not None:
+        hand_size_px = None
+        if tracked_hands:
+            hand_array = tracked_hands[0][1]
+            extent = hand_array[:, :2].max(axis=0) - hand_array[:, :2].min(axis=0)
+            hand_size_px = float(max(extent[0] * w, extent[1] * h))
+        processing_ms = (time.perf_counter() - frame_start) * 1000
+        response['hints'] = session.adaptive.update(processing_ms, w, hand_size_px)
+        response['processing_ms'] = processing_ms
+    
+    return response
+
+@socketio.on('process_frame')
+def handle_process_frame(data):
+    """Procesa un frame enviado por el cliente"""
+    try:
+        session = get_session(request.sid)
+        
+        # Un frame en curso por sesión: si llega otro se descarta sin esperar
+        # (esperar un lock nativo bloquearía el event loop)
+        if not session.frame_lock.acquire(False):
+            emit('frame_skipped', {'timestamp': data.get('timestamp')})
+            return
+        try:
+            response = run_cpu_bound(process_frame_data, data, session)
+            session.frames_processed += 1
+            
+            # Enviar respuesta al cliente (aún con el lock: respuestas en orden)
+            emit('frame_processed', response)
+        finally:
+            session.frame_lock.release()
         
     except Exception as e:
         logger.error(f"Error procesando frame: {e}")
@@ -655,24 +966,65 @@ def handle_play_note(data):
         
         # Extraer octava
         if note and note[-1].isdigit():
-            octave = note[-1]
-            octave_dir = f"octava{octave}"
-            audio_path = os.path.join(AUDIO_DIR, octave_dir)
-            success = play_note(note, audio_path)
+            velocity = float(data.get('velocity', 1.0))
+            success, note_event = output_note(note, velocity=velocity)
             emit('note_played', {'note': note, 'success': success}, broadcast=True)
+            if note_event:
+                emit('note_on', note_event, broadcast=True)
         else:
             emit('error', {'message': f'Formato de nota incorrecto: {note}'})
     except Exception as e:
         emit('error', {'message': f'Error al reproducir nota: {e}'})
 
+@socketio.on('stop_note')
+def handle_stop_note(data):
+    """Suelta una nota (release con fade corto)"""
+    try:
+        if SERVER_AUDIO:
+            stop_note(data['note'])
+    except Exception as e:
+        emit('error', {'message': f'Error al detener nota: {e}'})
+
 # Al final de app.py
 if __name__ == '__main__':
     try:
         print("\n🎹 Iniciando Piano Virtual Invisible con WebSockets...")
         
+        # ✅ PRECARGAR BANCO DE NOTAS (rellena huecos de la rejilla 5×12 por re-muestreo)
+        note_bank = NoteBank().build(AUDIO_DIR)
+        
+        # ✅ INICIAR MOTOR DE AUDIO (un solo hilo de audio para todo el servidor)
+        print(f"🔈 Salida de audio: {AUDIO_OUTPUT} (jitter buffer cliente: {JITTER_BUFFER_MS} ms)")
+        if SERVER_AUDIO:
+            get_audio_engine(num_voices=AUDIO_VOICES, release_ms=AUDIO_RELEASE_MS, note_bank=note_bank)
+        
+        if RECORD_DIR:
+            set_record_dir(RECORD_DIR)
+            print(f"⏺️ Grabando landmarks de las sesiones en: {RECORD_DIR}")
+        
         # ✅ CARGAR MODELO PROFESIONAL
         professional_loaded = load_trained_professional_model()
         
+        # ✅ CLASIFICADOR POR PROTOTIPOS (mismo pipeline de features que el modelo profesional)
+        if gesture_data:
+            start = time.perf_counter()
+            prototype_classifier = PrototypeClassifier.from_gesture_data(
+                gesture_data, mode=PROTOTYPE_MODE, k=PROTOTYPE_K, pipeline=feature_pipeline_professional)
+            if prototype_classifier is not None:
+                print(f"🧩 Prototipos: {len(prototype_classifier.classes)} clases, "
+                      f"{prototype_classifier.n_samples} manos ({PROTOTYPE_MODE}, "
+                      f"{(time.perf_counter() - start) * 1000:.0f} ms)")
+        
+        # ✅ COMPUERTA DE INTENCIÓN DE TOCAR (POSITIVE vs NEGATIVE del dataset)
+        if gesture_data and INTENT_GATE_ENABLED:
+            start = time.perf_counter()
+            intent_gate = IntentGate.from_gesture_data(gesture_data, min_recall=INTENT_GATE_MIN_RECALL)
+            if intent_gate is not None:
+                print(f"🚦 Compuerta de intención: {intent_gate.n_samples} manos, "
+                      f"umbral {intent_gate.threshold:.2f} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+            else:
+                print("⚠️ Compuerta de intención desactivada: faltan muestras POSITIVE o NEGATIVE")
+        
         # ✅ MOSTRAR RESUMEN DEL SISTEMA MEJORADO
         print(f"\n📊 ESTADO DEL SISTEMA:")
         print(f"   🧠 Modelo original: {'✅ Cargado (.h5)' if model else '❌ No cargado'}")
@@ -686,7 +1038,12 @@ if __name__ == '__main__':
             print(f"\n🎯 TU MODELO PROFESIONAL:")
             print(f"   📊 Clases: {len(label_encoder_professional.classes_)}")
             print(f"   📝 Ejemplos: {', '.join(label_encoder_professional.classes_[:8])}")
-            print(f"   🔧 Input: (None, 63) - 21 landmarks × 3 coordenadas")
+            per_hand = feature_pipeline_professional.features_per_hand
+            if professional_input_features == 2 * per_hand:
+                print(f"   🔧 Input: (None, {professional_input_features}) - 2 manos × {per_hand} features")
+            else:
+                print(f"   🔧 Input: (None, {professional_input_features}) - 1 mano × {per_hand} features")
+            print(f"   🧮 Pipeline: {feature_pipeline_professional.version}")
             print(f"   🎯 Umbral confianza: 60%")
             print(f"   🚀 Prioridad: ALTA (se usa primero)")
         else:
@@ -707,8 +1064,8 @@ if __name__ == '__main__':
         print(f"📊 Total archivos de audio: {total_audio_files}")
         
         # Mostrar URL manualmente 
-        print("\n🌐 Servidor disponible en: http://127.0.0.1:5000")
-        print("🌐 Prueba esta ruta para verificar: http://127.0.0.1:5000/test")
+        print(f"\n🌐 Servidor disponible en: http://{SERVER_HOST}:{SERVER_PORT}")
+        print(f"🌐 Prueba esta ruta para verificar: http://{SERVER_HOST}:{SERVER_PORT}/test")
         
         print(f"\n🎹 INSTRUCCIONES DE USO:")
         print(f"   1. Abre http://127.0.0.1:5000 en tu navegador")
@@ -719,8 +1076,16 @@ if __name__ == '__main__':
         print(f"   6. Se reproducirá el audio de la nota correspondiente")
         print(f"   7. ¡Disfruta tu piano virtual con IA!")
         
-        # Iniciar servidor (modo corregido para Windows)
-        socketio.run(app, host='127.0.0.1', port=5000, debug=True, allow_unsafe_werkzeug=True)
+        # Iniciar servidor
+        if ASYNC_MODE == 'threading':
+            # Modo desarrollo (modo corregido para Windows)
+            socketio.run(app, host=SERVER_HOST, port=SERVER_PORT, debug=True, allow_unsafe_werkzeug=True)
+        else:
+            # Modo producción: worker asíncrono sin Werkzeug
+            print(f"⚡ Servidor asíncrono: {ASYNC_MODE} ({CPU_WORKERS} hilos CPU)")
+            if MESSAGE_QUEUE:
+                print(f"📮 Cola de mensajes compartida: {MESSAGE_QUEUE}")
+            socketio.run(app, host=SERVER_HOST, port=SERVER_PORT, debug=False)
     except Exception as e:
         print(f"\n❌ ERROR AL INICIAR: {e}")
         import traceback
@@ -729,6 +1094,6 @@ if __name__ == '__main__':
         # Intentar iniciar en modo básico si fallan los WebSockets
         print("\n⚠️ Intentando iniciar en modo básico sin WebSockets...")
         try:
-            app.run(host='127.0.0.1', port=5000, debug=True)
+            app.run(host=SERVER_HOST, port=SERVER_PORT, debug=True)
         except Exception as e:
             print(f"❌ ERROR TAMBIÉN EN MODO BÁSICO: {e}")
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de audio en el navegador
+----------------------------------
+Compara el ancho de banda por cliente y la latencia añadida del modo
+cliente (eventos note_on con ID de sample) frente a transmitir PCM en
+chunks por Socket.IO, para varios tamaños de chunk y de jitter buffer.
+
+Uso:
+    python benchmarks/bench_audio_cliente.py --notes-per-second 8
+    python benchmarks/bench_audio_cliente.py --audio-dir dataset/dataset_audio
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+BYTES_PER_SAMPLE = 2
+
+def socketio_packet_size(event, payload):
+    """Tamaño de un paquete de texto Socket.IO: 42["evento",{...}]"""
+    return len('42' + json.dumps([event, payload], separators=(',', ':')))
+
+def bench_event_mode(notes_per_second, jitter_values):
+    """Ancho de banda y coste de serialización del modo note_on"""
+    event = {'note': 'SOLS4', 'sample_id': 32, 'velocity': 1.0, 'server_time': time.time() * 1000}
+    packet = socketio_packet_size('note_on', event)
+
+    n = 100000
+    start = time.perf_counter()
+    for _ in range(n):
+        json.dumps(['note_on', event], separators=(',', ':'))
+    encode_us = (time.perf_counter() - start) / n * 1e6
+
+    print("MODO CLIENTE (eventos note_on)")
+    print(f"   Paquete: {packet} bytes, serialización {encode_us:.2f} µs")
+    print(f"   Ancho de banda: {packet * notes_per_second / 1024:.2f} KB/s por cliente "
+          f"a {notes_per_second} notas/s")
+    for jitter in jitter_values:
+        print(f"   Jitter buffer {jitter:>3} ms → latencia añadida máx. {jitter} ms")
+
+def bench_pcm_mode(chunk_values, jitter_values):
+    """Ancho de banda y latencia de transmitir PCM en chunks"""
+    bytes_per_second = SAMPLE_RATE * CHANNELS * BYTES_PER_SAMPLE
+    print("\nMODO PCM (referencia, 16 bits estéreo 44.1 kHz)")
+    print(f"{'chunk ms':>10} {'bytes/chunk':>12} {'KB/s':>8} " +
+          ' '.join(f"{'lat@' + str(j) + 'ms':>10}" for j in jitter_values))
+    for chunk_ms in chunk_values:
+        chunk_bytes = int(bytes_per_second * chunk_ms / 1000)
+        # Socket.IO binario: cabecera de evento + adjunto
+        packet = chunk_bytes + socketio_packet_size('audio_chunk', {'_placeholder': True, 'num': 0})
+        rate = packet * (1000 / chunk_ms) / 1024
+        latencies = ' '.join(f"{chunk_ms + j:>10}" for j in jitter_values)
+        print(f"{chunk_ms:>10} {chunk_bytes:>12} {rate:>8.1f} {latencies}")
+
+def bench_preload(audio_dir):
+    """Coste único de precarga de samples en el navegador"""
+    import pygame
+    from utils.note_bank import NoteBank
+
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=CHANNELS, buffer=512)
+    bank = NoteBank().build(audio_dir)
+    start = time.perf_counter()
+    total = sum(len(bank.get_wav_bytes(note)) for note in bank.sounds)
+    elapsed = time.perf_counter() - start
+    print(f"\nPRECARGA: {len(bank)} samples, {total / 1024 / 1024:.1f} MB "
+          f"(codificación WAV {elapsed * 1000:.0f} ms, una vez por cliente)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Ancho de banda y latencia del audio en el navegador')
+    parser.add_argument('--notes-per-second', type=float, default=8)
+    parser.add_argument('--chunks', default='10,20,40', help='Tamaños de chunk PCM en ms')
+    parser.add_argument('--jitter', default='0,30,60', help='Jitter buffer en ms')
+    parser.add_argument('--audio-dir', default=None)
+    args = parser.parse_args()
+
+    jitter_values = [int(j) for j in args.jitter.split(',')]
+    bench_event_mode(args.notes_per_second, jitter_values)
+    bench_pcm_mode([int(c) for c in args.chunks.split(',')], jitter_values)
+    if args.audio_dir:
+        bench_preload(args.audio_dir)
+
+if __name__ == '__main__':
+    main()
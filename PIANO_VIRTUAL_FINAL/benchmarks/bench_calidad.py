@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark y verificación de la calidad de detección del capturador
+------------------------------------------------------------------
+Reproduce la calidad anterior de captura_notas.py (bucle por landmark,
+historial elegido por center_x) y la compara con HandQualityTracker sobre
+una secuencia sintética de dos manos que aparecen y desaparecen:
+    - referencia corregida (bucle, historial por etiqueta) vs vectorizada:
+      las puntuaciones deben coincidir
+    - implementación anterior vs vectorizada: frames en que la estabilidad
+      se comparaba con la otra mano
+    - µs por frame de cada implementación
+
+Uso:
+    python benchmarks/bench_calidad.py --frames 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'capturaDatos'))
+
+from calidad_utils import HandQualityTracker
+
+# --- Implementación anterior (referencia) ---
+
+def legacy_score(landmarks, prev_landmarks):
+    """Calidad de una mano con el bucle original"""
+    visible_count = sum(1 for lm in landmarks if lm[2] > -0.15)
+    scores = [(visible_count / 21) * 100]
+
+    if prev_landmarks:
+        movement = 0
+        for current, prev in zip(landmarks, prev_landmarks):
+            movement += np.sqrt((current[0] - prev[0])**2 + (current[1] - prev[1])**2)
+        scores.append(max(0, 100 - movement * 800))
+    else:
+        scores.append(85)
+
+    center_x = np.mean([lm[0] for lm in landmarks])
+    center_y = np.mean([lm[1] for lm in landmarks])
+    position_score = 100
+    if center_x < 0.1 or center_x > 0.9:
+        position_score -= 15
+    if center_y < 0.25 or center_y > 0.95:
+        position_score -= 10
+    scores.append(max(0, position_score))
+
+    finger_quality = sum(20 for tip in [4, 8, 12, 16, 20] if landmarks[tip][2] > -0.1)
+    scores.append(min(100, finger_quality))
+    return scores[0] * 0.3 + scores[1] * 0.2 + scores[2] * 0.2 + scores[3] * 0.3, center_x
+
+class LegacyQuality:
+    """Historial como en el original: siempre lee el de la izquierda, guarda por center_x"""
+
+    def __init__(self):
+        self.prev_landmarks_left = None
+        self.prev_landmarks_right = None
+
+    def update(self, landmarks_left, landmarks_right):
+        result = []
+        for landmarks in (landmarks_left, landmarks_right):
+            if not landmarks:
+                result.append(0)
+                continue
+            score, center_x = legacy_score(landmarks, self.prev_landmarks_left)
+            if center_x < 0.5:
+                self.prev_landmarks_left = landmarks
+            else:
+                self.prev_landmarks_right = landmarks
+            result.append(score)
+        return tuple(result)
+
+class ReferenceQuality:
+    """Bucle original con el historial corregido (por etiqueta, olvidado si la mano falta)"""
+
+    def __init__(self):
+        self.previous = {'Left': None, 'Right': None}
+
+    def update(self, landmarks_left, landmarks_right):
+        result = []
+        for label, landmarks in (('Left', landmarks_left), ('Right', landmarks_right)):
+            if not landmarks:
+                self.previous[label] = None
+                result.append(0)
+                continue
+            score, _ = legacy_score(landmarks, self.previous[label])
+            self.previous[label] = landmarks
+            result.append(score)
+        return tuple(result)
+
+def synthetic_sequence(n_frames, seed=0):
+    """Dos manos con ruido de temblor; cada una falta ~10% de los frames"""
+    rng = np.random.default_rng(seed)
+    base_left = rng.uniform(0.2, 0.45, size=(21, 3)) - [0, 0, 0.1]
+    base_right = rng.uniform(0.55, 0.8, size=(21, 3)) - [0, 0, 0.1]
+    frames = []
+    for _ in range(n_frames):
+        left = (base_left + rng.normal(0, 0.003, size=(21, 3))).tolist() if rng.random() > 0.1 else []
+        right = (base_right + rng.normal(0, 0.003, size=(21, 3))).tolist() if rng.random() > 0.1 else []
+        frames.append((left, right))
+    return frames
+
+def run(tracker, frames):
+    start = time.perf_counter()
+    scores = np.array([tracker.update(left, right) for left, right in frames], dtype=np.float64)
+    return scores, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Calidad de detección: bucle vs vectorizada')
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--tolerance', type=float, default=1e-3)
+    args = parser.parse_args()
+
+    frames = synthetic_sequence(args.frames)
+    legacy, legacy_time = run(LegacyQuality(), frames)
+    reference, reference_time = run(ReferenceQuality(), frames)
+    vectorized, vectorized_time = run(HandQualityTracker(), frames)
+
+    max_error = float(np.abs(reference - vectorized).max())
+    status = "✅" if max_error <= args.tolerance else "❌"
+    print(f"{status} referencia corregida vs vectorizada: error máximo {max_error:.2e}")
+
+    wrong = np.abs(legacy - vectorized) > args.tolerance
+    print(f"⚠️ implementación anterior: {int(wrong[:, 0].sum())} frames izquierda y "
+          f"{int(wrong[:, 1].sum())} derecha con otra puntuación (historial de la mano equivocada)")
+    print(f"   calidad media derecha: anterior {legacy[:, 1][legacy[:, 1] > 0].mean():.1f}% "
+          f"vs corregida {vectorized[:, 1][vectorized[:, 1] > 0].mean():.1f}%")
+
+    per_frame = lambda seconds: seconds / args.frames * 1e6
+    print(f"{'implementación':>22} {'µs/frame':>9}")
+    print(f"{'anterior (bucle)':>22} {per_frame(legacy_time):>9.1f}")
+    print(f"{'referencia (bucle)':>22} {per_frame(reference_time):>9.1f}")
+    print(f"{'vectorizada':>22} {per_frame(vectorized_time):>9.1f}")
+
+    if max_error > args.tolerance:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
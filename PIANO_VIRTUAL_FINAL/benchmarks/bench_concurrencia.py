@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de concurrencia del servidor Socket.IO
+------------------------------------------------
+Conecta N clientes simultáneos que envían frames (`process_frame`) y mide
+la latencia hasta `frame_processed`. Reporta p50/p99 por número de clientes
+y la escala del throughput respecto al primer nivel: el servidor procesa
+MediaPipe con un detector por hilo de CPU (PIANO_CPU_WORKERS), así que
+frames/s debería crecer hasta ese número de clientes y estancarse después.
+
+Uso:
+    python benchmarks/bench_concurrencia.py --url http://127.0.0.1:5000 --clients 1,4,8,16
+    python benchmarks/bench_concurrencia.py --image mano.jpg --duration 20 --fps 15
+"""
+
+import argparse
+import base64
+import threading
+import time
+
+import cv2
+import numpy as np
+import socketio
+
+def load_frame_payload(image_path, width, height):
+    """Codifica una imagen (o un frame sintético) como data URL JPEG"""
+    if image_path:
+        frame = cv2.imread(image_path)
+        if frame is None:
+            raise SystemExit(f"❌ No se pudo leer la imagen: {image_path}")
+    else:
+        frame = np.full((height, width, 3), 127, dtype=np.uint8)
+        cv2.circle(frame, (width // 2, height // 2), height // 4, (180, 150, 120), -1)
+
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    if not ok:
+        raise SystemExit("❌ Error codificando el frame")
+    return 'data:image/jpeg;base64,' + base64.b64encode(encoded.tobytes()).decode('ascii')
+
+def run_client(url, payload, fps, duration, latencies, lock, start_barrier):
+    """Cliente en lazo cerrado: un frame pendiente a la vez, limitado a `fps`"""
+    client = socketio.Client(reconnection=False)
+    reply = threading.Event()
+
+    @client.on('frame_processed')
+    def on_frame_processed(data):
+        reply.set()
+
+    skipped = []
+
+    @client.on('frame_skipped')
+    def on_frame_skipped(data):
+        skipped.append(data)  # Otro frame seguía en curso (tras un timeout): sin latencia
+        reply.set()
+
+    @client.on('error')
+    def on_error(data):
+        reply.set()
+
+    try:
+        client.connect(url, transports=['websocket'])
+    except Exception as e:
+        print(f"⚠️ Error conectando cliente: {e}")
+        start_barrier.wait()
+        return
+
+    start_barrier.wait()
+    end_time = time.perf_counter() + duration
+    interval = 1.0 / fps
+    local = []
+
+    while time.perf_counter() < end_time:
+        sent = time.perf_counter()
+        reply.clear()
+        skipped.clear()
+        client.emit('process_frame', {'image': payload, 'timestamp': int(time.time() * 1000)})
+        if reply.wait(timeout=5.0) and not skipped:
+            local.append((time.perf_counter() - sent) * 1000)
+        remaining = interval - (time.perf_counter() - sent)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    client.disconnect()
+    with lock:
+        latencies.extend(local)
+
+def run_level(url, payload, n_clients, fps, duration):
+    """Ejecuta un nivel de concurrencia y devuelve las latencias (ms)"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(n_clients)
+    threads = [threading.Thread(target=run_client,
+                                args=(url, payload, fps, duration, latencies, lock, barrier),
+                                daemon=True)
+               for _ in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de clientes conectados vs latencia p99')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--clients', default='1,2,4,8,16', help='Niveles de concurrencia separados por coma')
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--duration', type=float, default=10, help='Segundos por nivel')
+    parser.add_argument('--image', default=None, help='Imagen de prueba (por defecto un frame sintético)')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    args = parser.parse_args()
+
+    payload = load_frame_payload(args.image, args.width, args.height)
+    levels = [int(n) for n in args.clients.split(',')]
+
+    print(f"🎹 Benchmark de concurrencia contra {args.url}")
+    print(f"   Frame: {len(payload) / 1024:.1f} KB, {args.fps} fps objetivo, {args.duration}s por nivel")
+    print("   MediaPipe en paralelo: un detector por hilo de CPU del servidor (PIANO_CPU_WORKERS)")
+    print("-" * 72)
+    print(f"{'clientes':>9} {'frames':>8} {'frames/s':>9} {'escala':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+
+    base_throughput = None
+    for n_clients in levels:
+        latencies = run_level(args.url, payload, n_clients, args.fps, args.duration)
+        if latencies.size == 0:
+            print(f"{n_clients:>9} {'sin respuestas':>46}")
+            continue
+        p50, p99 = np.percentile(latencies, [50, 99])
+        throughput = latencies.size / args.duration
+        base_throughput = base_throughput or throughput
+        print(f"{n_clients:>9} {latencies.size:>8} {throughput:>9.1f} {throughput / base_throughput:>6.1f}x "
+              f"{p50:>9.1f} {p99:>9.1f} {latencies.max():>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de decodificación de frames
+-------------------------------------
+Compara el camino original (b64decode → imdecode → flip → cvtColor, una
+copia por paso) con decode_frame (sin flip, cvtColor en el mismo buffer):
+latencia media/p99 por frame y memoria reservada por frame (tracemalloc).
+También verifica que, espejado, decode_frame produce exactamente el mismo RGB.
+
+Uso:
+    python benchmarks/bench_decodificacion.py --width 1280 --height 720 --frames 300
+    python benchmarks/bench_decodificacion.py --image mano.jpg
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.frame_utils import decode_frame
+from bench_concurrencia import load_frame_payload
+
+def decode_original(image_data):
+    """Camino original de process_frame_data"""
+    img_bytes = base64.b64decode(image_data)
+    img_array = np.frombuffer(img_bytes, np.uint8)
+    frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+    frame = cv2.flip(frame, 1)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+def measure(decode, image_data, frames):
+    """Latencias (ms) y pico de memoria reservada durante la decodificación"""
+    decode(image_data)  # Calentamiento
+
+    latencies = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        decode(image_data)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    for _ in range(frames):
+        decode(image_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(latencies), peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Decodificación de frames: original vs decode_frame')
+    parser.add_argument('--image', default=None, help='Imagen de prueba (por defecto, frame sintético)')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    image_data = load_frame_payload(args.image, args.width, args.height).partition(',')[2]
+
+    # Paridad exacta entre ambos caminos (el espejo se aplica ahora a los landmarks)
+    if not np.array_equal(decode_original(image_data), cv2.flip(decode_frame(image_data), 1)):
+        raise SystemExit("❌ decode_frame no reproduce el frame original")
+    print("✅ Salida idéntica al camino original")
+
+    print(f"{'camino':>10} {'media ms':>9} {'p99 ms':>8} {'pico KB':>9}")
+    for name, decode in (('original', decode_original), ('actual', decode_frame)):
+        latencies, peak = measure(decode, image_data, args.frames)
+        print(f"{name:>10} {latencies.mean():>9.2f} {np.percentile(latencies, 99):>8.2f} "
+              f"{peak / 1024:>9.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Prueba de carga del despliegue multi-proceso
+--------------------------------------------
+Lanza servidor_multiproceso.py con 1, 2, 4... workers y mide el throughput
+de frames con una carga proporcional al número de workers. Un escalado
+cercano a lineal da una eficiencia (speedup / workers) próxima a 1.
+
+Uso:
+    python benchmarks/bench_escalado.py --workers 1,2,4 --clients-per-worker 4
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(BENCH_DIR)
+
+from bench_concurrencia import load_frame_payload, run_level
+
+def wait_for_port(host, port, timeout):
+    """Espera a que el servidor acepte conexiones"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description='Escalado del throughput con el número de workers')
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--clients-per-worker', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--startup-timeout', type=float, default=120)
+    parser.add_argument('--message-queue', default='local://127.0.0.1:6380')
+    parser.add_argument('--image', default=None)
+    args = parser.parse_args()
+
+    payload = load_frame_payload(args.image, 640, 480)
+    url = f'http://127.0.0.1:{args.port}'
+    baseline = None
+
+    print(f"{'workers':>8} {'clientes':>9} {'frames/s':>9} {'p99 ms':>9} {'speedup':>8} {'eficiencia':>11}")
+    for n_workers in [int(n) for n in args.workers.split(',')]:
+        launcher = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'servidor_multiproceso.py'),
+                                     '--workers', str(n_workers),
+                                     '--port', str(args.port),
+                                     '--message-queue', args.message_queue,
+                                     '--sticky', 'conexion'],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            ready = wait_for_port('127.0.0.1', args.port, args.startup_timeout)
+            worker_ports = [5101 + i for i in range(n_workers)]
+            ready = ready and all(wait_for_port('127.0.0.1', p, args.startup_timeout) for p in worker_ports)
+            if not ready:
+                print(f"{n_workers:>8} ❌ el servidor no arrancó")
+                continue
+
+            n_clients = n_workers * args.clients_per_worker
+            latencies = run_level(url, payload, n_clients, args.fps, args.duration)
+            throughput = latencies.size / args.duration
+            p99 = np.percentile(latencies, 99) if latencies.size else float('nan')
+            if baseline is None:
+                baseline = throughput / n_workers if throughput else None
+            speedup = throughput / baseline if baseline else float('nan')
+            print(f"{n_workers:>8} {n_clients:>9} {throughput:>9.1f} {p99:>9.1f} "
+                  f"{speedup:>8.2f} {speedup / n_workers:>11.2f}")
+        finally:
+            launcher.terminate()
+            try:
+                launcher.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                launcher.kill()
+            time.sleep(1)
+
+if __name__ == '__main__':
+    main()
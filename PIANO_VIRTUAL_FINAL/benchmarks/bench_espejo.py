@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Paridad y coste: espejo de la imagen vs espejo de los landmarks
+---------------------------------------------------------------
+1. Comprobación analítica: LandmarkTransform(mirror=True) sobre landmarks
+   sintéticos coincide con las coordenadas que resultan de voltear la imagen
+   (x → 1 - x) y espejar dos veces es la identidad.
+2. Con imágenes reales (--images), ejecuta MediaPipe por los dos caminos
+   (cv2.flip + process vs process + transformación) y compara landmarks,
+   lateralidad y las decisiones de navegación / dedo doblado.
+3. Mide el coste de cv2.flip de un frame frente al espejo de un array (21, 3).
+
+Uso:
+    python benchmarks/bench_espejo.py
+    python benchmarks/bench_espejo.py --images capturas/ --tolerance 0.01
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.landmark_transform import LandmarkTransform, to_landmark_points
+from utils.features_utils import landmarks_to_array
+from utils.hands_utils import is_finger_bent, detect_navigation_gesture
+from utils.gesture_utils import is_pointing_gesture
+
+def check_analytic(transform):
+    """Paridad exacta sobre landmarks sintéticos"""
+    rng = np.random.default_rng(0)
+    hands = rng.uniform(0, 1, size=(64, 21, 3)).astype(np.float32)
+
+    mirrored = transform.apply(hands)
+    expected = hands.copy()
+    expected[..., 0] = 1.0 - expected[..., 0]
+    assert np.allclose(mirrored, expected, atol=1e-6), "El espejo no equivale a x → 1 - x"
+    assert np.allclose(transform.apply(mirrored), hands, atol=1e-6), "Espejar dos veces no es la identidad"
+    assert transform.apply_handedness('Left') == 'Right'
+    print("✅ Paridad analítica: x → 1 - x, involución y lateralidad")
+
+def decisions(landmarks):
+    """Decisiones que dependen de la orientación de los landmarks"""
+    pointing = is_pointing_gesture(landmarks)
+    return {
+        'pointing': pointing,
+        'navigation': detect_navigation_gesture(landmarks) if pointing else None,
+        'bent': is_finger_bent(landmarks, finger_indices=[8, 7, 6, 5], threshold_angle=120)
+    }
+
+def check_images(paths, transform, tolerance):
+    """Paridad con MediaPipe sobre imágenes reales"""
+    import mediapipe as mp
+    hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2,
+                                     min_detection_confidence=0.5)
+
+    compared = mismatched = 0
+    max_error = 0.0
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        h, w = frame.shape[:2]
+
+        # Camino original: voltear la imagen
+        flipped = hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+        # Camino nuevo: espejo en landmarks
+        tracked = transform.transform_results(hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)), w, h)
+
+        if not flipped.multi_hand_landmarks or not tracked:
+            if bool(flipped.multi_hand_landmarks) != bool(tracked):
+                print(f"⚠️ {os.path.basename(path)}: detección distinta entre caminos")
+                mismatched += 1
+            continue
+
+        reference = landmarks_to_array(flipped.multi_hand_landmarks[0].landmark)
+        label_ref = flipped.multi_handedness[0].classification[0].label
+        label_new, array = tracked[0]
+        error = float(np.abs(array - reference)[:, :2].max())
+        max_error = max(max_error, error)
+        compared += 1
+
+        same = (error <= tolerance and label_ref == label_new and
+                decisions(to_landmark_points(reference)) == decisions(to_landmark_points(array)))
+        if not same:
+            mismatched += 1
+            print(f"⚠️ {os.path.basename(path)}: error {error:.4f}, lateralidad {label_ref}/{label_new}")
+
+    hands.close()
+    print(f"Imágenes comparadas: {compared}, discrepancias: {mismatched}, error máximo: {max_error:.4f}")
+
+def bench_cost(transform, width, height, repeats):
+    """Coste de voltear el frame frente a espejar los landmarks"""
+    frame = np.random.default_rng(0).integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    landmarks = np.random.default_rng(1).uniform(0, 1, size=(21, 3)).astype(np.float32)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cv2.flip(frame, 1)
+    flip_us = (time.perf_counter() - start) / repeats * 1e6
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        transform.apply(landmarks)
+    mirror_us = (time.perf_counter() - start) / repeats * 1e6
+
+    print(f"cv2.flip {width}x{height}: {flip_us:.1f} µs | espejo (21, 3): {mirror_us:.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser(description='Espejo en imagen vs espejo en landmarks')
+    parser.add_argument('--images', default=None, help='Carpeta con imágenes de manos (jpg/png)')
+    parser.add_argument('--tolerance', type=float, default=0.01, help='Diferencia máxima en coordenadas normalizadas')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--repeats', type=int, default=1000)
+    args = parser.parse_args()
+
+    transform = LandmarkTransform(mirror=True)
+    check_analytic(transform)
+
+    if args.images:
+        paths = sorted(glob.glob(os.path.join(args.images, '*.jpg')) +
+                       glob.glob(os.path.join(args.images, '*.png')))
+        check_images(paths, transform, args.tolerance)
+
+    bench_cost(transform, args.width, args.height, args.repeats)
+
+if __name__ == '__main__':
+    main()
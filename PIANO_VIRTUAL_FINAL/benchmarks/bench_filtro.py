@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Precisión de tecla vs FPS con filtro One-Euro y predicción
+----------------------------------------------------------
+Reproduce una sesión (grabada con PIANO_RECORD_DIR o sintética) a varios
+FPS y compara la tecla elegida por determine_note_from_position con tres
+variantes de landmarks:
+    - crudo: tal cual llega de MediaPipe
+    - filtro: One-Euro
+    - filtro+pred: One-Euro + extrapolación de la latencia de proceso
+La referencia es la tecla bajo la posición real en el instante en que la
+respuesta llega al cliente (t + latencia). Para grabaciones reales la
+posición real se aproxima con una media móvil centrada (no causal).
+
+Uso:
+    python benchmarks/bench_filtro.py --fps 30,20,15,10,8 --latency-ms 60
+    python benchmarks/bench_filtro.py --recording grabaciones/<sid>.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from config import LANDMARK_FILTER_MIN_CUTOFF, LANDMARK_FILTER_BETA, LANDMARK_FILTER_D_CUTOFF
+from utils.landmark_filter import OneEuroFilter
+from utils.hands_utils import get_note_from_finger_position
+
+PIANO_CONFIG = {'min_octave': 2, 'visible_octaves': 3, 'current_octave_offset': 1, 'max_octave': 6}
+INDEX_TIP = 8
+
+def synthetic_session(duration, rate, noise, seed=0):
+    """Índice que se mueve entre posiciones aleatorias con pausas, más jitter"""
+    rng = np.random.default_rng(seed)
+    times = np.arange(0, duration, 1.0 / rate)
+    template = rng.normal(0, 0.03, size=(21, 3)).astype(np.float32)
+    template[INDEX_TIP] = 0.0
+
+    # Trayectoria de la punta: pausas de 0.4-1.0 s y transiciones suaves de 0.2 s
+    tip_x = np.empty_like(times)
+    current, target, t_start, hold_until = 0.5, 0.5, 0.0, 0.0
+    for i, t in enumerate(times):
+        if t >= hold_until:
+            current, target = target, rng.uniform(0.1, 0.9)
+            t_start, hold_until = t, t + 0.2 + rng.uniform(0.4, 1.0)
+        progress = np.clip((t - t_start) / 0.2, 0.0, 1.0)
+        tip_x[i] = current + (target - current) * 0.5 * (1 - np.cos(np.pi * progress))
+
+    truth = np.repeat(template[None], len(times), axis=0)
+    truth[:, :, 0] += tip_x[:, None]
+    truth[:, :, 1] += 0.25
+    observed = truth + rng.normal(0, noise, size=truth.shape).astype(np.float32)
+    return times, observed, truth
+
+def load_recording(path, window):
+    """Sesión grabada; referencia = media móvil centrada de los landmarks"""
+    times, frames = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            times.append(record['t'])
+            frames.append(record['landmarks'])
+    times = np.asarray(times) - times[0]
+    observed = np.asarray(frames, dtype=np.float32)
+    kernel = np.ones(window) / window
+    padded = np.pad(observed, ((window // 2, window - 1 - window // 2), (0, 0), (0, 0)), mode='edge')
+    truth = np.apply_along_axis(lambda v: np.convolve(v, kernel, mode='valid'), 0, padded)
+    return times, observed, truth.astype(np.float32)
+
+def key_at(landmarks):
+    return get_note_from_finger_position(float(landmarks[INDEX_TIP, 0]), float(landmarks[INDEX_TIP, 1]),
+                                         PIANO_CONFIG)
+
+def evaluate(times, observed, truth, fps, latency_s):
+    """Precisión y cambios de tecla espurios por segundo para cada variante"""
+    source_rate = (len(times) - 1) / (times[-1] - times[0])
+    step = max(1, int(round(source_rate / fps)))
+    indices = np.arange(0, len(times), step)
+    one_euro = OneEuroFilter(LANDMARK_FILTER_MIN_CUTOFF, LANDMARK_FILTER_BETA, LANDMARK_FILTER_D_CUTOFF)
+
+    outputs = {'crudo': [], 'filtro': [], 'filtro+pred': []}
+    reference = []
+    for i in indices:
+        filtered = one_euro.filter(observed[i], times[i])
+        outputs['crudo'].append(key_at(observed[i]))
+        outputs['filtro'].append(key_at(filtered))
+        outputs['filtro+pred'].append(key_at(one_euro.predict(latency_s)))
+        # Posición real cuando la respuesta llega al cliente
+        arrival = min(np.searchsorted(times, times[i] + latency_s), len(times) - 1)
+        reference.append(key_at(truth[arrival]))
+
+    duration = times[indices[-1]] - times[indices[0]]
+    true_changes = sum(a != b for a, b in zip(reference, reference[1:]))
+    results = {}
+    for name, keys in outputs.items():
+        accuracy = np.mean([k == r for k, r in zip(keys, reference)])
+        changes = sum(a != b for a, b in zip(keys, keys[1:]))
+        results[name] = (accuracy, max(0, changes - true_changes) / duration)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Precisión de tecla vs FPS con filtro One-Euro')
+    parser.add_argument('--recording', default=None, help='Sesión grabada (JSONL de PIANO_RECORD_DIR)')
+    parser.add_argument('--fps', default='30,20,15,10,8')
+    parser.add_argument('--latency-ms', type=float, default=60.0, help='Latencia de proceso a compensar')
+    parser.add_argument('--duration', type=float, default=120.0, help='Duración de la sesión sintética (s)')
+    parser.add_argument('--noise', type=float, default=0.004, help='Jitter sintético (coordenadas normalizadas)')
+    parser.add_argument('--window', type=int, default=5, help='Ventana de la referencia en grabaciones')
+    args = parser.parse_args()
+
+    if args.recording:
+        times, observed, truth = load_recording(args.recording, args.window)
+    else:
+        times, observed, truth = synthetic_session(args.duration, 60, args.noise)
+
+    latency_s = args.latency_ms / 1000
+    print(f"Frames: {len(times)} | latencia compensada: {args.latency_ms:.0f} ms")
+    print(f"{'fps':>4} {'variante':>12} {'precisión':>10} {'saltos/s':>9}")
+    for fps in [int(v) for v in args.fps.split(',')]:
+        for name, (accuracy, flicker) in evaluate(times, observed, truth, fps, latency_s).items():
+            print(f"{fps:>4} {name:>12} {accuracy:>10.1%} {flicker:>9.2f}")
+
+if __name__ == '__main__':
+    main()
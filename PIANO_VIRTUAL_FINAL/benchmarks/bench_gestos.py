@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de la librería vectorizada de gestos
+----------------------------------------------
+Compara las implementaciones anteriores (acceso landmark a landmark, una
+mano por llamada) con gesture_features sobre un batch de manos sintéticas:
+verifica que las decisiones coinciden y mide µs por mano.
+
+Uso:
+    python benchmarks/bench_gestos.py --hands 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.gesture_features import (compute_gesture_features, fingers_up, pointing_mask,
+                                    navigation_directions, NAVIGATION_LEFT, NAVIGATION_RIGHT)
+from utils.landmark_transform import to_landmark_points
+
+# --- Implementaciones anteriores (referencia) ---
+
+def legacy_pointing(landmarks):
+    index_tip_y = landmarks[8].y
+    return (index_tip_y < landmarks[12].y - 0.05 and
+            index_tip_y < landmarks[16].y - 0.05 and
+            index_tip_y < landmarks[20].y - 0.05)
+
+def legacy_navigation(landmarks):
+    wrist = np.array([landmarks[0].x, landmarks[0].y])
+    index_tip = np.array([landmarks[8].x, landmarks[8].y])
+    direction = index_tip - wrist
+    direction_normalized = direction / (np.linalg.norm(direction) + 1e-7)
+    if direction_normalized[0] < -0.7:
+        return 'left'
+    if direction_normalized[0] > 0.7:
+        return 'right'
+    return None
+
+def legacy_fingers(landmarks, hand_label):
+    states = [landmarks[4].x > landmarks[3].x if hand_label == "Right" else landmarks[4].x < landmarks[3].x]
+    for tip, pip in zip([8, 12, 16, 20], [6, 10, 14, 18]):
+        states.append(landmarks[tip].y < landmarks[pip].y)
+    return states
+
+def synthetic_hands(n, seed=0):
+    """Manos aleatorias alrededor de una pose base"""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, size=(1, 21, 3))
+    return (base + rng.normal(0, 0.1, size=(n, 21, 3))).astype(np.float32)
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Gestos: acceso por landmark vs vectorizado')
+    parser.add_argument('--hands', type=int, default=5000)
+    args = parser.parse_args()
+
+    hands = synthetic_hands(args.hands)
+    labels = ['Right' if i % 2 else 'Left' for i in range(args.hands)]
+    points = [to_landmark_points(hand) for hand in hands]
+
+    def run_legacy():
+        return ([legacy_pointing(p) for p in points],
+                [legacy_navigation(p) for p in points],
+                [legacy_fingers(p, label) for p, label in zip(points, labels)])
+
+    def run_vectorized():
+        navigation = navigation_directions(hands)
+        return (pointing_mask(hands).tolist(),
+                [{NAVIGATION_LEFT: 'left', NAVIGATION_RIGHT: 'right'}.get(int(d)) for d in navigation],
+                fingers_up(hands, labels).tolist())
+
+    legacy, legacy_time = timed(run_legacy)
+    vectorized, vectorized_time = timed(run_vectorized)
+    _, full_time = timed(lambda: compute_gesture_features(hands, labels))
+
+    names = ('apuntar', 'navegación', 'dedos')
+    for name, old, new in zip(names, legacy, vectorized):
+        mismatches = sum(1 for a, b in zip(old, new) if a != b)
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"{status} {name}: {mismatches} discrepancias en {args.hands} manos")
+
+    per_hand = lambda seconds: seconds / args.hands * 1e6
+    print(f"{'implementación':>22} {'µs/mano':>9}")
+    print(f"{'por landmark':>22} {per_hand(legacy_time):>9.2f}")
+    print(f"{'vectorizada':>22} {per_hand(vectorized_time):>9.2f}")
+    print(f"{'todas las features':>22} {per_hand(full_time):>9.2f}")
+
+if __name__ == '__main__':
+    main()
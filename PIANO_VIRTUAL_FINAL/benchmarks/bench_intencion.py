@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de la compuerta de intención de tocar
+-----------------------------------------------
+Divide las muestras capturadas en entrenamiento/validación (por muestra),
+entrena IntentGate con la parte de entrenamiento y, sobre la validación
+(una fila por mano, como los frames del servidor), compara la regla del
+servidor sin compuerta (flexión del índice) con compuerta + flexión:
+    - por (categoría, tipo de gesto): fracción que dispara una nota
+    - falsos disparos en NEGATIVE y su reducción
+    - pérdida de detección en POSITIVE
+    - frames filtrados por la compuerta
+    - coste: µs por frame de la compuerta frente al trabajo posterior que
+      evita (flexión + prototipos; con --model también el modelo
+      profesional) y ahorro estimado por cada 1000 frames
+
+Uso:
+    python benchmarks/bench_intencion.py --data captured_data
+    python benchmarks/bench_intencion.py --data captured_data --model ml/models_professional/piano_finetuned_model.h5
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'ml'))
+
+from config import FINGER_INDICES, FINGER_BEND_THRESHOLD, INTENT_GATE_MIN_RECALL, PROTOTYPE_K
+from utils.hands_utils import is_finger_bent
+from utils.intent_gate import IntentGate
+from utils.prototype_classifier import PrototypeClassifier
+from utils.gesture_features import chain_flexion_angle
+from dataset_utils import iter_samples, split_indices
+
+def gesture_type(sample):
+    """Tipo de gesto de una muestra según su categoría"""
+    category = sample.get('gesture_category', 'POSITIVE')
+    if category == 'NEGATIVE':
+        return sample.get('negative_gesture_info', {}).get('gesture_type', 'UNKNOWN')
+    return sample.get('positive_gesture_info', {}).get('gesture_type', 'note')
+
+def hand_rows(samples):
+    """Manos presentes como filas: (array (N, 21, 3), categorías (N,), tipos de gesto (N,))"""
+    hands, categories, types = [], [], []
+    for sample in samples:
+        for key in ('landmarks_left_hand', 'landmarks_right_hand'):
+            hand = sample.get(key) or []
+            if len(hand) == 21:
+                hands.append(np.asarray(hand, dtype=np.float32))
+                categories.append(sample.get('gesture_category', 'POSITIVE'))
+                types.append(gesture_type(sample))
+    return np.stack(hands), np.asarray(categories), np.asarray(types)
+
+def time_per_call(func, probe, repeats):
+    """µs medios por llamada (con calentamiento)"""
+    func(probe)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(probe)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Compuerta de intención: frames filtrados, falsos disparos y coste')
+    parser.add_argument('--data', default=os.path.join(BASE_DIR, 'captured_data'))
+    parser.add_argument('--model', help='Modelo profesional para medir el coste que evita (.h5/.tflite/.npz)')
+    parser.add_argument('--min-recall', type=float, default=INTENT_GATE_MIN_RECALL)
+    parser.add_argument('--validation', type=float, default=0.2)
+    parser.add_argument('--repeats', type=int, default=2000)
+    args = parser.parse_args()
+
+    samples = [s for s in iter_samples(args.data) if s.get('gesture_category', 'POSITIVE') != 'NAVIGATION']
+    train_idx, validation_idx = split_indices(len(samples), args.validation)
+    train = [samples[i] for i in train_idx]
+
+    start = time.perf_counter()
+    gate = IntentGate.from_gesture_data(train, min_recall=args.min_recall)
+    fit_ms = (time.perf_counter() - start) * 1000
+    if gate is None:
+        raise SystemExit("❌ Hacen falta muestras POSITIVE y NEGATIVE")
+    hands, categories, types = hand_rows([samples[i] for i in validation_idx])
+    print(f"📁 {gate.n_samples} manos de entrenamiento, {len(hands)} de validación | "
+          f"umbral {gate.threshold:.3f} (recall objetivo {args.min_recall:.0%}) | ajuste {fit_ms:.0f} ms")
+
+    # Regla del servidor: flexión del índice; con compuerta además debe pasarla
+    chain = list(FINGER_INDICES)[::-1]
+    bent = chain_flexion_angle(hands, chain) < FINGER_BEND_THRESHOLD
+    allowed = gate.predict_proba(hands) >= gate.threshold
+    gated = bent & allowed
+
+    groups = defaultdict(list)
+    for i, key in enumerate(zip(categories, types)):
+        groups[key].append(i)
+    print(f"\n{'categoría':>10} {'gesto':>18} {'n':>5} {'flexión':>8} {'+compuerta':>11} {'filtrados':>10}")
+    for (category, kind), indices in sorted(groups.items()):
+        idx = np.array(indices)
+        print(f"{category:>10} {kind:>18} {len(idx):>5} {bent[idx].mean():>8.1%} "
+              f"{gated[idx].mean():>11.1%} {(~allowed[idx]).mean():>10.1%}")
+
+    negative = categories == 'NEGATIVE'
+    positive = ~negative
+    if negative.any():
+        before, after = bent[negative].mean(), gated[negative].mean()
+        reduction = 1 - after / before if before else 0.0
+        print(f"\n🚫 Falsos disparos NEGATIVE: {before:.1%} → {after:.1%} (reducción {reduction:.1%})")
+    if positive.any():
+        print(f"🎹 Detección POSITIVE: {bent[positive].mean():.1%} → {gated[positive].mean():.1%} "
+              f"(compuerta deja pasar {allowed[positive].mean():.1%})")
+    filtered = (~allowed).mean()
+    print(f"🚦 Frames filtrados por la compuerta: {filtered:.1%}")
+
+    # Coste por frame: compuerta frente al trabajo posterior que evita
+    probe = hands[0]
+    gate_us = time_per_call(gate.allows, probe, args.repeats)
+    bend_us = time_per_call(lambda hand: is_finger_bent(hand, FINGER_INDICES, FINGER_BEND_THRESHOLD),
+                            probe, args.repeats)
+    prototypes = PrototypeClassifier.from_gesture_data(train, k=PROTOTYPE_K)
+    downstream = {'flexión': bend_us}
+    if prototypes is not None:
+        downstream['prototipos'] = time_per_call(prototypes.predict_one, probe, args.repeats)
+    if args.model:
+        from model_bundle import ModelBundle
+        downstream['modelo profesional'] = ModelBundle(args.model).measure_latency(1) * 1000
+
+    print(f"\n{'etapa':>20} {'µs/frame':>10}")
+    print(f"{'compuerta':>20} {gate_us:>10.1f}")
+    for name, cost in downstream.items():
+        print(f"{name:>20} {cost:>10.1f}")
+    downstream_us = sum(downstream.values())
+    saved_ms = 1000 * (filtered * downstream_us - gate_us) / 1000
+    print(f"\n⏱️ Por cada 1000 frames: {1000 * filtered:.0f} filtrados, ahorro neto estimado {saved_ms:.1f} ms "
+          f"(sin contar el audio de los falsos disparos evitados)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark del overlay del teclado en el capturador
+--------------------------------------------------
+Compara, a 1280×720, el dibujo por frame anterior (copia del frame,
+teclas y textos redibujados y cv2.addWeighted sobre toda la imagen) con
+el overlay pre-renderizado de overlay_utils (mezcla in-place solo en su
+bounding box). Verifica que ambos producen la misma imagen y mide ms por
+frame, incluyendo el coste de reconstruir el overlay al cambiar la
+selección.
+
+Uso:
+    python benchmarks/bench_overlay.py --frames 300
+    python benchmarks/bench_overlay.py --width 1920 --height 1080
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'capturaDatos'))
+
+from overlay_utils import OverlayCache
+
+ALPHA = 0.6
+
+def draw_keyboard(overlay, octave, target):
+    """Misma geometría que PianoCaptureApp.draw_piano_keyboard (nota simple)"""
+    h, w = overlay.shape[:2]
+    margin = w // 10
+    keyboard_width = w - (2 * margin)
+    keyboard_height = 150
+    keyboard_y = 40
+    white_key_width = keyboard_width // 7
+    black_key_width = int(white_key_width * 0.7)
+    black_key_height = int(keyboard_height * 0.65)
+
+    for i, note in enumerate(["DO", "RE", "MI", "FA", "SOL", "LA", "SI"]):
+        x = margin + (i * white_key_width)
+        color, thickness = ((0, 255, 0), 6) if note == target else ((255, 255, 255), 3)
+        cv2.rectangle(overlay, (x + 2, keyboard_y), (x + white_key_width - 2, keyboard_y + keyboard_height),
+                      color, thickness)
+        cv2.putText(overlay, f"{note}{octave}", (x + 8, keyboard_y + keyboard_height + 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    for relative_pos, note in zip([0.5, 1.5, 3.5, 4.5, 5.5], ["DO#", "RE#", "FA#", "SOL#", "LA#"]):
+        x = margin + int(relative_pos * white_key_width + white_key_width // 2 - black_key_width // 2)
+        is_target = note == target
+        color, thickness = ((0, 220, 0), 5) if is_target else ((30, 30, 30), -1)
+        cv2.rectangle(overlay, (x, keyboard_y), (x + black_key_width, keyboard_y + black_key_height),
+                      color, thickness)
+        cv2.putText(overlay, f"{note}{octave}", (x + 5, keyboard_y + black_key_height // 2 + 5),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255) if is_target else (180, 180, 180), 2)
+
+def legacy_frame(frame, octave, target):
+    """Implementación anterior: copia completa + redibujo + mezcla de toda la imagen"""
+    overlay = frame.copy()
+    draw_keyboard(overlay, octave, target)
+    return cv2.addWeighted(frame, 1 - ALPHA, overlay, ALPHA, 0)
+
+def main():
+    parser = argparse.ArgumentParser(description='Overlay del teclado: redibujo por frame vs cacheado')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8) for _ in range(8)]
+    selection = ("POSITIVE", 4, "single", "MI")
+    draw = lambda canvas, sel: draw_keyboard(canvas, sel[1], sel[3])
+
+    # Paridad
+    cache = OverlayCache(alpha=ALPHA)
+    max_diff = 0
+    for frame in frames:
+        expected = legacy_frame(frame, 4, "MI")
+        result = cache.get(selection, frame.shape, draw).blend(frame.copy())
+        max_diff = max(max_diff, int(np.abs(expected.astype(np.int16) - result).max()))
+    status = "✅" if max_diff <= 1 else "❌"
+    print(f"{status} paridad con addWeighted de toda la imagen: diferencia máxima {max_diff} niveles")
+
+    overlay = cache.get(selection, frames[0].shape, draw)
+    ys, xs = overlay.bbox
+    area = (ys.stop - ys.start) * (xs.stop - xs.start) / (args.height * args.width)
+    print(f"📐 bounding box {xs.stop - xs.start}×{ys.stop - ys.start} ({area:.0%} del frame), "
+          f"{int(overlay.mask.sum())} píxeles dibujados")
+
+    def timed(func):
+        work = [frame.copy() for frame in frames]
+        start = time.perf_counter()
+        for i in range(args.frames):
+            func(work[i % len(work)])
+        return (time.perf_counter() - start) / args.frames * 1000
+
+    legacy_ms = timed(lambda frame: legacy_frame(frame, 4, "MI"))
+    cached_ms = timed(lambda frame: cache.get(selection, frame.shape, draw).blend(frame))
+
+    start = time.perf_counter()
+    for i in range(20):
+        OverlayCache(alpha=ALPHA).get(("POSITIVE", 4, "single", "DO"), frames[0].shape, draw)
+    rebuild_ms = (time.perf_counter() - start) / 20 * 1000
+
+    print(f"{'implementación':>26} {'ms/frame':>9}")
+    print(f"{'redibujo + mezcla total':>26} {legacy_ms:>9.3f}")
+    print(f"{'overlay cacheado':>26} {cached_ms:>9.3f}")
+    print(f"{'reconstrucción (cambio)':>26} {rebuild_ms:>9.3f}")
+    print(f"🚀 {legacy_ms / max(cached_ms, 1e-9):.1f}x más rápido por frame "
+          f"({args.width}×{args.height}, {cache.builds} reconstrucción)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark del formato compacto de frame_processed
+-------------------------------------------------
+Compara bytes por frame y tiempo de serialización entre el formato json
+original (21 dicts index/x/y/z) y el formato compacto (keyframes int16 +
+deltas int8) sobre una secuencia sintética de landmarks con movimiento y
+jitter. También verifica que el decodificador reconstruye los valores.
+
+Uso:
+    python benchmarks/bench_payload.py --frames 3000 --keyframe-interval 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.payload_utils import LandmarkDeltaEncoder, decode_landmarks, DEFAULT_SCALE
+
+def synthetic_sequence(n_frames, seed=0):
+    """Mano que se desplaza lentamente con jitter de detección"""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, size=(21, 3)).astype(np.float32)
+    base[:, 2] = rng.uniform(-0.1, 0.0, size=21)
+    t = np.arange(n_frames)[:, None, None]
+    drift = 0.05 * np.sin(t / 40.0)
+    jitter = rng.normal(0, 0.002, size=(n_frames, 21, 3))
+    return (base + drift + jitter).astype(np.float32)
+
+def json_payload(landmarks, w, h):
+    coordinates = [{'index': i, 'x': float(lm[0]) * w, 'y': float(lm[1]) * h, 'z': float(lm[2])}
+                   for i, lm in enumerate(landmarks)]
+    return json.dumps({'coordinates': coordinates}).encode('utf-8')
+
+def main():
+    parser = argparse.ArgumentParser(description='Bytes por frame: json vs compacto')
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--keyframe-interval', type=int, default=30)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    args = parser.parse_args()
+
+    sequence = synthetic_sequence(args.frames)
+
+    # Formato json original
+    start = time.perf_counter()
+    json_sizes = [len(json_payload(frame, args.width, args.height)) for frame in sequence]
+    json_time = (time.perf_counter() - start) / args.frames
+
+    # Formato compacto
+    encoder = LandmarkDeltaEncoder(keyframe_interval=args.keyframe_interval)
+    start = time.perf_counter()
+    encoded = [encoder.encode(frame) for frame in sequence]
+    compact_time = (time.perf_counter() - start) / args.frames
+
+    # Metadatos que viajan junto al binario en cada respuesta
+    compact_sizes = [len(packed) + len(json.dumps({'landmarks_format': dict(fmt, width=args.width,
+                                                                             height=args.height,
+                                                                             scale=DEFAULT_SCALE)}))
+                     for packed, fmt in encoded]
+    keyframes = sum(1 for _, fmt in encoded if fmt['type'] == 'key')
+
+    # Verificación del decodificador
+    previous = None
+    max_error = 0.0
+    for frame, (packed, fmt) in zip(sequence, encoded):
+        decoded, previous = decode_landmarks(packed, fmt['type'], previous)
+        max_error = max(max_error, float(np.abs(decoded - frame).max()))
+
+    json_mean = np.mean(json_sizes)
+    compact_mean = np.mean(compact_sizes)
+    print(f"Frames: {args.frames}, keyframes: {keyframes} ({keyframes / args.frames:.1%})")
+    print(f"{'formato':>10} {'bytes/frame':>12} {'µs/frame':>10}")
+    print(f"{'json':>10} {json_mean:>12.0f} {json_time * 1e6:>10.1f}")
+    print(f"{'compacto':>10} {compact_mean:>12.0f} {compact_time * 1e6:>10.1f}")
+    print(f"Ahorro: {json_mean - compact_mean:.0f} bytes/frame ({1 - compact_mean / json_mean:.1%})")
+    print(f"Error máximo de reconstrucción: {max_error:.6f} (cuantización 1/{DEFAULT_SCALE})")
+
+if __name__ == '__main__':
+    main()
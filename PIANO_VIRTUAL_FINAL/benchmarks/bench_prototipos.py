@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark del clasificador por prototipos frente al modelo Keras
+----------------------------------------------------------------
+Divide las muestras capturadas en entrenamiento/validación (por muestra),
+construye PrototypeClassifier (centroides y k-NN) con la parte de
+entrenamiento y compara sobre la validación:
+    - accuracy (muestras POSITIVE; la mano más segura de cada muestra)
+    - tasa de rechazo correcto de las muestras NEGATIVE
+    - cobertura y accuracy por encima de PROTOTYPE_MIN_CONFIDENCE
+    - µs por mano (predict_one, como en el servidor) y por lote
+Con --model también evalúa el modelo profesional sobre las mismas muestras
+(su accuracy y la latencia de una llamada de una fila; en su caso la
+columna de ajuste es el tiempo de carga del modelo).
+
+Uso:
+    python benchmarks/bench_prototipos.py --data captured_data
+    python benchmarks/bench_prototipos.py --data captured_data --model ml/models_professional/piano_finetuned_model.h5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'ml'))
+
+from config import PROTOTYPE_K, PROTOTYPE_MIN_CONFIDENCE
+from utils.prototype_classifier import PrototypeClassifier, REJECT_LABEL
+from dataset_utils import iter_samples, split_indices
+
+def sample_arrays(sample):
+    """Manos presentes de una muestra como array (H, 21, 3)"""
+    hands = [sample.get(key) for key in ('landmarks_left_hand', 'landmarks_right_hand')]
+    hands = [np.asarray(hand, dtype=np.float32) for hand in hands if hand and len(hand) == 21]
+    return np.stack(hands) if hands else None
+
+def evaluate_prototypes(classifier, samples):
+    """Predicción por muestra: la mano con más confianza"""
+    predicted, confidences = [], []
+    for sample in samples:
+        labels, confidence = classifier.predict(sample_arrays(sample))
+        best = int(np.argmax(confidence))
+        predicted.append(labels[best])
+        confidences.append(float(confidence[best]))
+    return predicted, np.asarray(confidences)
+
+def main():
+    parser = argparse.ArgumentParser(description='Prototipos vs modelo Keras: accuracy y latencia')
+    parser.add_argument('--data', default=os.path.join(BASE_DIR, 'captured_data'))
+    parser.add_argument('--model', help='Modelo profesional para comparar (.h5/.tflite/.npz)')
+    parser.add_argument('--validation', type=float, default=0.2)
+    parser.add_argument('--repeats', type=int, default=2000)
+    args = parser.parse_args()
+
+    samples = [s for s in iter_samples(args.data)
+               if s.get('gesture_category', 'POSITIVE') != 'NAVIGATION' and sample_arrays(s) is not None]
+    if not samples:
+        raise SystemExit("❌ No hay muestras con manos")
+    train_idx, validation_idx = split_indices(len(samples), args.validation)
+    train = [samples[i] for i in train_idx]
+    validation = [samples[i] for i in validation_idx]
+    truth = np.array([REJECT_LABEL if s.get('gesture_category') == 'NEGATIVE' else s.get('target_note_or_chord')
+                      for s in validation])
+    positive = truth != REJECT_LABEL
+    print(f"📁 {len(train)} muestras de entrenamiento, {len(validation)} de validación "
+          f"({int((~positive).sum())} negativas)")
+
+    probe = sample_arrays(validation[0])[0]
+    print(f"\n{'método':>10} {'acc':>7} {'rechazo':>8} {'cobert.':>8} {'acc≥umbral':>11} "
+          f"{'ajuste ms':>10} {'µs/mano':>8} {'µs/fila lote':>13}")
+    for mode in ('centroid', 'knn'):
+        start = time.perf_counter()
+        classifier = PrototypeClassifier.from_gesture_data(train, mode=mode, k=PROTOTYPE_K)
+        fit_ms = (time.perf_counter() - start) * 1000
+
+        predicted, confidences = evaluate_prototypes(classifier, validation)
+        predicted = np.asarray(predicted)
+        correct = predicted == truth
+        accuracy = correct[positive].mean() if positive.any() else 0.0
+        rejection = correct[~positive].mean() if (~positive).any() else float('nan')
+        accepted = confidences >= PROTOTYPE_MIN_CONFIDENCE
+        coverage = accepted.mean()
+        accepted_accuracy = correct[accepted].mean() if accepted.any() else 0.0
+
+        classifier.predict_one(probe)  # Calentamiento
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            classifier.predict_one(probe)
+        single_us = (time.perf_counter() - start) / args.repeats * 1e6
+
+        batch = np.concatenate([sample_arrays(s) for s in validation])
+        start = time.perf_counter()
+        classifier.predict(batch)
+        batch_us = (time.perf_counter() - start) / len(batch) * 1e6
+
+        print(f"{mode:>10} {accuracy:>7.2%} {rejection:>8.2%} {coverage:>8.2%} {accepted_accuracy:>11.2%} "
+              f"{fit_ms:>10.1f} {single_us:>8.1f} {batch_us:>13.2f}")
+
+    if args.model:
+        from model_bundle import ModelBundle
+        from dataset_utils import FeatureDataset
+        from utils.features_utils import build_feature_batch
+
+        bundle = ModelBundle(args.model)
+        class_index = {label: i for i, label in enumerate(bundle.classes)}
+        rows, masks, row_sample, labels = [], [], [], []
+        for sample, label in zip(validation, truth):
+            if label not in class_index:
+                continue
+            hands = {'Left': sample.get('landmarks_left_hand') or None,
+                     'Right': sample.get('landmarks_right_hand') or None}
+            batch, mask, _ = build_feature_batch(hands, bundle.input_features, bundle.pipeline)
+            rows.append(batch)
+            masks.append(mask)
+            row_sample.extend([len(labels)] * len(batch))
+            labels.append(class_index[label])
+        dataset = FeatureDataset(np.concatenate(rows), np.concatenate(masks), np.asarray(row_sample),
+                                 np.asarray(labels), bundle.classes)
+        predicted, _ = dataset.best_rows(bundle.predict_dataset(dataset))
+        keras_accuracy = (predicted == dataset.labels).mean()
+        print(f"{'keras':>10} {keras_accuracy:>7.2%} {'-':>8} {'-':>8} {'-':>11} "
+              f"{bundle.load_time_s * 1000:>10.1f} {bundle.measure_latency(1) * 1000:>8.1f} "
+              f"{bundle.measure_latency(4096) / 4096 * 1000:>13.2f}")
+
+if __name__ == '__main__':
+    main()
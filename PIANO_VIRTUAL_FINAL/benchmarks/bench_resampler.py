@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark del re-muestreador del banco de notas
+-----------------------------------------------
+Mide el throughput de `resample_pitch` (Msamples/s) para varios
+desplazamientos y, si se indica la carpeta de audio, el coste de arranque
+de `NoteBank.build` y el tiempo de búsqueda de una nota.
+
+Uso:
+    python benchmarks/bench_resampler.py
+    python benchmarks/bench_resampler.py --audio-dir dataset/dataset_audio
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.note_bank import resample_pitch
+
+def bench_resampler(seconds, repeats):
+    """Throughput del re-muestreo sobre un sample estéreo sintético"""
+    rate = 44100
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (np.sin(2 * np.pi * 261.63 * t) * 12000).astype(np.int16)
+    stereo = np.stack([tone, tone], axis=1)
+
+    print(f"Sample: {seconds:.1f}s estéreo ({stereo.shape[0]:,} frames)")
+    print(f"{'semitonos':>10} {'ms':>9} {'Msamples/s':>11}")
+    for semitones in (-6, -2, -1, 1, 2, 6):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            shifted = resample_pitch(stereo, semitones)
+        elapsed = (time.perf_counter() - start) / repeats
+        throughput = shifted.size / elapsed / 1e6
+        print(f"{semitones:>10} {elapsed * 1000:>9.2f} {throughput:>11.1f}")
+
+def bench_note_bank(audio_dir):
+    """Coste de arranque del banco y tiempo de búsqueda"""
+    import pygame
+    from utils.note_bank import NoteBank
+
+    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+    bank = NoteBank().build(audio_dir)
+    print(f"Banco: {len(bank)} notas ({len(bank.synthesized)} sintetizadas) en {bank.build_seconds * 1000:.1f} ms")
+
+    n = 100000
+    start = time.perf_counter()
+    for _ in range(n):
+        bank.get('DOS4')
+    print(f"Búsqueda: {(time.perf_counter() - start) / n * 1e6:.2f} µs por nota")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del re-muestreador de notas')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Duración del sample sintético')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--audio-dir', default=None, help='Carpeta con octava2..octava6')
+    args = parser.parse_args()
+
+    bench_resampler(args.seconds, args.repeats)
+    if args.audio_dir:
+        bench_note_bank(args.audio_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Validación del detector de flexión del índice
+---------------------------------------------
+Evalúa sobre las muestras de captura_notas.py la regla anterior
+(punta.y > articulación.y) y la nueva (ángulo medio PIP/DIP con umbral
+por dedo). Para cada tipo de gesto NEGATIVE (PARTIAL_BEND, FIST_CLOSED,
+HAND_OPEN, ...) reporta la tasa de falsos disparos (índice detectado como
+doblado en un gesto que no debe tocar) y, para POSITIVE, la tasa de
+detección.
+
+Uso:
+    python benchmarks/validar_flexion.py --data capturaDatos/captured_data_3categories
+    python benchmarks/validar_flexion.py --data captured_data --threshold 110
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, 'ml'))
+
+from config import FINGER_BEND_THRESHOLDS
+from utils.gesture_features import finger_flexion_angles, INDEX_FINGER
+from dataset_utils import iter_samples
+
+def load_samples(data_dir):
+    """Muestras (categoría, tipo de gesto, array (21, 3)) por cada mano presente"""
+    samples = []
+    for data in iter_samples(data_dir):
+        category = data.get('gesture_category', 'POSITIVE')
+        if category == 'NEGATIVE':
+            gesture_type = data.get('negative_gesture_info', {}).get('gesture_type', 'UNKNOWN')
+        elif category == 'NAVIGATION':
+            gesture_type = data.get('navigation_gesture_info', {}).get('direction', 'UNKNOWN')
+        else:
+            gesture_type = data.get('positive_gesture_info', {}).get('gesture_type', 'note')
+
+        for key in ('landmarks_left_hand', 'landmarks_right_hand'):
+            hand = data.get(key) or []
+            if len(hand) == 21:
+                samples.append((category, gesture_type, np.asarray(hand, dtype=np.float32)))
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description='Falsos disparos: regla por coordenada y vs ángulo')
+    parser.add_argument('--data', required=True, help='Carpeta con los JSON capturados')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='Umbral del índice en grados (por defecto FINGER_BEND_THRESHOLDS)')
+    args = parser.parse_args()
+
+    samples = load_samples(args.data)
+    if not samples:
+        raise SystemExit(f"❌ No hay muestras en {args.data}")
+
+    hands = np.stack([hand for _, _, hand in samples])
+    threshold = args.threshold if args.threshold is not None else FINGER_BEND_THRESHOLDS[INDEX_FINGER]
+
+    # Regla anterior: punta (8) por debajo de la DIP (7)
+    legacy = hands[:, 8, 1] >= hands[:, 7, 1]
+    # Regla nueva: ángulo medio PIP/DIP del índice
+    angles = finger_flexion_angles(hands)[:, INDEX_FINGER]
+    angle_based = angles < threshold
+
+    groups = defaultdict(list)
+    for i, (category, gesture_type, _) in enumerate(samples):
+        groups[(category, gesture_type)].append(i)
+
+    print(f"Muestras (manos): {len(samples)} | umbral índice: {threshold:.0f}°")
+    print(f"{'categoría':>10} {'gesto':>18} {'n':>5} {'anterior':>9} {'ángulo':>8} {'ángulo medio':>13}")
+    for (category, gesture_type), indices in sorted(groups.items()):
+        idx = np.array(indices)
+        print(f"{category:>10} {gesture_type:>18} {len(idx):>5} {legacy[idx].mean():>9.1%} "
+              f"{angle_based[idx].mean():>8.1%} {angles[idx].mean():>12.0f}°")
+
+    negative = np.array([category == 'NEGATIVE' for category, _, _ in samples])
+    if negative.any():
+        print(f"\nFalsos disparos en NEGATIVE: anterior {legacy[negative].mean():.1%} | "
+              f"ángulo {angle_based[negative].mean():.1%}")
+    positive = np.array([category == 'POSITIVE' for category, _, _ in samples])
+    if positive.any():
+        print(f"Detección en POSITIVE: anterior {legacy[positive].mean():.1%} | "
+              f"ángulo {angle_based[positive].mean():.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Calidad de detección para el capturador
+calidad_utils.py - Puntuación vectorizada sobre arrays (H, 21, 3) con historial por mano
+
+quality_scores() no tiene estado: recibe las manos actuales y las del
+frame anterior. HandQualityTracker guarda ese frame anterior por etiqueta
+('Left'/'Right'), de modo que la estabilidad de cada mano se compara
+siempre consigo misma.
+"""
+
+import numpy as np
+
+FINGER_TIPS = [4, 8, 12, 16, 20]
+VISIBLE_Z = -0.15          # Completitud: landmark con z por encima de este valor
+TIP_VISIBLE_Z = -0.1       # Dedos visibles: punta con z por encima de este valor
+MOVEMENT_PENALTY = 800     # Puntos de estabilidad perdidos por unidad de movimiento
+DEFAULT_STABILITY = 85     # Estabilidad cuando no hay frame anterior de esa mano
+
+# Pesos: completitud, estabilidad, posición, dedos
+QUALITY_WEIGHTS = np.array([0.3, 0.2, 0.2, 0.3])
+
+def quality_scores(hands, previous=None, has_previous=None):
+    """
+    Calidad (0-100) de varias manos a la vez
+
+    Args:
+        hands: Array (H, 21, 3) de landmarks normalizados
+        previous: Array (H, 21, 3) con la misma mano en el frame anterior
+        has_previous: Máscara (H,) de manos con frame anterior válido
+
+    Returns:
+        numpy.ndarray: (H,) calidad ponderada
+    """
+    hands = np.asarray(hands, dtype=np.float32).reshape(-1, 21, 3)
+    n_hands = hands.shape[0]
+
+    completeness = (hands[:, :, 2] > VISIBLE_Z).mean(axis=1) * 100
+
+    stability = np.full(n_hands, DEFAULT_STABILITY, dtype=np.float32)
+    if previous is not None:
+        previous = np.asarray(previous, dtype=np.float32).reshape(-1, 21, 3)
+        if has_previous is None:
+            has_previous = np.ones(n_hands, dtype=bool)
+        movement = np.linalg.norm(hands[:, :, :2] - previous[:, :, :2], axis=2).sum(axis=1)
+        stability = np.where(has_previous, np.maximum(0, 100 - movement * MOVEMENT_PENALTY), stability)
+
+    center = hands[:, :, :2].mean(axis=1)
+    position = (100
+                - 15 * ((center[:, 0] < 0.1) | (center[:, 0] > 0.9))
+                - 10 * ((center[:, 1] < 0.25) | (center[:, 1] > 0.95)))
+
+    fingers = np.minimum(100, (hands[:, FINGER_TIPS, 2] > TIP_VISIBLE_Z).sum(axis=1) * 20)
+
+    scores = np.stack([completeness, stability, position, fingers], axis=1)
+    return scores @ QUALITY_WEIGHTS
+
+class HandQualityTracker:
+    """Calidad por frame con un historial explícito para cada mano"""
+
+    def __init__(self):
+        self.previous = {'Left': None, 'Right': None}
+
+    def reset(self):
+        """Olvidar el historial de ambas manos"""
+        self.previous = {'Left': None, 'Right': None}
+
+    def update(self, landmarks_left, landmarks_right):
+        """
+        Calidad de ambas manos del frame actual (se llama una vez por frame)
+
+        Args:
+            landmarks_left: Lista/array (21, 3) de la mano izquierda o vacía
+            landmarks_right: Lista/array (21, 3) de la mano derecha o vacía
+
+        Returns:
+            tuple: (calidad_izquierda, calidad_derecha), 0 si la mano no está
+        """
+        labels, current = [], []
+        for label, landmarks in (('Left', landmarks_left), ('Right', landmarks_right)):
+            if landmarks is not None and len(landmarks) == 21:
+                labels.append(label)
+                current.append(np.asarray(landmarks, dtype=np.float32))
+            else:
+                # Mano ausente: al reaparecer no se compara con una pose antigua
+                self.previous[label] = None
+
+        if not labels:
+            return 0.0, 0.0
+
+        current = np.stack(current)
+        has_previous = np.array([self.previous[label] is not None for label in labels])
+        previous = np.stack([self.previous[label] if self.previous[label] is not None else hand
+                             for label, hand in zip(labels, current)])
+        scores = quality_scores(current, previous, has_previous)
+
+        result = {'Left': 0.0, 'Right': 0.0}
+        for label, hand, score in zip(labels, current, scores):
+            self.previous[label] = hand
+            result[label] = float(score)
+        return result['Left'], result['Right']
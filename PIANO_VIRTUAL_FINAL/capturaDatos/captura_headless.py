@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Captura headless de gestos desde vídeos o carpetas de frames
+------------------------------------------------------------
+Alternativa sin tkinter, ventana ni cámara a captura_notas.py: procesa
+archivos de vídeo o carpetas de imágenes con MediaPipe a máxima velocidad,
+repartiendo tramos de tiempo entre varios procesos, y escribe las muestras
+con el mismo esquema (shards JSONL) que la GUI.
+
+Las etiquetas salen de un calendario JSON con tramos por archivo:
+    [
+        {"source": "toma1.mp4", "start": 0, "end": 12.5,
+         "category": "POSITIVE", "target": "DO", "octave": 4},
+        {"source": "toma1.mp4", "start": 12.5, "end": 20,
+         "category": "NEGATIVE", "target": "HAND_OPEN"}
+    ]
+("source" se compara con el nombre del archivo/carpeta; si falta, el tramo
+vale para todas las fuentes) o de --category/--target para todo el material.
+Los frames sin etiqueta o con calidad insuficiente se descartan.
+
+Uso:
+    python capturaDatos/captura_headless.py grabaciones/*.mp4 --schedule etiquetas.json
+    python capturaDatos/captura_headless.py frames_toma2/ --category NEGATIVE --target FIST_CLOSED --fps 30
+    python capturaDatos/captura_headless.py toma1.mp4 --schedule etiquetas.json --workers 8 --chunk-seconds 10
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+import cv2
+
+from shard_writer import ShardWriter
+from calidad_utils import HandQualityTracker
+from muestras_utils import (NEGATIVE_GESTURES, NAVIGATION_GESTURES, min_quality,
+                            make_target, build_sample)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Configuración de cada proceso (se fija una vez en init_worker)
+_settings = None
+
+def list_frames(directory):
+    """Imágenes de una carpeta en orden de nombre"""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(IMAGE_EXTENSIONS))
+
+def source_info(path, default_fps):
+    """
+    Número de frames y FPS de una fuente
+
+    Returns:
+        tuple: (n_frames, fps)
+    """
+    if os.path.isdir(path):
+        return len(list_frames(path)), default_fps
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"No se pudo abrir el vídeo: {path}")
+    n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or default_fps
+    cap.release()
+    return n_frames, fps
+
+class LabelSchedule:
+    """Tramos [start, end) en segundos → objetivo de captura"""
+
+    def __init__(self, entries):
+        self.entries = []
+        for entry in entries:
+            category = entry["category"]
+            target = entry["target"]
+            if category == "NEGATIVE" and target not in NEGATIVE_GESTURES:
+                raise ValueError(f"Gesto negativo desconocido: {target}")
+            if category == "NAVIGATION" and target not in NAVIGATION_GESTURES:
+                raise ValueError(f"Gesto de navegación desconocido: {target}")
+            self.entries.append((entry.get("source"), float(entry.get("start", 0)),
+                                 float(entry.get("end", float('inf'))),
+                                 make_target(category, target, int(entry.get("octave", 4)),
+                                             entry.get("gesture_type", "single"))))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def for_source(self, source):
+        """Tramos aplicables a una fuente (por nombre de archivo/carpeta)"""
+        name = os.path.basename(os.path.normpath(source))
+        return [(start, end, target) for entry_source, start, end, target in self.entries
+                if entry_source is None or entry_source == name]
+
+def target_at(spans, timestamp):
+    """Objetivo del primer tramo que contiene `timestamp` o None"""
+    for start, end, target in spans:
+        if start <= timestamp < end:
+            return target
+    return None
+
+def plan_tasks(sources, schedule, chunk_seconds, default_fps):
+    """
+    Divide cada fuente en tramos de `chunk_seconds` (solo los que tienen etiqueta)
+
+    Returns:
+        list: Tareas (fuente, frame_inicial, frame_final, fps, tramos)
+    """
+    tasks = []
+    for source in sources:
+        n_frames, fps = source_info(source, default_fps)
+        spans = schedule.for_source(source)
+        if not spans or not n_frames:
+            print(f"⚠️ Sin etiquetas o sin frames, se omite: {source}")
+            continue
+        chunk = max(1, int(round(chunk_seconds * fps)))
+        for start in range(0, n_frames, chunk):
+            end = min(n_frames, start + chunk)
+            if any(s < end / fps and e > start / fps for s, e, _ in spans):
+                tasks.append((source, start, end, fps, spans))
+    return tasks
+
+def init_worker(settings):
+    """Guarda la configuración del proceso (el detector se crea por tarea)"""
+    global _settings
+    _settings = settings
+
+def create_hands(settings):
+    """
+    Detector de MediaPipe para una tarea
+
+    Con static_image_mode=False MediaPipe sigue la mano del frame anterior;
+    un detector nuevo por tarea evita que el seguimiento del final de un
+    tramo (u otro vídeo) se arrastre a los primeros frames del siguiente.
+    """
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,
+        min_detection_confidence=settings['min_detection_confidence'],
+        min_tracking_confidence=settings['min_tracking_confidence']
+    )
+
+def iter_frames(source, start, end):
+    """Frames [start, end) de un vídeo o de una carpeta de imágenes"""
+    if os.path.isdir(source):
+        for path in list_frames(source)[start:end]:
+            yield cv2.imread(path)
+        return
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    try:
+        for _ in range(start, end):
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield frame
+    finally:
+        cap.release()
+
+def process_task(task):
+    """
+    Procesa un tramo de una fuente en el proceso trabajador
+
+    Returns:
+        dict: Muestras (objetivo, landmarks, calidades), frames procesados y tiempo
+    """
+    source, start, end, fps, spans = task
+    settings = _settings
+    tracker = HandQualityTracker()
+    samples = []
+    stats = {'frames': 0, 'no_hands': 0, 'low_quality': 0, 'unlabeled': 0}
+    busy_start = time.perf_counter()
+
+    with create_hands(settings) as hands:
+        collect_samples(hands, source, start, end, fps, spans, settings, tracker, samples, stats)
+
+    stats['busy_s'] = time.perf_counter() - busy_start
+    stats['pid'] = os.getpid()
+    return samples, stats
+
+def collect_samples(hands, source, start, end, fps, spans, settings, tracker, samples, stats):
+    """Recorre los frames de una tarea con su detector y añade las muestras válidas"""
+    for offset, frame in enumerate(iter_frames(source, start, end)):
+        if frame is None or offset % settings['every']:
+            continue
+        index = start + offset
+        target = target_at(spans, index / fps)
+        if target is None:
+            stats['unlabeled'] += 1
+            continue
+
+        if settings['size']:
+            frame = cv2.resize(frame, settings['size'])
+        if settings['mirror']:
+            frame = cv2.flip(frame, 1)  # Mismo espejo que la cámara en vivo
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame.flags.writeable = False
+        results = hands.process(rgb_frame)
+        stats['frames'] += 1
+
+        landmarks_left, landmarks_right = [], []
+        if results.multi_hand_landmarks and results.multi_handedness:
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                landmarks_array = [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]
+                if handedness.classification[0].label == "Right":
+                    landmarks_right = landmarks_array
+                else:
+                    landmarks_left = landmarks_array
+
+        quality_left, quality_right = tracker.update(landmarks_left, landmarks_right)
+        if not landmarks_left and not landmarks_right:
+            stats['no_hands'] += 1
+            continue
+        threshold = settings['min_quality'] or min_quality(target['category'])
+        if max(quality_left, quality_right) < threshold:
+            stats['low_quality'] += 1
+            continue
+        samples.append((target, landmarks_left, landmarks_right, quality_left, quality_right,
+                        {'source': os.path.basename(os.path.normpath(source)), 'frame': index,
+                         'time_s': round(index / fps, 3)}))
+
+def main():
+    parser = argparse.ArgumentParser(description='Captura headless desde vídeos o carpetas de frames')
+    parser.add_argument('sources', nargs='+', help='Archivos de vídeo o carpetas de imágenes')
+    parser.add_argument('--schedule', help='Calendario JSON de etiquetas por tramo')
+    parser.add_argument('--category', choices=['POSITIVE', 'NEGATIVE', 'NAVIGATION'])
+    parser.add_argument('--target', help='Objetivo para todo el material (sin --schedule)')
+    parser.add_argument('--octave', type=int, default=4)
+    parser.add_argument('--gesture-type', default='single')
+    parser.add_argument('--output', default='captured_data_3categories')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-seconds', type=float, default=30.0, help='Duración de cada tarea')
+    parser.add_argument('--fps', type=float, default=30.0, help='FPS de las carpetas de frames')
+    parser.add_argument('--every', type=int, default=1, help='Procesar 1 de cada N frames')
+    parser.add_argument('--size', default='1280x720', help="Redimensionar como la GUI ('none' = original)")
+    parser.add_argument('--no-mirror', action='store_true', help='No aplicar el espejo de la cámara en vivo')
+    parser.add_argument('--min-quality', type=float, default=None, help='Umbral único (por defecto, por categoría)')
+    parser.add_argument('--min-detection-confidence', type=float, default=0.7)
+    parser.add_argument('--min-tracking-confidence', type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.schedule:
+        schedule = LabelSchedule.load(args.schedule)
+    elif args.category and args.target:
+        schedule = LabelSchedule([{"category": args.category, "target": args.target,
+                                   "octave": args.octave, "gesture_type": args.gesture_type}])
+    else:
+        raise SystemExit("❌ Indica --schedule o --category y --target")
+
+    tasks = plan_tasks(args.sources, schedule, args.chunk_seconds, args.fps)
+    if not tasks:
+        raise SystemExit("❌ No hay tramos etiquetados que procesar")
+
+    size = None if args.size.lower() == 'none' else tuple(int(v) for v in args.size.lower().split('x'))
+    settings = {
+        'every': max(1, args.every),
+        'size': size,
+        'mirror': not args.no_mirror,
+        'min_quality': args.min_quality,
+        'min_detection_confidence': args.min_detection_confidence,
+        'min_tracking_confidence': args.min_tracking_confidence
+    }
+    workers = max(1, min(args.workers, len(tasks)))
+    print(f"🎬 {len(args.sources)} fuentes → {len(tasks)} tramos en {workers} procesos")
+
+    os.makedirs(args.output, exist_ok=True)
+    writer = ShardWriter(args.output, prefix="headless")
+    sample_numbers = {}
+    totals = {'frames': 0, 'no_hands': 0, 'low_quality': 0, 'unlabeled': 0}
+    busy_by_worker = {}
+    frames_by_worker = {}
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=init_worker, initargs=(settings,)) as pool:
+        for done, (samples, stats) in enumerate(pool.imap_unordered(process_task, tasks), 1):
+            for target, left, right, quality_left, quality_right, origin in samples:
+                number = sample_numbers.get(target['label'], 0) + 1
+                sample_numbers[target['label']] = number
+                sample = build_sample(target, left, right, quality_left, quality_right, number)
+                sample['source'] = origin
+                writer.write(sample)
+            for key in totals:
+                totals[key] += stats[key]
+            busy_by_worker[stats['pid']] = busy_by_worker.get(stats['pid'], 0.0) + stats['busy_s']
+            frames_by_worker[stats['pid']] = frames_by_worker.get(stats['pid'], 0) + stats['frames']
+            print(f"   [{done}/{len(tasks)}] {len(samples)} muestras, {stats['frames']} frames "
+                  f"({stats['frames'] / max(stats['busy_s'], 1e-9):.1f} fps)")
+    elapsed = time.perf_counter() - start
+    writer.close()
+
+    print(f"\n💾 {writer.written} muestras en {writer.path}")
+    for label, count in sorted(sample_numbers.items()):
+        print(f"   {label}: {count}")
+    print(f"   descartados: {totals['no_hands']} sin manos, {totals['low_quality']} calidad baja, "
+          f"{totals['unlabeled']} sin etiqueta")
+
+    print(f"\n{'proceso':>8} {'frames':>8} {'fps/núcleo':>11}")
+    for pid in sorted(busy_by_worker):
+        print(f"{pid:>8} {frames_by_worker[pid]:>8} {frames_by_worker[pid] / max(busy_by_worker[pid], 1e-9):>11.1f}")
+    print(f"🚀 {totals['frames'] / elapsed:.1f} frames/s en total, "
+          f"{totals['frames'] / elapsed / workers:.1f} frames/s por núcleo ({workers} procesos, {elapsed:.1f}s)")
+
+if __name__ == '__main__':
+    main()
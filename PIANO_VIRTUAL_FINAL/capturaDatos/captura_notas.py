@@ -8,15 +8,20 @@ Aplicación completa para capturar gestos positivos, negativos y navegación
 import cv2
 import mediapipe as mp
 import numpy as np
-import json
 import os
 import time
-from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, messagebox
-from threading import Thread
+from threading import Thread, Lock
 import pygame
 
+from pipeline_utils import LatestQueue, StageMeter
+from shard_writer import ShardWriter
+from calidad_utils import HandQualityTracker
+from overlay_utils import OverlayCache
+from muestras_utils import (NEGATIVE_GESTURES, NAVIGATION_GESTURES, min_quality,
+                            make_target, build_sample)
+
 class PianoCaptureApp:
     def __init__(self):
         # Inicializar MediaPipe - AMBAS MANOS
@@ -34,7 +39,19 @@ class PianoCaptureApp:
         self.capturing = False
         self.current_landmarks_left = []   
         self.current_landmarks_right = []  
+        self.current_quality = (0, 0)  # Calidad (izquierda, derecha) del frame actual
+        self.quality_tracker = HandQualityTracker()  # Historial de estabilidad por mano
+        self.overlay_cache = OverlayCache(alpha=0.6)  # Teclado/indicadores pre-renderizados
+        self.overlay_selection = None
         self.sample_count = 0
+        self.shard_writer = None  # Escritor de fondo (un shard JSONL por sesión)
+        self.sample_lock = Lock()  # Contadores compartidos entre GUI e inferencia (ráfaga)
+        
+        # Modo ráfaga
+        self.burst_remaining = 0
+        self.burst_interval = 0.2
+        self.burst_last = 0.0
+        self.burst_target = None
         
         # ✅ CONFIGURACIÓN NUEVA: 3 CATEGORÍAS + 120 MUESTRAS
         self.current_octave = 4
@@ -69,25 +86,9 @@ class PianoCaptureApp:
         self.notes_display = ["DO", "DO#", "RE", "RE#", "MI", "FA", "FA#", "SOL", "SOL#", "LA", "LA#", "SI"]
         self.octaves = [2, 3, 4, 5, 6]
         
-        # ✅ GESTOS NEGATIVOS
-        self.negative_gestures = {
-            "HAND_OPEN": "Mano abierta (dedos extendidos)",
-            "FIST_CLOSED": "Puño cerrado (todos los dedos)",
-            "PARTIAL_BEND": "Dedos parcialmente doblados",
-            "TRANSITION": "Movimiento entre teclas",
-            "WRONG_FINGERS": "Dedos incorrectos doblados",
-            "OUT_OF_ZONE": "Mano fuera de zona piano",
-            "MULTIPLE_FINGERS": "Múltiples dedos doblados",
-            "THUMB_ONLY": "Solo pulgar doblado",
-            "PINCH_GESTURE": "Gesto de pellizco/agarre"
-        }
-        
-        # ✅ GESTOS DE NAVEGACIÓN
-        self.navigation_gestures = {
-            "NAVIGATE_LEFT": "Apuntar hacia la izquierda",
-            "NAVIGATE_RIGHT": "Apuntar hacia la derecha", 
-            "NAVIGATE_NEUTRAL": "Índice extendido (neutral)"
-        }
+        # ✅ GESTOS NEGATIVOS Y DE NAVEGACIÓN (compartidos con el modo headless)
+        self.negative_gestures = NEGATIVE_GESTURES
+        self.navigation_gestures = NAVIGATION_GESTURES
         
         # Definiciones de acordes (mantener original)
         self.chord_definitions = {
@@ -123,7 +124,7 @@ class PianoCaptureApp:
         """Crear interfaz gráfica con tkinter"""
         self.root = tk.Tk()
         self.root.title("🎹 Capturador de Gestos - 3 Categorías")
-        self.root.geometry("450x700")
+        self.root.geometry("450x780")
         
         # Frame principal
         main_frame = ttk.Frame(self.root, padding="10")
@@ -166,6 +167,7 @@ class PianoCaptureApp:
         self.target_var = tk.StringVar(value="DO")
         self.target_combo = ttk.Combobox(main_frame, textvariable=self.target_var, values=self.notes_display)
         self.target_combo.grid(row=5, column=1, sticky=(tk.W, tk.E), pady=5)
+        self.target_combo.bind("<<ComboboxSelected>>", self.on_target_change)
         
         # Información de captura
         info_frame = ttk.LabelFrame(main_frame, text="Estado de Captura", padding="10")
@@ -180,6 +182,10 @@ class PianoCaptureApp:
         self.quality_label = ttk.Label(info_frame, text="Calidad: ---")
         self.quality_label.pack()
         
+        # FPS de cada etapa del pipeline (cámara / MediaPipe / render)
+        self.fps_label = ttk.Label(info_frame, text="FPS: ---", font=("Arial", 8))
+        self.fps_label.pack()
+        
         # Botones de control
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=7, column=0, columnspan=2, pady=20)
@@ -193,6 +199,18 @@ class PianoCaptureApp:
         self.stop_btn = ttk.Button(button_frame, text="⏹️ Detener", command=self.stop_camera, state="disabled")
         self.stop_btn.pack(side=tk.LEFT, padx=5)
         
+        # ✅ MODO RÁFAGA: N muestras con calidad suficiente a una tasa fija (tecla B)
+        burst_frame = ttk.LabelFrame(main_frame, text="Ráfaga (tecla B)", padding="5")
+        burst_frame.grid(row=10, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        ttk.Label(burst_frame, text="Muestras:").pack(side=tk.LEFT)
+        self.burst_count_var = tk.StringVar(value="20")
+        ttk.Spinbox(burst_frame, from_=1, to=500, width=5, textvariable=self.burst_count_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(burst_frame, text="por segundo:").pack(side=tk.LEFT)
+        self.burst_rate_var = tk.StringVar(value="5")
+        ttk.Spinbox(burst_frame, from_=1, to=30, width=4, textvariable=self.burst_rate_var).pack(side=tk.LEFT, padx=5)
+        self.burst_btn = ttk.Button(burst_frame, text="🔁 Ráfaga", command=self.start_burst)
+        self.burst_btn.pack(side=tk.LEFT, padx=5)
+        
         # Progress bar
         self.progress = ttk.Progressbar(main_frame, length=350, mode='determinate')
         self.progress.grid(row=8, column=0, columnspan=2, pady=10, sticky=(tk.W, tk.E))
@@ -262,6 +280,10 @@ class PianoCaptureApp:
         
         self.update_instructions()
             
+    def on_target_change(self, event=None):
+        """Actualizar instrucciones y overlay al elegir otro objetivo"""
+        self.update_instructions()
+        
     def update_instructions(self):
         """Actualizar instrucciones según categoría seleccionada"""
         category = self.current_category
@@ -276,6 +298,7 @@ class PianoCaptureApp:
 • Mantén posición estable 1 segundo
 • ✅ Calidad >70% para capturar
 • Meta: 120 muestras de esta nota/acorde
+• B: ráfaga automática (solo frames con calidad suficiente)
 
 🎹 OBJETIVO: Entrenar detección precisa de notas
 🔄 Varía: ángulos, distancia, velocidad gesto
@@ -291,6 +314,7 @@ class PianoCaptureApp:
 • Puedes estar en zona del piano o fuera
 • ✅ Calidad >50% para capturar
 • Meta: 120 muestras de este gesto negativo
+• B: ráfaga automática (solo frames con calidad suficiente)
 
 🎯 OBJETIVO: Enseñar cuándo NO tocar
 📝 IMPORTANTE: Variar posiciones y tipos
@@ -306,6 +330,7 @@ class PianoCaptureApp:
 • Otros dedos cerrados o semi-cerrados
 • ✅ Calidad >60% para capturar
 • Meta: 120 muestras de este gesto
+• B: ráfaga automática (solo frames con calidad suficiente)
 
 🎯 OBJETIVO: Navegación rápida entre octavas
 ⚡ RESULTADO: Cambio automático de octava
@@ -314,6 +339,9 @@ class PianoCaptureApp:
         if hasattr(self, 'inst_label'):
             self.inst_label.config(text=self.instructions_text)
         
+        # El overlay de la cámara se reconstruye solo cuando cambia la selección
+        self.update_overlay_selection()
+        
     def start_camera(self):
         """Iniciar cámara y detección"""
         try:
@@ -331,104 +359,175 @@ class PianoCaptureApp:
             self.capture_btn.config(state="normal")
             self.stop_btn.config(state="normal")
             
-            # Iniciar hilo de captura
-            self.camera_thread = Thread(target=self.camera_loop, daemon=True)
-            self.camera_thread.start()
+            # ✅ PIPELINE DE 3 HILOS: cámara → MediaPipe → render
+            self.frame_queue = LatestQueue(maxsize=1)   # Solo el frame más reciente
+            self.result_queue = LatestQueue(maxsize=2)
+            self.stage_meters = {
+                'camera': StageMeter("Cam"),
+                'inference': StageMeter("MP"),
+                'render': StageMeter("Render")
+            }
+            self.pipeline_threads = [
+                Thread(target=self.grab_loop, daemon=True),
+                Thread(target=self.inference_loop, daemon=True),
+                Thread(target=self.render_loop, daemon=True)
+            ]
+            for thread in self.pipeline_threads:
+                thread.start()
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al iniciar cámara: {str(e)}")
             
-    def camera_loop(self):
-        """Loop principal de la cámara"""
+    def grab_loop(self):
+        """Etapa 1: leer la cámara y publicar siempre el último frame"""
+        meter = self.stage_meters['camera']
         while self.capturing and self.cap is not None:
             ret, frame = self.cap.read()
             if not ret:
                 break
-                
+            start = time.perf_counter()
+            
             frame = cv2.resize(frame, (1280, 720))
             frame = cv2.flip(frame, 1)  # Efecto espejo
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.frame_queue.put(frame)
+            meter.tick(time.perf_counter() - start)
+        
+        self.capturing = False
+            
+    def inference_loop(self):
+        """Etapa 2: MediaPipe, landmarks y calidad del frame más reciente"""
+        meter = self.stage_meters['inference']
+        while self.capturing:
+            frame = self.frame_queue.get()
+            if frame is None:
+                continue
+            start = time.perf_counter()
             
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             rgb_frame.flags.writeable = False
             results = self.hands.process(rgb_frame)
-            rgb_frame.flags.writeable = True
-            
-            # ✅ DIBUJAR INTERFAZ SEGÚN CATEGORÍA
-            frame = self.draw_category_interface(frame)
             
             # Procesar landmarks de ambas manos
-            quality_score = 0
-            quality_left = 0
-            quality_right = 0
-            self.current_landmarks_left = []
-            self.current_landmarks_right = []
+            landmarks_left = []
+            landmarks_right = []
+            hands_to_draw = []
             
             if results.multi_hand_landmarks and results.multi_handedness:
                 for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
                     hand_label = handedness.classification[0].label
                     
-                    landmarks_array = []
-                    for landmark in hand_landmarks.landmark:
-                        landmarks_array.append([landmark.x, landmark.y, landmark.z])
+                    landmarks_array = [[landmark.x, landmark.y, landmark.z] for landmark in hand_landmarks.landmark]
                     
                     if hand_label == "Right":  
                         color = (0, 150, 255)  # Naranja para mano derecha
-                        self.current_landmarks_right = landmarks_array
+                        landmarks_right = landmarks_array
                         hand_display = "DERECHA"
                     else:  
                         color = (255, 100, 0)  # Azul para mano izquierda
-                        self.current_landmarks_left = landmarks_array
+                        landmarks_left = landmarks_array
                         hand_display = "IZQUIERDA"
                     
-                    self.draw_colored_landmarks(frame, hand_landmarks, color, hand_display)
-                    
-                # Calcular calidad
-                quality_left = self.calculate_quality(self.current_landmarks_left) if self.current_landmarks_left else 0
-                quality_right = self.calculate_quality(self.current_landmarks_right) if self.current_landmarks_right else 0
-                quality_score = max(quality_left, quality_right)
-                
-                self.draw_info_on_frame(frame, quality_score, quality_left, quality_right)
-            else:
-                self.draw_info_on_frame(frame, 0, 0, 0)
+                    hands_to_draw.append((hand_landmarks, color, hand_display))
+            
+            # Calcular calidad (una sola vez por frame; capture_gesture usa este valor)
+            quality_left, quality_right = self.quality_tracker.update(landmarks_left, landmarks_right)
+            quality_score = max(quality_left, quality_right)
+            
+            # Publicar landmarks y calidad para capture_gesture
+            self.current_landmarks_left = landmarks_left
+            self.current_landmarks_right = landmarks_right
+            self.current_quality = (quality_left, quality_right)
+            
+            # Ráfaga activa: guardar sin bloquear (escritor en segundo plano)
+            self.process_burst(landmarks_left, landmarks_right, quality_left, quality_right)
+            
+            self.result_queue.put((frame, hands_to_draw, quality_score, quality_left, quality_right))
+            meter.tick(time.perf_counter() - start)
+            
+    def render_loop(self):
+        """Etapa 3: overlays, ventana de OpenCV y teclado"""
+        meter = self.stage_meters['render']
+        window_name = '🎹 Piano Capture 3 Categorías - ESPACIO para capturar'
+        while self.capturing:
+            item = self.result_queue.get()
+            if item is None:
+                # Mantener la ventana viva aunque no lleguen frames
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+            start = time.perf_counter()
+            frame, hands_to_draw, quality_score, quality_left, quality_right = item
+            
+            # ✅ DIBUJAR INTERFAZ SEGÚN CATEGORÍA
+            frame = self.draw_category_interface(frame)
+            
+            for hand_landmarks, color, hand_display in hands_to_draw:
+                self.draw_colored_landmarks(frame, hand_landmarks, color, hand_display)
+            self.draw_info_on_frame(frame, quality_score, quality_left, quality_right)
+            self.draw_stage_fps(frame)
                 
             # Actualizar GUI
             self.root.after(0, self.update_quality_label, quality_score, quality_left, quality_right)
             
             # Mostrar frame
-            cv2.imshow('🎹 Piano Capture 3 Categorías - ESPACIO para capturar', frame)
+            cv2.imshow(window_name, frame)
+            meter.tick(time.perf_counter() - start)
             
-            # Captura con espacio
+            # Captura con espacio (en el hilo de tkinter: usa messagebox)
             key = cv2.waitKey(1) & 0xFF
             if key == ord(' '):
-                self.capture_gesture()
+                self.root.after(0, self.capture_gesture)
+            elif key == ord('b'):
+                self.root.after(0, self.start_burst)
             elif key == ord('q'):
                 break
-                
+        
+        self.capturing = False
         cv2.destroyAllWindows()
         
+    def draw_stage_fps(self, frame):
+        """FPS y tiempo de trabajo de cada etapa: la más lenta es el cuello de botella"""
+        w = frame.shape[1]
+        meters = list(self.stage_meters.values())
+        bottleneck = max(meters, key=lambda m: m.busy_ms)
+        for i, meter in enumerate(meters):
+            color = (0, 0, 255) if meter is bottleneck else (200, 200, 200)
+            text = f"{meter} ({meter.busy_ms:.0f}ms)"
+            cv2.putText(frame, text, (w - 260, 30 + i * 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+        
+        summary = " | ".join(str(meter) for meter in meters)
+        self.root.after(0, lambda: self.fps_label.config(text=summary))
+        
+    def update_overlay_selection(self):
+        """Foto de la selección de la GUI que determina el overlay (hilo de tkinter)"""
+        self.overlay_selection = (self.current_category, self.current_octave,
+                                  self.current_gesture_type, self.target_var.get())
+        
     def draw_category_interface(self, frame):
-        """Dibujar interfaz específica según categoría"""
-        h, w = frame.shape[:2]
-        overlay = frame.copy()
+        """Dibujar interfaz específica según categoría (overlay cacheado, mezcla in-place)"""
+        overlay = self.overlay_cache.get(self.overlay_selection, frame.shape, self.draw_overlay_layers)
+        return overlay.blend(frame)
         
-        if self.current_category == "POSITIVE":
+    def draw_overlay_layers(self, overlay, selection):
+        """Dibujar el overlay de una selección sobre un lienzo negro"""
+        category, octave, gesture_type, target = selection
+        h, w = overlay.shape[:2]
+        
+        if category == "POSITIVE":
             # Dibujar teclado de piano para notas
-            frame = self.draw_piano_keyboard(frame)
+            self.draw_piano_keyboard(overlay, selection)
             
-        elif self.current_category == "NEGATIVE":
+        elif category == "NEGATIVE":
             # Dibujar área libre para gestos negativos
-            self.draw_negative_gesture_area(overlay, w, h)
+            self.draw_negative_gesture_area(overlay, w, h, target)
             
-        elif self.current_category == "NAVIGATION":
+        elif category == "NAVIGATION":
             # Dibujar indicadores de navegación
-            self.draw_navigation_indicators(overlay, w, h)
-            
-        return frame
+            self.draw_navigation_indicators(overlay, w, h, target)
         
-    def draw_piano_keyboard(self, frame):
+    def draw_piano_keyboard(self, overlay, selection):
         """Dibujar teclado de piano para gestos positivos"""
-        h, w = frame.shape[:2]
-        overlay = frame.copy()
+        h, w = overlay.shape[:2]
         
         margin = w // 10
         keyboard_width = w - (2 * margin)
@@ -436,7 +535,7 @@ class PianoCaptureApp:
         keyboard_y = 40
         keyboard_x = margin
         
-        current_octave = self.current_octave
+        current_octave = selection[1]
         white_keys = ["DO", "RE", "MI", "FA", "SOL", "LA", "SI"]
         total_white_keys = 7
         white_key_width = keyboard_width // total_white_keys
@@ -449,7 +548,7 @@ class PianoCaptureApp:
             x = keyboard_x + (i * white_key_width)
             note_with_octave = f"{note}{current_octave}"
             
-            if self.is_target_key(note, current_octave):
+            if self.is_target_key(note, selection):
                 color = (0, 255, 0)
                 thickness = 6
             else:
@@ -472,7 +571,7 @@ class PianoCaptureApp:
             x = keyboard_x + int(relative_pos * white_key_width + white_key_width // 2 - black_key_width // 2)
             note_with_octave = f"{note}{current_octave}"
             
-            is_target = self.is_target_key(note, current_octave)
+            is_target = self.is_target_key(note, selection)
             
             if is_target:
                 color = (0, 220, 0)
@@ -490,11 +589,7 @@ class PianoCaptureApp:
                        (x + 5, keyboard_y + black_key_height // 2 + 5), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, text_color, 2)
         
-        alpha = 0.6
-        frame = cv2.addWeighted(frame, 1 - alpha, overlay, alpha, 0)
-        return frame
-        
-    def draw_negative_gesture_area(self, overlay, w, h):
+    def draw_negative_gesture_area(self, overlay, w, h, target):
         """Dibujar área para gestos negativos"""
         # Área central libre
         area_margin = w // 8
@@ -512,20 +607,17 @@ class PianoCaptureApp:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
         
         # Instrucciones específicas
-        target = self.target_var.get()
         if target in self.negative_gestures:
             instruction = self.negative_gestures[target]
             cv2.putText(overlay, instruction, 
                        (area_margin + 20, area_y + 40), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
             
-    def draw_navigation_indicators(self, overlay, w, h):
+    def draw_navigation_indicators(self, overlay, w, h, target):
         """Dibujar indicadores para navegación"""
         center_x = w // 2
         center_y = h // 2
         
-        target = self.target_var.get()
-        
         if target == "NAVIGATE_LEFT":
             # Flecha izquierda grande
             points = np.array([[center_x - 100, center_y], 
@@ -553,23 +645,18 @@ class PianoCaptureApp:
                        (center_x - 100, center_y + 100), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
         
-    def is_target_key(self, note, octave):
+    def is_target_key(self, note, selection):
         """Verificar si una tecla es la tecla objetivo"""
-        if self.current_category != "POSITIVE":
-            return False
-            
-        target = self.target_var.get()
-        target_octave = self.current_octave
-        
-        if octave != target_octave:
+        category, octave, gesture_type, target = selection
+        if category != "POSITIVE":
             return False
             
-        if self.current_gesture_type == "single":
+        if gesture_type == "single":
             return note == target
         else:
             # Para acordes
-            if target in self.chord_definitions[self.current_gesture_type]:
-                chord_intervals = self.chord_definitions[self.current_gesture_type][target]
+            if target in self.chord_definitions[gesture_type]:
+                chord_intervals = self.chord_definitions[gesture_type][target]
                 base_index = self.notes_chromatic.index("DO")
                 chord_notes = []
                 for interval in chord_intervals:
@@ -667,161 +754,128 @@ class PianoCaptureApp:
             cv2.putText(frame, "Mejora posicion segun instrucciones", 
                        (w//2 - 200, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 100, 100), 2)
                        
-    def calculate_quality(self, landmarks):
-        """Calcular calidad de detección"""
-        if not landmarks or len(landmarks) != 21:
-            return 0
-            
-        scores = []
-        
-        # Completitud de landmarks
-        visible_count = sum(1 for lm in landmarks if lm[2] > -0.15)
-        completeness = (visible_count / 21) * 100
-        scores.append(completeness)
-        
-        # Estabilidad
-        prev_attr = 'prev_landmarks_left' if len(landmarks) > 0 else 'prev_landmarks_right'
-        if hasattr(self, prev_attr) and getattr(self, prev_attr):
-            prev_landmarks = getattr(self, prev_attr)
-            movement = 0
-            for i, (current, prev) in enumerate(zip(landmarks, prev_landmarks)):
-                dist = np.sqrt((current[0] - prev[0])**2 + (current[1] - prev[1])**2)
-                movement += dist
-            stability = max(0, 100 - movement * 800)
-            scores.append(stability)
-        else:
-            scores.append(85)
-            
-        # Posición
-        center_x = np.mean([lm[0] for lm in landmarks])
-        center_y = np.mean([lm[1] for lm in landmarks])
-        
-        position_score = 100
-        if center_x < 0.1 or center_x > 0.9:
-            position_score -= 15
-        if center_y < 0.25 or center_y > 0.95:
-            position_score -= 10
-            
-        scores.append(max(0, position_score))
-        
-        # Dedos visibles
-        finger_tips = [4, 8, 12, 16, 20]
-        finger_quality = 0
-        for tip_idx in finger_tips:
-            if tip_idx < len(landmarks):
-                tip_landmark = landmarks[tip_idx]
-                if tip_landmark[2] > -0.1:
-                    finger_quality += 20
-        
-        finger_score = min(100, finger_quality)
-        scores.append(finger_score)
-        
-        # Guardar para siguiente frame
-        if center_x < 0.5:
-            self.prev_landmarks_left = landmarks.copy()
-        else:
-            self.prev_landmarks_right = landmarks.copy()
-            
-        # Promedio ponderado
-        weighted_score = (
-            scores[0] * 0.3 +  # Completitud
-            scores[1] * 0.2 +  # Estabilidad
-            scores[2] * 0.2 +  # Posición
-            scores[3] * 0.3    # Dedos
-        )
-        
-        return weighted_score
-        
     def update_quality_label(self, quality, quality_left=0, quality_right=0):
         """Actualizar etiqueta de calidad en GUI"""
         color = "green" if quality > 70 else "orange" if quality > 50 else "red"
         self.quality_label.config(text=f"Calidad: {quality:.1f}% (Izq:{quality_left:.0f}% Der:{quality_right:.0f}%)", foreground=color)
         
+    def get_min_quality(self, category=None):
+        """✅ UMBRALES DIFERENTES POR CATEGORÍA"""
+        return min_quality(category or self.current_category)
+        
+    def get_capture_target(self):
+        """Foto del objetivo actual (se lee en el hilo de tkinter)"""
+        return make_target(self.current_category, self.target_var.get(),
+                           self.current_octave, self.current_gesture_type)
+        
+    def build_sample(self, target, landmarks_left, landmarks_right, quality_left, quality_right):
+        """Construir la muestra según categoría (esquema compartido con el modo headless)"""
+        return build_sample(target, landmarks_left, landmarks_right,
+                            quality_left, quality_right, self.sample_count + 1)
+        
+    def store_sample(self, gesture_data):
+        """
+        Encolar la muestra en el escritor de fondo y actualizar contadores
+        
+        Returns:
+            bool: True si se completó el objetivo de muestras
+        """
+        with self.sample_lock:
+            if self.shard_writer is None:
+                self.shard_writer = ShardWriter(self.data_dir)
+                print(f"💾 Guardando muestras en: {self.shard_writer.path}")
+            self.shard_writer.write(gesture_data)
+            
+            self.sample_count += 1
+            completed = self.sample_count >= self.target_samples
+            count = self.sample_count
+            if completed:
+                self.sample_count = 0
+        
+        def update_progress():
+            self.sample_label.config(text=f"Muestras: {count}/{self.target_samples}")
+            self.progress['value'] = 0 if completed else (count / self.target_samples) * 100
+        self.root.after(0, update_progress)
+        return completed
+        
     def capture_gesture(self):
         """Capturar gesto actual según categoría"""
+        # Landmarks y calidad ya calculados para el frame actual
+        landmarks_left = self.current_landmarks_left
+        landmarks_right = self.current_landmarks_right
+        quality_left, quality_right = self.current_quality
+        
         # Verificar detección de manos
-        if not self.current_landmarks_left and not self.current_landmarks_right:
+        if not landmarks_left and not landmarks_right:
             messagebox.showwarning("Advertencia", "No se detectan manos. Posiciona tus manos frente a la cámara.")
             return
             
-        # Calcular calidad
-        quality_left = self.calculate_quality(self.current_landmarks_left) if self.current_landmarks_left else 0
-        quality_right = self.calculate_quality(self.current_landmarks_right) if self.current_landmarks_right else 0
         overall_quality = max(quality_left, quality_right)
-        
-        # ✅ UMBRALES DIFERENTES POR CATEGORÍA
-        min_quality = 70 if self.current_category == "POSITIVE" else 50 if self.current_category == "NEGATIVE" else 60
+        min_quality = self.get_min_quality()
         
         if overall_quality < min_quality:
             messagebox.showwarning("Advertencia", f"Calidad muy baja ({overall_quality:.1f}%). Necesitas >{min_quality}%.")
             return
             
-        # ✅ CREAR DATOS SEGÚN CATEGORÍA
-        gesture_data = {
-            "timestamp": datetime.now().isoformat(),
-            "gesture_category": self.current_category,  # POSITIVE, NEGATIVE, NAVIGATION
-            "target_note_or_chord": self.get_target_label(),
-            "landmarks_left_hand": self.current_landmarks_left,
-            "landmarks_right_hand": self.current_landmarks_right,
-            "quality_scores": {
-                "left_hand": quality_left,
-                "right_hand": quality_right,
-                "overall": overall_quality
-            },
-            "hands_detected": {
-                "left_hand": len(self.current_landmarks_left) > 0,
-                "right_hand": len(self.current_landmarks_right) > 0,
-                "both_hands": len(self.current_landmarks_left) > 0 and len(self.current_landmarks_right) > 0
-            },
-            "sample_number": self.sample_count + 1
-        }
-        
-        # ✅ INFORMACIÓN ESPECÍFICA POR CATEGORÍA
-        if self.current_category == "POSITIVE":
-            gesture_data["octave"] = self.current_octave
-            gesture_data["positive_gesture_info"] = {
-                "gesture_type": self.current_gesture_type,
-                "note": self.target_var.get(),
-                "note_with_octave": f"{self.target_var.get()}{self.current_octave}"
-            }
-            
-        elif self.current_category == "NEGATIVE":
-            gesture_data["negative_gesture_info"] = {
-                "gesture_type": self.target_var.get(),
-                "description": self.negative_gestures[self.target_var.get()]
-            }
-            
-        elif self.current_category == "NAVIGATION":
-            gesture_data["navigation_gesture_info"] = {
-                "direction": self.target_var.get(),
-                "description": self.navigation_gestures[self.target_var.get()]
-            }
-        
-        # Guardar archivo
-        filename = self.generate_filename()
-        filepath = os.path.join(self.data_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(gesture_data, f, indent=2, ensure_ascii=False)
-            
-        # Actualizar contadores
-        self.sample_count += 1
-        self.sample_label.config(text=f"Muestras: {self.sample_count}/{self.target_samples}")
-        self.progress['value'] = (self.sample_count / self.target_samples) * 100
+        # ✅ CREAR DATOS SEGÚN CATEGORÍA Y GUARDAR EN SEGUNDO PLANO
+        target = self.get_capture_target()
+        gesture_data = self.build_sample(target, landmarks_left, landmarks_right, quality_left, quality_right)
+        completed = self.store_sample(gesture_data)
         
         # Mensaje de confirmación
-        target_name = self.get_target_label()
+        target_name = target["label"]
         
-        if self.sample_count >= self.target_samples:
+        if completed:
             success_msg = f"🎉 ¡COMPLETADO!\n\n{self.target_samples} muestras capturadas para {target_name}\n\nCalidad promedio: {overall_quality:.1f}%"
             messagebox.showinfo("¡Objetivo Completado!", success_msg)
-            self.sample_count = 0
-            self.progress['value'] = 0
         else:
             remaining = self.target_samples - self.sample_count
             capture_msg = f"✅ ¡CAPTURADO!\n\nMuestra #{self.sample_count} de {target_name}\nCalidad: {overall_quality:.1f}%\n\nQuedan {remaining} muestras"
             self.show_capture_confirmation(capture_msg)
             
+    def start_burst(self):
+        """✅ MODO RÁFAGA: capturar N frames con calidad suficiente a la tasa indicada"""
+        if not self.capturing:
+            messagebox.showwarning("Advertencia", "Inicia la cámara antes de grabar una ráfaga.")
+            return
+        try:
+            count = int(self.burst_count_var.get())
+            rate = float(self.burst_rate_var.get())
+        except ValueError:
+            messagebox.showwarning("Advertencia", "Número de muestras o tasa no válidos.")
+            return
+        
+        self.burst_target = self.get_capture_target()
+        self.burst_interval = 1.0 / max(rate, 0.1)
+        self.burst_last = 0.0
+        self.burst_remaining = max(0, count)
+        self.status_label.config(text=f"🔁 Ráfaga: {self.burst_remaining} muestras restantes", foreground="blue")
+        
+    def process_burst(self, landmarks_left, landmarks_right, quality_left, quality_right):
+        """Capturar el frame actual si hay una ráfaga activa (hilo de inferencia)"""
+        if self.burst_remaining <= 0:
+            return
+        now = time.perf_counter()
+        if now - self.burst_last < self.burst_interval:
+            return
+        if not landmarks_left and not landmarks_right:
+            return
+        if max(quality_left, quality_right) < self.get_min_quality(self.burst_target["category"]):
+            return
+        
+        gesture_data = self.build_sample(self.burst_target, landmarks_left, landmarks_right,
+                                         quality_left, quality_right)
+        self.store_sample(gesture_data)
+        self.burst_last = now
+        self.burst_remaining -= 1
+        
+        remaining = self.burst_remaining
+        if remaining > 0:
+            text, color = f"🔁 Ráfaga: {remaining} muestras restantes", "blue"
+        else:
+            text, color = "✅ Ráfaga completada", "green"
+        self.root.after(0, lambda: self.status_label.config(text=text, foreground=color))
+            
     def get_target_label(self):
         """Obtener etiqueta objetivo según categoría"""
         if self.current_category == "POSITIVE":
@@ -849,28 +903,24 @@ class PianoCaptureApp:
             
         self.root.after(0, show_temp_window)
         
-    def generate_filename(self):
-        """Generar nombre de archivo único"""
-        category = self.current_category.lower()
-        target = self.target_var.get().replace("#", "sharp")
-        sample_num = self.sample_count + 1
-        
-        if self.current_category == "POSITIVE":
-            octave = self.current_octave
-            gesture_type = self.current_gesture_type
-            filename = f"{category}_{target}{octave}_{gesture_type}_sample_{sample_num:03d}.json"
-        else:
-            filename = f"{category}_{target}_sample_{sample_num:03d}.json"
-            
-        return filename
-        
     def stop_camera(self):
         """Detener cámara"""
         self.capturing = False
+        # Esperar a que las etapas terminen antes de liberar la cámara
+        for thread in getattr(self, 'pipeline_threads', []):
+            thread.join(timeout=1.0)
         if self.cap:
             self.cap.release()
         cv2.destroyAllWindows()
         
+        # Vaciar el escritor de fondo: la siguiente sesión usa un shard nuevo
+        self.burst_remaining = 0
+        with self.sample_lock:
+            writer, self.shard_writer = self.shard_writer, None
+        if writer is not None:
+            writer.close()
+            print(f"💾 {writer.written} muestras guardadas en {writer.path}")
+        
         self.status_label.config(text="Cámara detenida", foreground="red")
         self.start_camera_btn.config(state="normal")
         self.capture_btn.config(state="disabled")
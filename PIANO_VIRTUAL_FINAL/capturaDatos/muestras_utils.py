@@ -0,0 +1,103 @@
+"""
+Esquema de las muestras capturadas
+muestras_utils.py - Construcción del dict de una muestra, compartida por la GUI y el modo headless
+
+captura_notas.py y captura_headless.py escriben exactamente el mismo
+formato; los cargadores (app.py, ml/dataset_utils.py) no distinguen el
+origen de la muestra.
+"""
+
+from datetime import datetime
+
+# ✅ GESTOS NEGATIVOS
+NEGATIVE_GESTURES = {
+    "HAND_OPEN": "Mano abierta (dedos extendidos)",
+    "FIST_CLOSED": "Puño cerrado (todos los dedos)",
+    "PARTIAL_BEND": "Dedos parcialmente doblados",
+    "TRANSITION": "Movimiento entre teclas",
+    "WRONG_FINGERS": "Dedos incorrectos doblados",
+    "OUT_OF_ZONE": "Mano fuera de zona piano",
+    "MULTIPLE_FINGERS": "Múltiples dedos doblados",
+    "THUMB_ONLY": "Solo pulgar doblado",
+    "PINCH_GESTURE": "Gesto de pellizco/agarre"
+}
+
+# ✅ GESTOS DE NAVEGACIÓN
+NAVIGATION_GESTURES = {
+    "NAVIGATE_LEFT": "Apuntar hacia la izquierda",
+    "NAVIGATE_RIGHT": "Apuntar hacia la derecha",
+    "NAVIGATE_NEUTRAL": "Índice extendido (neutral)"
+}
+
+def min_quality(category):
+    """✅ UMBRALES DIFERENTES POR CATEGORÍA"""
+    return 70 if category == "POSITIVE" else 50 if category == "NEGATIVE" else 60
+
+def make_target(category, target, octave=4, gesture_type="single"):
+    """Objetivo de captura: dict con categoría, objetivo, etiqueta, octava y tipo de gesto"""
+    label = f"{target}{octave}" if category == "POSITIVE" else target
+    return {
+        "category": category,
+        "target": target,
+        "label": label,
+        "octave": octave,
+        "gesture_type": gesture_type
+    }
+
+def build_sample(target, landmarks_left, landmarks_right, quality_left, quality_right, sample_number):
+    """
+    Construir la muestra según categoría
+
+    Args:
+        target: Objetivo de make_target()
+        landmarks_left: Lista (21, 3) de la mano izquierda o vacía
+        landmarks_right: Lista (21, 3) de la mano derecha o vacía
+        quality_left: Calidad de la mano izquierda
+        quality_right: Calidad de la mano derecha
+        sample_number: Número de muestra dentro del objetivo
+
+    Returns:
+        dict: Muestra en el formato de captura_notas.py
+    """
+    category = target["category"]
+    gesture_data = {
+        "timestamp": datetime.now().isoformat(),
+        "gesture_category": category,  # POSITIVE, NEGATIVE, NAVIGATION
+        "target_note_or_chord": target["label"],
+        "landmarks_left_hand": landmarks_left,
+        "landmarks_right_hand": landmarks_right,
+        "quality_scores": {
+            "left_hand": quality_left,
+            "right_hand": quality_right,
+            "overall": max(quality_left, quality_right)
+        },
+        "hands_detected": {
+            "left_hand": len(landmarks_left) > 0,
+            "right_hand": len(landmarks_right) > 0,
+            "both_hands": len(landmarks_left) > 0 and len(landmarks_right) > 0
+        },
+        "sample_number": sample_number
+    }
+
+    # ✅ INFORMACIÓN ESPECÍFICA POR CATEGORÍA
+    if category == "POSITIVE":
+        gesture_data["octave"] = target["octave"]
+        gesture_data["positive_gesture_info"] = {
+            "gesture_type": target["gesture_type"],
+            "note": target["target"],
+            "note_with_octave": f"{target['target']}{target['octave']}"
+        }
+
+    elif category == "NEGATIVE":
+        gesture_data["negative_gesture_info"] = {
+            "gesture_type": target["target"],
+            "description": NEGATIVE_GESTURES[target["target"]]
+        }
+
+    elif category == "NAVIGATION":
+        gesture_data["navigation_gesture_info"] = {
+            "direction": target["target"],
+            "description": NAVIGATION_GESTURES[target["target"]]
+        }
+
+    return gesture_data
@@ -0,0 +1,79 @@
+"""
+Overlays estáticos del capturador
+overlay_utils.py - Teclado e indicadores pre-renderizados y mezclados solo en su bounding box
+
+Antes cada frame copiaba el frame completo, redibujaba teclas y textos y
+mezclaba con cv2.addWeighted sobre toda la imagen. Un StaticOverlay se
+dibuja una vez sobre un lienzo negro; se guarda recortado a su bounding
+box junto con la máscara de píxeles dibujados, y blend() mezcla en el
+propio frame solo esa región. El resultado es el mismo que
+addWeighted(frame, 1 - alpha, frame_con_dibujos, alpha): los píxeles sin
+dibujo no cambian.
+"""
+
+import cv2
+import numpy as np
+
+class StaticOverlay:
+    """Imagen + máscara de un overlay, recortadas a su bounding box"""
+
+    def __init__(self, canvas, alpha=0.6):
+        self.alpha = alpha
+        mask = canvas.any(axis=2)
+        ys, xs = np.nonzero(mask)
+        if len(ys) == 0:
+            self.bbox = None
+            return
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        self.bbox = (slice(y0, y1), slice(x0, x1))
+        self.image = np.ascontiguousarray(canvas[self.bbox])
+        self.mask = np.ascontiguousarray(mask[self.bbox])[:, :, None]
+        self._scratch = np.empty_like(self.image)  # Buffer reutilizado por blend()
+
+    @classmethod
+    def render(cls, shape, draw, alpha=0.6):
+        """
+        Pre-renderiza un overlay
+
+        Args:
+            shape: Forma del frame (h, w, 3)
+            draw: Función draw(canvas) que dibuja sobre un lienzo negro
+            alpha: Opacidad del overlay
+        """
+        canvas = np.zeros(shape, dtype=np.uint8)
+        draw(canvas)
+        return cls(canvas, alpha)
+
+    def blend(self, frame):
+        """Mezcla el overlay en el frame, in-place y solo dentro de su bounding box"""
+        if self.bbox is None:
+            return frame
+        roi = frame[self.bbox]
+        cv2.addWeighted(roi, 1 - self.alpha, self.image, self.alpha, 0, dst=self._scratch)
+        np.copyto(roi, self._scratch, where=self.mask)
+        return frame
+
+class OverlayCache:
+    """Un StaticOverlay por selección de la GUI; se reconstruye solo al cambiarla"""
+
+    def __init__(self, alpha=0.6):
+        self.alpha = alpha
+        self.key = None
+        self.overlay = None
+        self.builds = 0
+
+    def get(self, selection, shape, draw):
+        """
+        Overlay para la selección actual
+
+        Args:
+            selection: Tupla hashable (categoría, octava, tipo de gesto, objetivo)
+            shape: Forma del frame
+            draw: Función draw(canvas, selection) para reconstruir
+        """
+        key = (selection, tuple(shape))
+        if key != self.key:
+            self.overlay = StaticOverlay.render(shape, lambda canvas: draw(canvas, selection), self.alpha)
+            self.key = key
+            self.builds += 1
+        return self.overlay
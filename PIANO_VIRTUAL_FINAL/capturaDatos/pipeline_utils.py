@@ -0,0 +1,65 @@
+"""
+Utilidades del pipeline de captura
+pipeline_utils.py - Colas acotadas entre etapas y medidores de FPS por etapa
+
+El capturador separa cámara, MediaPipe y render en tres hilos. Las colas
+descartan el elemento más antiguo cuando están llenas: una etapa lenta
+nunca frena a la anterior, solo procesa el frame más reciente.
+"""
+
+import queue
+import threading
+import time
+
+class LatestQueue:
+    """Cola acotada que descarta lo más antiguo en lugar de bloquear al productor"""
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        """Encola sin bloquear; si está llena se descarta el elemento más antiguo"""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=0.1):
+        """Siguiente elemento o None si no llega nada en `timeout` segundos"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class StageMeter:
+    """FPS de una etapa del pipeline (media exponencial del intervalo entre frames)"""
+
+    def __init__(self, name, smoothing=0.1):
+        self.name = name
+        self.smoothing = smoothing
+        self.fps = 0.0
+        self.busy_ms = 0.0  # Tiempo de trabajo por frame (sin esperas)
+        self._last = None
+        self._lock = threading.Lock()
+
+    def tick(self, busy_s=None):
+        """Registra un frame procesado por la etapa"""
+        now = time.perf_counter()
+        with self._lock:
+            if self._last is not None:
+                interval = now - self._last
+                if interval > 0:
+                    self.fps += self.smoothing * (1.0 / interval - self.fps)
+            self._last = now
+            if busy_s is not None:
+                self.busy_ms += self.smoothing * (busy_s * 1000 - self.busy_ms)
+
+    def __str__(self):
+        return f"{self.name} {self.fps:4.1f}fps"
@@ -0,0 +1,72 @@
+"""
+Escritura asíncrona de muestras capturadas
+shard_writer.py - Un archivo JSONL (shard) por sesión, escrito por lotes en segundo plano
+
+Antes cada muestra se guardaba con json.dump(..., indent=2) en su propio
+archivo desde el hilo de la cámara/GUI. Ahora write() solo encola la
+muestra; un hilo de fondo la serializa y agrupa las escrituras, haciendo
+flush cada `flush_interval` segundos o cada `flush_size` muestras.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+class ShardWriter:
+    """Escritor en segundo plano de un shard JSONL por sesión de captura"""
+
+    def __init__(self, data_dir, prefix="session", flush_interval=1.0, flush_size=50):
+        self.path = os.path.join(data_dir, f"{prefix}_{datetime.now():%Y%m%d_%H%M%S}.jsonl")
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.written = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, sample):
+        """Encola una muestra (no bloquea)"""
+        if self._closed:
+            raise RuntimeError("El escritor de shards está cerrado")
+        self._queue.put(sample)
+
+    @property
+    def pending(self):
+        """Muestras encoladas aún no escritas"""
+        return self._queue.qsize()
+
+    def _run(self):
+        """Bucle del hilo escritor"""
+        batch = []
+        last_flush = time.monotonic()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+                try:
+                    sample = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    sample = None
+
+                if sample is not None:
+                    batch.append(json.dumps(sample, ensure_ascii=False))
+
+                due = time.monotonic() - last_flush >= self.flush_interval
+                finished = self._closed and self._queue.empty()
+                if batch and (len(batch) >= self.flush_size or due or finished):
+                    f.write('\n'.join(batch) + '\n')
+                    f.flush()
+                    self.written += len(batch)
+                    batch = []
+                if due or finished:
+                    last_flush = time.monotonic()
+                if finished:
+                    return
+
+    def close(self, timeout=5.0):
+        """Escribe lo pendiente y detiene el hilo"""
+        self._closed = True
+        self._thread.join(timeout)
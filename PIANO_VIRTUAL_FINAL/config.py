@@ -18,5 +18,28 @@ KEYBOARD_OPACITY = 0.6         # Transparencia del teclado
 
 # Parámetros de detección
 FINGER_BEND_THRESHOLD = 120    # Ángulo para considerar dedo doblado
+# Umbral por dedo (pulgar, índice, medio, anular, meñique) sobre el ángulo medio PIP/DIP
+FINGER_BEND_THRESHOLDS = [150, FINGER_BEND_THRESHOLD, FINGER_BEND_THRESHOLD,
+                          FINGER_BEND_THRESHOLD, FINGER_BEND_THRESHOLD]
+FINGER_BEND_HYSTERESIS = 15    # Grados extra para considerar el dedo de nuevo extendido
 FINGER_INDICES = [8, 7, 6, 5]  # Índices del dedo índice
-GESTURE_THRESHOLD = 0.3        # Umbral para detectar gestos de navegación
\ No newline at end of file
+GESTURE_THRESHOLD = 0.3        # Umbral para detectar gestos de navegación
+
+# Filtro One-Euro de landmarks (coordenadas normalizadas)
+LANDMARK_FILTER_MIN_CUTOFF = 1.0   # Hz con la mano quieta
+LANDMARK_FILTER_BETA = 5.0         # Aumento del corte con la velocidad
+LANDMARK_FILTER_D_CUTOFF = 1.0     # Hz de la derivada
+LANDMARK_PREDICTION_MAX_MS = 100   # Horizonte máximo de predicción
+
+# Clasificador por prototipos (fallback construido con los datos capturados)
+PROTOTYPE_MODE = 'centroid'        # 'centroid' (centroides por clase) o 'knn' (KD-tree)
+PROTOTYPE_K = 5                    # Vecinos que votan (modo knn)
+PROTOTYPE_MIN_CONFIDENCE = 0.6     # Por debajo se usa la posición geométrica
+
+# Compuerta de intención de tocar (POSITIVE vs NEGATIVE, antes de la clasificación)
+INTENT_GATE_ENABLED = True
+INTENT_GATE_MIN_RECALL = 0.98      # Fracción de pulsaciones del dataset que debe dejar pasar
+
+# Motor de audio
+AUDIO_VOICES = 16              # Voces simultáneas (canales del mixer)
+AUDIO_RELEASE_MS = 80          # Fade de release al soltar una nota
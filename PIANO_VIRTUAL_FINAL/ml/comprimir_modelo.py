@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compresión del modelo profesional con control de precisión
+----------------------------------------------------------
+Genera variantes más pequeñas del modelo Keras y las evalúa sobre un
+conjunto de validación del dataset capturado:
+    - poda por magnitud de las capas densas (sin reentrenar)
+    - TFLite float32, float16 e int8 (cuantización post-entrenamiento con
+      un dataset representativo tomado de las muestras de entrenamiento)
+Las variantes cuya precisión cae más de --max-drop respecto al modelo
+original se rechazan (y se borran salvo --keep-rejected). El informe
+incluye tamaño, tiempo de carga, latencia por inferencia y precisión.
+
+Uso:
+    python ml/comprimir_modelo.py --data captured_data --max-drop 0.01
+    python ml/comprimir_modelo.py --sparsity 0.5,0.75 --output ml/models_professional/comprimidos
+"""
+
+import argparse
+import gzip
+import json
+import os
+
+import numpy as np
+
+from dataset_utils import DEFAULT_DATA_DIR, load_feature_dataset, split_indices
+from model_bundle import ModelBundle, default_model_path, DEFAULT_SCALER_PATH, DEFAULT_ENCODER_PATH
+from evaluar_modelo import evaluate
+from utils.feature_pipeline import save_pipeline, pipeline_path_for
+
+def prune_model(model, sparsity):
+    """
+    Poda por magnitud: pone a cero la fracción `sparsity` de pesos más
+    pequeños de cada capa densa, salvo la última (salida)
+
+    Returns:
+        Modelo Keras podado (copia)
+    """
+    import tensorflow as tf
+    pruned = tf.keras.models.clone_model(model)
+    pruned.set_weights(model.get_weights())
+
+    dense_layers = [layer for layer in pruned.layers if isinstance(layer, tf.keras.layers.Dense)]
+    for layer in dense_layers[:-1]:
+        weights = layer.get_weights()
+        kernel = weights[0]
+        threshold = np.quantile(np.abs(kernel), sparsity)
+        weights[0] = np.where(np.abs(kernel) < threshold, 0.0, kernel).astype(kernel.dtype)
+        layer.set_weights(weights)
+    return pruned
+
+def convert_tflite(model, mode, representative_rows=None):
+    """
+    Convierte a TFLite
+
+    Args:
+        model: Modelo Keras
+        mode: 'float32', 'float16' o 'int8'
+        representative_rows: Entradas normalizadas para calibrar int8
+
+    Returns:
+        bytes: Modelo TFLite
+    """
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if mode == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'int8':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        def representative_dataset():
+            for row in representative_rows:
+                yield [row[np.newaxis].astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+def gzip_size(path):
+    """Tamaño comprimido (los pesos podados a cero se comprimen bien)"""
+    with open(path, 'rb') as f:
+        return len(gzip.compress(f.read()))
+
+def main():
+    parser = argparse.ArgumentParser(description='Poda y cuantización con control de precisión')
+    parser.add_argument('--model', default=default_model_path(), help='Modelo Keras de partida (.h5/.keras)')
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH)
+    parser.add_argument('--encoder', default=DEFAULT_ENCODER_PATH)
+    parser.add_argument('--features', help='Pipeline de features (por defecto, modelo.features.json)')
+    parser.add_argument('--data', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--output', default=os.path.join('ml', 'models_professional', 'comprimidos'))
+    parser.add_argument('--sparsity', default='0.5,0.75', help='Niveles de poda a probar')
+    parser.add_argument('--max-drop', type=float, default=0.01, help='Caída máxima de accuracy permitida')
+    parser.add_argument('--validation', type=float, default=0.2, help='Fracción de validación')
+    parser.add_argument('--representative', type=int, default=500, help='Filas para calibrar int8')
+    parser.add_argument('--keep-rejected', action='store_true')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    base = ModelBundle(args.model, args.scaler, args.encoder, args.features)
+    if base.kind not in ('h5', 'keras'):
+        raise SystemExit("❌ El modelo de partida debe ser Keras (.h5/.keras)")
+
+    dataset = load_feature_dataset(args.data, base.input_features, base.classes, base.pipeline)
+    if not len(dataset):
+        raise SystemExit("❌ No hay muestras para evaluar")
+    train_idx, validation_idx = split_indices(len(dataset), args.validation)
+    validation = dataset.subset(validation_idx)
+    train = dataset.subset(train_idx)
+
+    # Dataset representativo: filas de entrenamiento ya normalizadas
+    rng = np.random.default_rng(0)
+    rows = rng.choice(len(train.features), size=min(args.representative, len(train.features)), replace=False)
+    representative_rows = base.normalize(train.features[rows], train.mask[rows])
+
+    baseline = evaluate(base, validation, 4096)['accuracy']
+    print(f"📊 Modelo original: accuracy {baseline:.2%} en {len(validation)} muestras de validación")
+
+    # Variantes: (nombre, modelo Keras, formato)
+    variants = [('tflite_float32', base.model, 'float32'),
+                ('tflite_float16', base.model, 'float16'),
+                ('tflite_int8', base.model, 'int8')]
+    for sparsity in [float(v) for v in args.sparsity.split(',') if v]:
+        pruned = prune_model(base.model, sparsity)
+        tag = f"poda{int(sparsity * 100)}"
+        variants += [(f'{tag}_keras', pruned, 'keras'),
+                     (f'{tag}_tflite_float16', pruned, 'float16'),
+                     (f'{tag}_tflite_int8', pruned, 'int8')]
+
+    report = [{
+        'variant': 'original', 'path': args.model, 'size_bytes': base.size_bytes,
+        'gzip_bytes': gzip_size(args.model), 'load_time_s': base.load_time_s,
+        'latency_ms': base.measure_latency(1), 'accuracy': baseline, 'drop': 0.0, 'accepted': True
+    }]
+    for name, model, mode in variants:
+        if mode == 'keras':
+            path = os.path.join(args.output, f'{name}.h5')
+            model.save(path)
+        else:
+            path = os.path.join(args.output, f'{name}.tflite')
+            with open(path, 'wb') as f:
+                f.write(convert_tflite(model, mode, representative_rows))
+
+        # Cada variante lleva el mismo pipeline de features que el original
+        save_pipeline(base.pipeline, pipeline_path_for(path))
+        bundle = ModelBundle(path, args.scaler, args.encoder)
+        accuracy = evaluate(bundle, validation, 4096)['accuracy']
+        drop = baseline - accuracy
+        accepted = drop <= args.max_drop
+        report.append({
+            'variant': name, 'path': path, 'size_bytes': bundle.size_bytes, 'gzip_bytes': gzip_size(path),
+            'load_time_s': bundle.load_time_s, 'latency_ms': bundle.measure_latency(1),
+            'accuracy': accuracy, 'drop': drop, 'accepted': accepted
+        })
+        if not accepted and not args.keep_rejected:
+            os.remove(path)
+            os.remove(pipeline_path_for(path))
+        print(f"{'✅' if accepted else '❌'} {name}: accuracy {accuracy:.2%} (caída {drop:+.2%})")
+
+    print(f"\n{'variante':>24} {'KB':>8} {'KB gzip':>8} {'carga s':>8} {'ms/inf':>7} {'acc':>7} {'estado':>9}")
+    for row in report:
+        status = 'aceptada' if row['accepted'] else 'rechazada'
+        print(f"{row['variant']:>24} {row['size_bytes'] / 1024:>8.0f} {row['gzip_bytes'] / 1024:>8.0f} "
+              f"{row['load_time_s']:>8.2f} {row['latency_ms']:>7.3f} {row['accuracy']:>7.2%} {status:>9}")
+
+    with open(os.path.join(args.output, 'compression_report.json'), 'w', encoding='utf-8') as f:
+        json.dump({'baseline_accuracy': baseline, 'max_drop': args.max_drop,
+                   'feature_pipeline': base.pipeline.to_metadata(), 'variants': report},
+                  f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en: {os.path.join(args.output, 'compression_report.json')}")
+
+if __name__ == '__main__':
+    main()
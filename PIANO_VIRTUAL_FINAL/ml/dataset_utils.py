@@ -0,0 +1,160 @@
+"""
+Carga del dataset capturado para evaluación y compresión de modelos
+dataset_utils.py - Muestras de captura_notas.py → matrices de features por lotes
+
+Construye las mismas filas que el servidor (features_utils.build_feature_batch):
+    - modelo de 126: una fila por muestra (izquierda + derecha, con máscara)
+    - modelo de 63: una fila por mano presente; al predecir se elige la fila
+      más segura de cada muestra, igual que predict_with_professional_model
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.features_utils import build_feature_batch
+
+DEFAULT_DATA_DIR = os.path.join(BASE_DIR, 'captured_data')
+
+def iter_sample_records(data_dir):
+    """
+    Recorre las muestras capturadas con su origen, sin cargarlas todas a la vez
+
+    Args:
+        data_dir: Carpeta con los JSON (o shards JSONL) de captura_notas.py
+
+    Yields:
+        tuple: (archivo, línea, muestra); línea es 0 en los .json sueltos
+    """
+    for name in sorted(os.listdir(data_dir)):
+        if not name.endswith(('.json', '.jsonl')):
+            continue
+        try:
+            with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                if not name.endswith('.jsonl'):
+                    yield name, 0, json.load(f)
+                    continue
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield name, number, json.loads(line)
+                    except ValueError as e:
+                        print(f"⚠️ Línea ilegible {name}:{number}: {e}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Muestra ilegible {name}: {e}")
+
+def iter_samples(data_dir):
+    """
+    Recorre las muestras capturadas sin cargarlas todas a la vez
+
+    Args:
+        data_dir: Carpeta con los JSON (o shards JSONL) de captura_notas.py
+
+    Yields:
+        dict: Muestra capturada
+    """
+    for _, _, sample in iter_sample_records(data_dir):
+        yield sample
+
+def sample_hands(sample):
+    """dict {'Left': landmarks, 'Right': landmarks} de una muestra"""
+    return {'Left': sample.get('landmarks_left_hand') or None,
+            'Right': sample.get('landmarks_right_hand') or None}
+
+class FeatureDataset:
+    """Filas de features de un dataset capturado, listas para procesar por lotes"""
+
+    def __init__(self, features, mask, row_sample, labels, classes, skipped=0):
+        self.features = features      # (R, F) float32
+        self.mask = mask              # (R, F) bool
+        self.row_sample = row_sample  # (R,) índice de muestra de cada fila
+        self.labels = labels          # (S,) índice de clase de cada muestra
+        self.classes = classes
+        self.skipped = skipped        # Muestras sin mano o con etiqueta desconocida
+
+    def __len__(self):
+        return len(self.labels)
+
+    def iter_batches(self, batch_size):
+        """Lotes (features, mask) consecutivos de filas"""
+        for start in range(0, len(self.features), batch_size):
+            end = start + batch_size
+            yield self.features[start:end], self.mask[start:end]
+
+    def best_rows(self, probabilities):
+        """
+        Reduce las filas a una predicción por muestra (la fila más segura)
+
+        Args:
+            probabilities: (R, C) probabilidades por fila
+
+        Returns:
+            tuple: (clase predicha (S,), confianza (S,))
+        """
+        confidences = probabilities.max(axis=1)
+        predicted = probabilities.argmax(axis=1)
+        # Ordenar por muestra y confianza: la última fila de cada muestra es la mejor
+        order = np.lexsort((confidences, self.row_sample))
+        last = np.r_[self.row_sample[order][1:] != self.row_sample[order][:-1], True]
+        best = order[last]
+        return predicted[best], confidences[best]
+
+    def subset(self, sample_indices):
+        """Dataset con solo las muestras indicadas (p. ej. conjunto de validación)"""
+        sample_indices = np.asarray(sample_indices)
+        keep = np.isin(self.row_sample, sample_indices)
+        remap = np.full(len(self.labels), -1)
+        remap[sample_indices] = np.arange(len(sample_indices))
+        return FeatureDataset(self.features[keep], self.mask[keep], remap[self.row_sample[keep]],
+                              self.labels[sample_indices], self.classes)
+
+def load_feature_dataset(data_dir, input_features, classes, pipeline=None):
+    """
+    Carga el dataset capturado con las filas que espera el modelo
+
+    Args:
+        data_dir: Carpeta con las muestras
+        input_features: Una mano (63 en raw-1) o dos manos (126) por fila
+        classes: Clases del label encoder (orden del modelo)
+        pipeline: FeaturePipeline del modelo (None = raw-1)
+
+    Returns:
+        FeatureDataset
+    """
+    class_index = {label: i for i, label in enumerate(classes)}
+    rows, masks, row_sample, labels = [], [], [], []
+    skipped = 0
+
+    for sample in iter_samples(data_dir):
+        label = sample.get('target_note_or_chord')
+        if label not in class_index:
+            skipped += 1
+            continue
+        batch, mask, _ = build_feature_batch(sample_hands(sample), input_features, pipeline)
+        if batch is None:
+            skipped += 1
+            continue
+        rows.append(batch)
+        masks.append(mask)
+        row_sample.extend([len(labels)] * len(batch))
+        labels.append(class_index[label])
+
+    if not rows:
+        empty = np.zeros((0, input_features), dtype=np.float32)
+        return FeatureDataset(empty, empty.astype(bool), np.zeros(0, dtype=int),
+                              np.zeros(0, dtype=int), list(classes), skipped)
+
+    return FeatureDataset(np.concatenate(rows).astype(np.float32), np.concatenate(masks),
+                          np.asarray(row_sample), np.asarray(labels), list(classes), skipped)
+
+def split_indices(n_samples, validation_fraction=0.2, seed=42):
+    """Índices (entrenamiento, validación) reproducibles"""
+    order = np.random.default_rng(seed).permutation(n_samples)
+    n_validation = int(round(n_samples * validation_fraction))
+    return np.sort(order[n_validation:]), np.sort(order[:n_validation])
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Deduplicación del dataset capturado
+-----------------------------------
+Las ráfagas y la captura headless producen muchas muestras casi idénticas
+por etiqueta. Este comando normaliza los landmarks con el pipeline hand-1
+(origen en la muñeca, escala por el tamaño de la palma), construye un
+índice de vecinos por (categoría, etiqueta, manos presentes) y marca como
+duplicada cada muestra a menos de --threshold de otra ya conservada
+(recorrido voraz en el orden del dataset: se conserva la primera).
+
+Distancia: desplazamiento RMS por landmark en unidades de tamaño de mano.
+Índices:
+    - kdtree: scipy cKDTree, exacto
+    - hash: proyección ortonormal a pocas dimensiones + celdas de tamaño
+      --threshold; solo compara dentro de cada celda (O(n), aproximado:
+      nunca elimina una muestra que no sea duplicada, pero puede dejar
+      alguna que esté en la celda vecina)
+
+Nunca modifica los datos originales: --flag escribe un manifiesto con los
+duplicados y --output una copia deduplicada en JSONL. --evaluate entrena
+un clasificador de referencia (MLP de scikit-learn) con y sin duplicados
+sobre el mismo conjunto de validación y compara tiempo y precisión.
+
+Uso:
+    python ml/deduplicar_dataset.py --data captured_data --threshold 0.02
+    python ml/deduplicar_dataset.py --data captured_data --flag duplicados.json --evaluate
+    python ml/deduplicar_dataset.py --data captured_data --method hash --output captured_data_dedup
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_utils import DEFAULT_DATA_DIR, iter_sample_records, split_indices
+from utils.features_utils import landmarks_to_array
+from utils.feature_pipeline import FeaturePipeline, HAND_VERSION
+
+NORMALIZER = FeaturePipeline(HAND_VERSION)  # Mismas coordenadas normalizadas que el entrenamiento
+
+def load_vectors(data_dir):
+    """
+    Vectores normalizados (izquierda + derecha) de todas las muestras
+
+    Returns:
+        tuple: (vectors (N, 126) float32, groups (N,) int, group_names, origins [(archivo, línea)],
+                etiquetas (N,) str)
+    """
+    vectors, group_ids, origins, labels = [], [], [], []
+    group_index = {}
+    for name, line, sample in iter_sample_records(data_dir):
+        label = sample.get('target_note_or_chord')
+        hands = [landmarks_to_array(sample.get('landmarks_left_hand') or None),
+                 landmarks_to_array(sample.get('landmarks_right_hand') or None)]
+        if label is None or all(hand is None for hand in hands):
+            continue
+        vector = np.zeros((2, 63), dtype=np.float32)
+        for i, hand in enumerate(hands):
+            if hand is not None:
+                vector[i] = NORMALIZER.transform(hand)[0]
+        key = (sample.get('gesture_category', 'POSITIVE'), label, hands[0] is not None, hands[1] is not None)
+        group_ids.append(group_index.setdefault(key, len(group_index)))
+        vectors.append(vector.reshape(-1))
+        origins.append((name, line))
+        labels.append(label)
+
+    group_names = [None] * len(group_index)
+    for key, index in group_index.items():
+        group_names[index] = key
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, 126)
+    return vectors, np.asarray(group_ids, dtype=np.int64), group_names, origins, np.asarray(labels)
+
+def greedy_kdtree(vectors, radius):
+    """
+    Duplicados exactos dentro de `radius` con un KD-tree
+
+    Returns:
+        numpy.ndarray: (n,) índice de la muestra conservada que representa a cada una
+    """
+    from scipy.spatial import cKDTree
+    tree = cKDTree(vectors)
+    keep = np.ones(len(vectors), dtype=bool)
+    representative = np.arange(len(vectors))
+    for i in range(len(vectors)):
+        if not keep[i]:
+            continue
+        neighbours = np.asarray(tree.query_ball_point(vectors[i], radius), dtype=np.int64)
+        neighbours = neighbours[(neighbours > i) & keep[neighbours]]
+        keep[neighbours] = False
+        representative[neighbours] = i
+    return representative
+
+def greedy_hash(vectors, radius, dims=8, seed=0):
+    """
+    Duplicados dentro de `radius` comparando solo dentro de celdas de una proyección
+
+    Una proyección ortonormal no alarga distancias: dos duplicados reales
+    quedan a menos de `radius` también en la proyección (misma celda o vecina).
+
+    Returns:
+        numpy.ndarray: (n,) índice de la muestra conservada que representa a cada una
+    """
+    dims = min(dims, vectors.shape[1])
+    basis, _ = np.linalg.qr(np.random.default_rng(seed).normal(size=(vectors.shape[1], dims)))
+    codes = np.floor(vectors @ basis / radius).astype(np.int64)
+    _, bucket = np.unique(codes, axis=0, return_inverse=True)
+    bucket = bucket.reshape(-1)
+
+    representative = np.arange(len(vectors))
+    order = np.argsort(bucket, kind='stable')
+    bounds = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1], True])
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        members = order[start:end]
+        if len(members) < 2:
+            continue
+        keep = np.ones(len(members), dtype=bool)
+        for k in range(len(members)):
+            if not keep[k]:
+                continue
+            rest = np.arange(k + 1, len(members))
+            rest = rest[keep[rest]]
+            close = rest[np.linalg.norm(vectors[members[rest]] - vectors[members[k]], axis=1) <= radius]
+            keep[close] = False
+            representative[members[close]] = members[k]
+    return representative
+
+def deduplicate(vectors, groups, group_names, threshold, method='kdtree', hash_dims=8):
+    """
+    Representante conservado de cada muestra, buscando solo dentro de su grupo
+
+    Returns:
+        numpy.ndarray: (N,) índice del representante (igual a sí mismo si se conserva)
+    """
+    representative = np.arange(len(vectors))
+    for group, (_, _, has_left, has_right) in enumerate(group_names):
+        members = np.flatnonzero(groups == group)
+        if len(members) < 2:
+            continue
+        # Radio euclídeo equivalente a `threshold` de desplazamiento RMS por landmark
+        radius = threshold * np.sqrt(21 * (int(has_left) + int(has_right)))
+        if method == 'kdtree':
+            local = greedy_kdtree(vectors[members], radius)
+        else:
+            local = greedy_hash(vectors[members], radius, hash_dims)
+        representative[members] = members[local]
+    return representative
+
+def rms_distance(vectors, representative, groups, group_names):
+    """Desplazamiento RMS por landmark entre cada muestra y su representante"""
+    n_hands = np.array([int(left) + int(right) for _, _, left, right in group_names])[groups]
+    return np.linalg.norm(vectors - vectors[representative], axis=1) / np.sqrt(21 * n_hands)
+
+def evaluate_training(vectors, labels, keep, validation_fraction):
+    """
+    Clasificador de referencia con y sin duplicados, validado en las mismas muestras
+
+    Returns:
+        list: [{'dataset', 'train_samples', 'fit_s', 'accuracy'}]
+    """
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    train_idx, validation_idx = split_indices(len(vectors), validation_fraction)
+    results = []
+    for name, rows in (('completo', train_idx), ('deduplicado', train_idx[keep[train_idx]])):
+        model = make_pipeline(StandardScaler(), MLPClassifier(hidden_layer_sizes=(128, 64), max_iter=200,
+                                                              early_stopping=True, random_state=0))
+        start = time.perf_counter()
+        model.fit(vectors[rows], labels[rows])
+        fit_s = time.perf_counter() - start
+        accuracy = float((model.predict(vectors[validation_idx]) == labels[validation_idx]).mean())
+        results.append({'dataset': name, 'train_samples': int(len(rows)), 'fit_s': fit_s, 'accuracy': accuracy})
+    return results
+
+def write_deduplicated(data_dir, output_dir, drop_origins):
+    """Copia en JSONL de las muestras conservadas (los originales no se tocan)"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, 'dataset_dedup.jsonl')
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for name, line, sample in iter_sample_records(data_dir):
+            if (name, line) in drop_origins:
+                continue
+            f.write(json.dumps(sample, ensure_ascii=False) + '\n')
+            written += 1
+    return path, written
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicación de muestras casi idénticas')
+    parser.add_argument('--data', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--threshold', type=float, default=0.02,
+                        help='Desplazamiento RMS por landmark (tamaños de mano) bajo el que se considera duplicado')
+    parser.add_argument('--method', choices=['kdtree', 'hash'], default='kdtree')
+    parser.add_argument('--hash-dims', type=int, default=8, help='Dimensiones de la proyección del método hash')
+    parser.add_argument('--flag', help='Escribir un manifiesto JSON con los duplicados')
+    parser.add_argument('--output', help='Carpeta para la copia deduplicada (JSONL)')
+    parser.add_argument('--evaluate', action='store_true', help='Comparar entrenamiento con y sin duplicados')
+    parser.add_argument('--validation', type=float, default=0.2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    vectors, groups, group_names, origins, labels = load_vectors(args.data)
+    load_s = time.perf_counter() - start
+    if not len(vectors):
+        raise SystemExit("❌ No hay muestras con manos")
+    print(f"📁 {len(vectors)} muestras en {len(group_names)} grupos (cargadas en {load_s:.1f}s)")
+
+    start = time.perf_counter()
+    representative = deduplicate(vectors, groups, group_names, args.threshold, args.method, args.hash_dims)
+    index_s = time.perf_counter() - start
+    keep = representative == np.arange(len(vectors))
+    removed = int((~keep).sum())
+    print(f"🔎 Índice {args.method}: {removed} duplicados ({removed / len(vectors):.1%}) "
+          f"en {index_s:.1f}s ({len(vectors) / max(index_s, 1e-9):.0f} muestras/s)")
+
+    print(f"\n{'categoría':>10} {'etiqueta':>16} {'manos':>6} {'antes':>7} {'después':>8} {'quitado':>8}")
+    for group, (category, label, has_left, has_right) in enumerate(group_names):
+        members = groups == group
+        before, after = int(members.sum()), int(keep[members].sum())
+        hands = ('I' if has_left else '') + ('D' if has_right else '')
+        print(f"{category:>10} {str(label):>16} {hands:>6} {before:>7} {after:>8} {1 - after / before:>8.1%}")
+
+    if args.flag:
+        distances = rms_distance(vectors, representative, groups, group_names)
+        duplicates = [{'file': origins[i][0], 'line': origins[i][1],
+                       'duplicate_of': {'file': origins[representative[i]][0], 'line': origins[representative[i]][1]},
+                       'distance': float(distances[i])}
+                      for i in np.flatnonzero(~keep)]
+        with open(args.flag, 'w', encoding='utf-8') as f:
+            json.dump({'threshold': args.threshold, 'method': args.method, 'samples': len(vectors),
+                       'duplicates': duplicates}, f, indent=2, ensure_ascii=False)
+        print(f"\n🏷️ Manifiesto de duplicados: {args.flag}")
+
+    if args.output:
+        path, written = write_deduplicated(args.data, args.output,
+                                           {origins[i] for i in np.flatnonzero(~keep)})
+        print(f"\n💾 {written} muestras conservadas en {path}")
+
+    if args.evaluate:
+        print(f"\n{'entrenamiento':>14} {'muestras':>9} {'ajuste s':>9} {'accuracy':>9}")
+        for row in evaluate_training(vectors, labels, keep, args.validation):
+            print(f"{row['dataset']:>14} {row['train_samples']:>9} {row['fit_s']:>9.1f} {row['accuracy']:>9.2%}")
+
+if __name__ == '__main__':
+    main()
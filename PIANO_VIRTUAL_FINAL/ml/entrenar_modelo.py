@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Entrenamiento del clasificador de notas con el pipeline de features versionado
+------------------------------------------------------------------------------
+Construye las filas con exactamente la misma función que el servidor
+(features_utils.build_feature_batch + FeaturePipeline), entrena una red
+densa y guarda el bundle completo con los nombres que carga app.py:
+    piano_professional_model.h5, scaler_professional.pkl,
+    encoder_professional.pkl y piano_professional_model.features.json
+    (versión del pipeline, comprobada al cargar).
+
+Por defecto escribe en ml/models_trained, no en la carpeta que sirve
+app.py. Se niega a escribir en una carpeta con otro modelo sin archivo de
+pipeline (p. ej. un piano_finetuned_model.h5 anterior, que app.py prefiere):
+ese modelo pasaría a usar el scaler nuevo sin que nada lo detecte.
+
+Uso:
+    python ml/entrenar_modelo.py --data captured_data --pipeline hand-1 --angles
+    python ml/entrenar_modelo.py --pipeline hand-1 --rotate --two-hands --output ml/models_hand1
+    python ml/entrenar_modelo.py --pipeline raw-1   # mismas features que los modelos anteriores
+"""
+
+import argparse
+import os
+
+import joblib
+import numpy as np
+
+from dataset_utils import DEFAULT_DATA_DIR, iter_samples, load_feature_dataset, split_indices
+from model_bundle import ModelBundle, PROFESSIONAL_MODEL_DIR
+from evaluar_modelo import evaluate
+from utils.feature_pipeline import (FeaturePipeline, PIPELINE_VERSIONS, HAND_VERSION,
+                                    save_pipeline, pipeline_path_for)
+
+TRAINED_MODEL_DIR = os.path.join(os.path.dirname(PROFESSIONAL_MODEL_DIR), 'models_trained')
+MODEL_EXTENSIONS = ('.h5', '.keras', '.tflite', '.npz')
+
+def models_sharing_scaler(output_dir, model_name):
+    """
+    Modelos de la carpeta que compartirían el scaler nuevo sin poder detectarlo
+
+    Son los modelos distintos del que se va a escribir que no tienen archivo
+    de pipeline: al cargarlos se asume raw-1 sin huella de scaler.
+
+    Returns:
+        list: Nombres de archivo
+    """
+    if not os.path.isdir(output_dir):
+        return []
+    return [name for name in sorted(os.listdir(output_dir))
+            if name.endswith(MODEL_EXTENSIONS) and os.path.splitext(name)[0] != os.path.splitext(model_name)[0]
+            and not os.path.exists(pipeline_path_for(os.path.join(output_dir, name)))]
+
+def fit_masked_scaler(features, mask):
+    """
+    StandardScaler ajustado solo con los valores presentes (las manos
+    ausentes van en cero y el servidor las anula tras normalizar)
+    """
+    from sklearn.preprocessing import StandardScaler
+    counts = np.maximum(mask.sum(axis=0), 1)
+    mean = np.where(mask, features, 0.0).sum(axis=0) / counts
+    var = np.where(mask, (features - mean) ** 2, 0.0).sum(axis=0) / counts
+
+    scaler = StandardScaler().fit(features[:2])  # Inicializa los atributos de sklearn
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scaler.scale_ = np.sqrt(np.where(var > 0, var, 1.0))
+    scaler.n_samples_seen_ = counts
+    return scaler
+
+def build_model(input_features, n_classes):
+    """Red densa del clasificador"""
+    import tensorflow as tf
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(input_features,)),
+        tf.keras.layers.Dense(256, activation='relu'),
+        tf.keras.layers.Dropout(0.3),
+        tf.keras.layers.Dense(128, activation='relu'),
+        tf.keras.layers.Dropout(0.3),
+        tf.keras.layers.Dense(n_classes, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description='Entrenar el clasificador con un pipeline de features versionado')
+    parser.add_argument('--data', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--pipeline', choices=PIPELINE_VERSIONS, default=HAND_VERSION)
+    parser.add_argument('--rotate', action='store_true', help='Normalizar la rotación de la mano (hand-1)')
+    parser.add_argument('--angles', action='store_true', help='Añadir los ángulos de flexión (hand-1)')
+    parser.add_argument('--two-hands', action='store_true', help='Una fila con ambas manos en vez de una por mano')
+    parser.add_argument('--output', default=TRAINED_MODEL_DIR,
+                        help='Carpeta del bundle (por defecto no la que sirve app.py)')
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--validation', type=float, default=0.2)
+    args = parser.parse_args()
+
+    conflicts = models_sharing_scaler(args.output, 'piano_professional_model.h5')
+    if conflicts:
+        raise SystemExit(f"❌ {args.output} contiene modelos sin archivo de pipeline ({', '.join(conflicts)}) "
+                         f"que usarían el scaler nuevo; elige otra carpeta con --output")
+
+    import tensorflow as tf
+    from sklearn.preprocessing import LabelEncoder
+
+    pipeline = FeaturePipeline(args.pipeline, rotate=args.rotate, angles=args.angles)
+    input_features = pipeline.input_sizes[1 if args.two_hands else 0]
+    print(f"🧮 Pipeline {pipeline.version}: {pipeline.features_per_hand} features por mano, "
+          f"entrada {input_features}")
+
+    labels = sorted({sample.get('target_note_or_chord') for sample in iter_samples(args.data)} - {None})
+    encoder = LabelEncoder().fit(labels)
+    dataset = load_feature_dataset(args.data, input_features, list(encoder.classes_), pipeline)
+    if not len(dataset):
+        raise SystemExit("❌ No hay muestras para entrenar")
+    print(f"📁 {len(dataset)} muestras ({len(dataset.features)} filas), {len(labels)} clases, "
+          f"descartadas: {dataset.skipped}")
+
+    # División por muestra (las dos manos de una muestra quedan en el mismo lado)
+    train_idx, validation_idx = split_indices(len(dataset), args.validation)
+    train, validation = dataset.subset(train_idx), dataset.subset(validation_idx)
+    train_rows = train.labels[train.row_sample]
+    validation_rows = validation.labels[validation.row_sample]
+
+    scaler = fit_masked_scaler(train.features, train.mask)
+    normalize = lambda part: np.where(part.mask, scaler.transform(part.features), 0.0).astype(np.float32)
+
+    model = build_model(input_features, len(labels))
+    model.fit(normalize(train), train_rows,
+              validation_data=(normalize(validation), validation_rows),
+              epochs=args.epochs, batch_size=args.batch_size, verbose=2,
+              callbacks=[tf.keras.callbacks.EarlyStopping(patience=10, restore_best_weights=True)])
+
+    os.makedirs(args.output, exist_ok=True)
+    model_path = os.path.join(args.output, 'piano_professional_model.h5')
+    scaler_path = os.path.join(args.output, 'scaler_professional.pkl')
+    encoder_path = os.path.join(args.output, 'encoder_professional.pkl')
+    pipeline_path = pipeline_path_for(model_path)
+    model.save(model_path)
+    joblib.dump(scaler, scaler_path)
+    joblib.dump(encoder, encoder_path)
+    save_pipeline(pipeline, pipeline_path, scaler)
+
+    # Releer el bundle como lo hará el servidor (verifica versión y dimensiones)
+    bundle = ModelBundle(model_path, scaler_path, encoder_path, pipeline_path)
+    accuracy = evaluate(bundle, validation, 4096)['accuracy']
+    print(f"\n✅ Bundle guardado en {args.output} (accuracy de validación {accuracy:.2%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Evaluación offline del clasificador de notas
+--------------------------------------------
+Pasa el dataset capturado por cualquier modelo (Keras, TFLite o NumPy)
+en lotes grandes y genera, en una sola ejecución:
+    - precisión / recall / F1 por clase y matriz de confusión
+    - histograma de confianza (aciertos vs fallos)
+    - barrido de umbral de confianza (cobertura y precisión), marcando el
+      0.6 que usa handle_process_frame
+    - throughput de inferencia a varios tamaños de lote
+Escribe un informe JSON y las gráficas PNG (como las de models_professional/plots).
+
+Uso:
+    python ml/evaluar_modelo.py --data captured_data
+    python ml/evaluar_modelo.py --model ml/models_professional/modelo_int8.tflite --output informe_int8
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_utils import DEFAULT_DATA_DIR, load_feature_dataset
+from model_bundle import ModelBundle, default_model_path, DEFAULT_SCALER_PATH, DEFAULT_ENCODER_PATH
+
+SERVING_THRESHOLD = 0.6  # Umbral de confianza de handle_process_frame
+
+def confusion_matrix(labels, predicted, n_classes):
+    """Matriz de confusión (reales × predichas) sin bucles"""
+    matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+    np.add.at(matrix, (labels, predicted), 1)
+    return matrix
+
+def per_class_metrics(matrix, classes):
+    """Precisión, recall, F1 y soporte por clase a partir de la matriz"""
+    true_positives = np.diag(matrix).astype(np.float64)
+    predicted = matrix.sum(axis=0)
+    support = matrix.sum(axis=1)
+    precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+    recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall,
+                   out=np.zeros_like(precision), where=(precision + recall) > 0)
+    return [{'class': str(label), 'precision': float(p), 'recall': float(r), 'f1': float(f), 'support': int(s)}
+            for label, p, r, f, s in zip(classes, precision, recall, f1, support)]
+
+def threshold_sweep(correct, confidences, thresholds):
+    """Cobertura (fracción aceptada) y precisión de las aceptadas para cada umbral"""
+    accepted = confidences[None, :] >= thresholds[:, None]          # (T, S)
+    coverage = accepted.mean(axis=1)
+    hits = (accepted & correct[None, :]).sum(axis=1)
+    accuracy = np.divide(hits, accepted.sum(axis=1), out=np.zeros(len(thresholds)),
+                         where=accepted.sum(axis=1) > 0)
+    return [{'threshold': float(t), 'coverage': float(c), 'accuracy': float(a)}
+            for t, c, a in zip(thresholds, coverage, accuracy)]
+
+def measure_throughput(bundle, batch_sizes, repeats):
+    """Filas por segundo de la inferencia cruda a cada tamaño de lote"""
+    results = []
+    for batch_size in batch_sizes:
+        latency_ms = bundle.measure_latency(batch_size, repeats)
+        results.append({'batch_size': batch_size, 'latency_ms': latency_ms,
+                        'rows_per_s': batch_size / (latency_ms / 1000)})
+    return results
+
+def save_plots(output_dir, matrix, classes, correct, confidences, sweep):
+    """Gráficas PNG de la evaluación"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # Matriz de confusión normalizada por fila
+    normalized = matrix / np.maximum(matrix.sum(axis=1, keepdims=True), 1)
+    fig, ax = plt.subplots(figsize=(max(8, len(classes) * 0.25), max(7, len(classes) * 0.25)))
+    ax.imshow(normalized, cmap='Blues', vmin=0, vmax=1)
+    ax.set_xticks(range(len(classes)))
+    ax.set_yticks(range(len(classes)))
+    ax.set_xticklabels(classes, rotation=90, fontsize=6)
+    ax.set_yticklabels(classes, fontsize=6)
+    ax.set_xlabel('Predicha')
+    ax.set_ylabel('Real')
+    ax.set_title('Matriz de confusión')
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'confusion_matrix.png'), dpi=150)
+    plt.close(fig)
+
+    # Histograma de confianza
+    fig, ax = plt.subplots(figsize=(8, 5))
+    bins = np.linspace(0, 1, 41)
+    ax.hist(confidences[correct], bins=bins, alpha=0.7, label='Aciertos')
+    ax.hist(confidences[~correct], bins=bins, alpha=0.7, label='Fallos')
+    ax.axvline(SERVING_THRESHOLD, color='red', linestyle='--', label=f'Umbral {SERVING_THRESHOLD}')
+    ax.set_xlabel('Confianza')
+    ax.set_ylabel('Muestras')
+    ax.set_title('Histograma de confianza')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'confidence_histogram.png'), dpi=150)
+    plt.close(fig)
+
+    # Barrido de umbral
+    thresholds = [row['threshold'] for row in sweep]
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(thresholds, [row['coverage'] for row in sweep], label='Cobertura')
+    ax.plot(thresholds, [row['accuracy'] for row in sweep], label='Precisión de las aceptadas')
+    ax.axvline(SERVING_THRESHOLD, color='red', linestyle='--', label=f'Umbral {SERVING_THRESHOLD}')
+    ax.set_xlabel('Umbral de confianza')
+    ax.set_title('Barrido de umbral')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'threshold_sweep.png'), dpi=150)
+    plt.close(fig)
+
+def evaluate(bundle, dataset, batch_size):
+    """
+    Evalúa un bundle sobre un FeatureDataset
+
+    Returns:
+        dict: accuracy, métricas, matriz y arrays auxiliares
+    """
+    start = time.perf_counter()
+    probabilities = bundle.predict_dataset(dataset, batch_size)
+    elapsed = time.perf_counter() - start
+
+    predicted, confidences = dataset.best_rows(probabilities)
+    correct = predicted == dataset.labels
+    return {
+        'accuracy': float(correct.mean()) if len(correct) else 0.0,
+        'predicted': predicted,
+        'confidences': confidences,
+        'correct': correct,
+        'dataset_seconds': elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluación offline de precisión y throughput')
+    parser.add_argument('--model', default=default_model_path(), help='Modelo .h5/.keras/.tflite/.npz')
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH)
+    parser.add_argument('--encoder', default=DEFAULT_ENCODER_PATH)
+    parser.add_argument('--features', help='Pipeline de features (por defecto, modelo.features.json)')
+    parser.add_argument('--data', default=DEFAULT_DATA_DIR, help='Carpeta con las muestras capturadas')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--throughput-batches', default='1,8,64,512,4096')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--output', default='evaluacion', help='Carpeta para el informe y las gráficas')
+    parser.add_argument('--no-plots', action='store_true')
+    args = parser.parse_args()
+
+    bundle = ModelBundle(args.model, args.scaler, args.encoder, args.features)
+    print(f"📥 Modelo: {os.path.basename(args.model)} ({bundle.kind}, {bundle.size_bytes / 1024:.0f} KB, "
+          f"carga {bundle.load_time_s:.2f}s, entrada {bundle.input_features}, pipeline {bundle.pipeline.version})")
+
+    dataset = load_feature_dataset(args.data, bundle.input_features, bundle.classes, bundle.pipeline)
+    print(f"📁 Muestras: {len(dataset)} ({len(dataset.features)} filas), descartadas: {dataset.skipped}")
+    if not len(dataset):
+        raise SystemExit("❌ No hay muestras evaluables")
+
+    result = evaluate(bundle, dataset, args.batch_size)
+    matrix = confusion_matrix(dataset.labels, result['predicted'], len(bundle.classes))
+    metrics = per_class_metrics(matrix, bundle.classes)
+    sweep = threshold_sweep(result['correct'], result['confidences'], np.round(np.arange(0.3, 1.0, 0.05), 2))
+    throughput = measure_throughput(bundle, [int(v) for v in args.throughput_batches.split(',')], args.repeats)
+
+    print(f"\n🎯 Accuracy: {result['accuracy']:.2%} "
+          f"({len(dataset) / result['dataset_seconds']:.0f} muestras/s en lotes de {args.batch_size})")
+    print(f"{'clase':>10} {'precisión':>10} {'recall':>8} {'f1':>6} {'n':>5}")
+    for row in metrics:
+        if row['support']:
+            print(f"{row['class']:>10} {row['precision']:>10.2%} {row['recall']:>8.2%} "
+                  f"{row['f1']:>6.2f} {row['support']:>5}")
+
+    print(f"\n{'umbral':>7} {'cobertura':>10} {'precisión':>10}")
+    for row in sweep:
+        marker = '  ← servidor' if abs(row['threshold'] - SERVING_THRESHOLD) < 1e-6 else ''
+        print(f"{row['threshold']:>7.2f} {row['coverage']:>10.2%} {row['accuracy']:>10.2%}{marker}")
+
+    print(f"\n{'lote':>6} {'ms/llamada':>11} {'filas/s':>10}")
+    for row in throughput:
+        print(f"{row['batch_size']:>6} {row['latency_ms']:>11.3f} {row['rows_per_s']:>10.0f}")
+
+    os.makedirs(args.output, exist_ok=True)
+    report = {
+        'model': args.model,
+        'kind': bundle.kind,
+        'feature_pipeline': bundle.pipeline.to_metadata(),
+        'size_bytes': bundle.size_bytes,
+        'load_time_s': bundle.load_time_s,
+        'samples': len(dataset),
+        'skipped': dataset.skipped,
+        'accuracy': result['accuracy'],
+        'per_class': metrics,
+        'confusion_matrix': matrix.tolist(),
+        'classes': [str(c) for c in bundle.classes],
+        'threshold_sweep': sweep,
+        'throughput': throughput
+    }
+    with open(os.path.join(args.output, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if not args.no_plots:
+        save_plots(args.output, matrix, [str(c) for c in bundle.classes],
+                   result['correct'], result['confidences'], sweep)
+    print(f"\n✅ Informe guardado en: {args.output}")
+
+if __name__ == '__main__':
+    main()
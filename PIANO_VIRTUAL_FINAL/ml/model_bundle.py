@@ -0,0 +1,161 @@
+"""
+Carga uniforme de modelos para evaluación offline
+model_bundle.py - Keras (.h5/.keras), TFLite (.tflite) o NumPy (.npz) + scaler + encoder + pipeline
+
+Un bundle expone siempre la misma interfaz que usa el servidor:
+normalizar con el scaler, anular las manos ausentes con la máscara y
+devolver las probabilidades de la cabeza de notas.
+
+Formato .npz: arrays W0, b0, W1, b1, ... de una red densa con ReLU en las
+capas ocultas y softmax a la salida.
+"""
+
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.features_utils import select_note_head
+from utils.feature_pipeline import load_pipeline, pipeline_path_for, check_compatibility
+
+PROFESSIONAL_MODEL_DIR = os.path.join(BASE_DIR, 'ml', 'models_professional')
+DEFAULT_SCALER_PATH = os.path.join(PROFESSIONAL_MODEL_DIR, 'scaler_professional.pkl')
+DEFAULT_ENCODER_PATH = os.path.join(PROFESSIONAL_MODEL_DIR, 'encoder_professional.pkl')
+
+def default_model_path():
+    """Mismo modelo que carga app.py (fine-tuned si existe)"""
+    finetuned = os.path.join(PROFESSIONAL_MODEL_DIR, 'piano_finetuned_model.h5')
+    if os.path.exists(finetuned):
+        return finetuned
+    return os.path.join(PROFESSIONAL_MODEL_DIR, 'piano_professional_model.h5')
+
+class ModelBundle:
+    """Modelo + scaler + encoder + pipeline de features con una interfaz de predicción por lotes"""
+
+    def __init__(self, model_path, scaler_path=DEFAULT_SCALER_PATH, encoder_path=DEFAULT_ENCODER_PATH,
+                 pipeline_path=None):
+        self.model_path = model_path
+        self.kind = os.path.splitext(model_path)[1].lower().lstrip('.')
+
+        start = time.perf_counter()
+        self.scaler = joblib.load(scaler_path)
+        self.label_encoder = joblib.load(encoder_path)
+        self.classes = list(self.label_encoder.classes_)
+        # Pipeline de features del modelo (por defecto, el archivo .features.json a su lado)
+        self.pipeline = load_pipeline(pipeline_path or pipeline_path_for(model_path))
+
+        if self.kind in ('h5', 'keras'):
+            self._load_keras()
+        elif self.kind == 'tflite':
+            self._load_tflite()
+        elif self.kind == 'npz':
+            self._load_numpy()
+        else:
+            raise ValueError(f"Formato de modelo no soportado: {model_path}")
+        self.load_time_s = time.perf_counter() - start
+
+        # Versión o dimensiones del pipeline distintas a las del modelo: error al cargar, no al predecir
+        check_compatibility(self.pipeline, self.input_features, self.scaler)
+
+    @property
+    def size_bytes(self):
+        """Tamaño del archivo del modelo"""
+        return os.path.getsize(self.model_path)
+
+    def _load_keras(self):
+        import tensorflow as tf
+        self.model = tf.keras.models.load_model(self.model_path, compile=False)
+        input_shape = self.model.input_shape
+        if isinstance(input_shape, list):
+            input_shape = input_shape[0]
+        self.input_features = int(input_shape[-1])
+
+    def _load_tflite(self):
+        import tensorflow as tf
+        self.interpreter = tf.lite.Interpreter(model_path=self.model_path)
+        self.interpreter.allocate_tensors()
+        self.input_detail = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()
+        self.input_features = int(self.input_detail['shape'][-1])
+        self.batch_size = None
+
+    def _load_numpy(self):
+        weights = np.load(self.model_path)
+        n_layers = len([key for key in weights.files if key.startswith('W')])
+        self.layers = [(weights[f'W{i}'], weights[f'b{i}']) for i in range(n_layers)]
+        self.input_features = int(self.layers[0][0].shape[0])
+
+    def normalize(self, features, mask):
+        """Normaliza con el scaler; las manos ausentes quedan en 0 (la media)"""
+        normalized = self.scaler.transform(features)
+        return np.where(mask, normalized, 0.0).astype(np.float32)
+
+    def predict_normalized(self, inputs):
+        """Probabilidades (N, clases) para entradas ya normalizadas"""
+        if self.kind in ('h5', 'keras'):
+            raw = self.model.predict_on_batch(inputs)
+        elif self.kind == 'tflite':
+            raw = self._predict_tflite(inputs)
+        else:
+            raw = inputs
+            for i, (weights, bias) in enumerate(self.layers):
+                raw = raw @ weights + bias
+                if i < len(self.layers) - 1:
+                    np.maximum(raw, 0.0, out=raw)
+            raw = np.exp(raw - raw.max(axis=1, keepdims=True))
+            raw /= raw.sum(axis=1, keepdims=True)
+        return select_note_head(raw, len(self.classes))
+
+    def _predict_tflite(self, inputs):
+        """TFLite: redimensiona la entrada al tamaño del lote si hace falta"""
+        if self.batch_size != len(inputs):
+            self.interpreter.resize_tensor_input(self.input_detail['index'], [len(inputs), self.input_features])
+            self.interpreter.allocate_tensors()
+            self.input_detail = self.interpreter.get_input_details()[0]
+            self.output_details = self.interpreter.get_output_details()
+            self.batch_size = len(inputs)
+
+        scale, zero_point = self.input_detail.get('quantization', (0.0, 0))
+        if self.input_detail['dtype'] != np.float32 and scale:
+            inputs = np.round(inputs / scale + zero_point).astype(self.input_detail['dtype'])
+        self.interpreter.set_tensor(self.input_detail['index'], inputs)
+        self.interpreter.invoke()
+
+        outputs = []
+        for detail in self.output_details:
+            output = self.interpreter.get_tensor(detail['index'])
+            scale, zero_point = detail.get('quantization', (0.0, 0))
+            if detail['dtype'] != np.float32 and scale:
+                output = (output.astype(np.float32) - zero_point) * scale
+            outputs.append(output)
+        return outputs if len(outputs) > 1 else outputs[0]
+
+    def predict(self, features, mask):
+        """Probabilidades (N, clases) a partir de features crudas y su máscara"""
+        return self.predict_normalized(self.normalize(features, mask))
+
+    def predict_dataset(self, dataset, batch_size=4096):
+        """
+        Predice todas las filas de un FeatureDataset por lotes
+
+        Returns:
+            numpy.ndarray: (R, clases) probabilidades por fila
+        """
+        outputs = [self.predict(features, mask) for features, mask in dataset.iter_batches(batch_size)]
+        if not outputs:
+            return np.zeros((0, len(self.classes)), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def measure_latency(self, batch_size, repeats=50):
+        """Latencia media (ms) de una llamada con un lote de `batch_size` filas normalizadas"""
+        inputs = np.random.default_rng(0).normal(size=(batch_size, self.input_features)).astype(np.float32)
+        self.predict_normalized(inputs)  # Calentamiento
+        start = time.perf_counter()
+        for _ in range(repeats):
+            self.predict_normalized(inputs)
+        return (time.perf_counter() - start) / repeats * 1000
@@ -0,0 +1,85 @@
+// Piano Virtual Invisible - Audio en el navegador AUDIO_CLIENT.JS
+// Precarga los samples del servidor y reproduce los eventos note_on localmente
+
+const audioClient = {
+    context: null,
+    buffers: {},           // sample_id -> AudioBuffer
+    jitterBufferMs: 30,    // Retardo para absorber el jitter de la red
+    lastServerTime: null,  // server_time del último evento
+    lastPlayTime: 0,       // Instante (AudioContext) del último evento
+    ready: false
+};
+
+// Cargar manifiesto y decodificar todos los samples
+async function initAudioClient() {
+    try {
+        const response = await fetch('/api/samples');
+        const manifest = await response.json();
+
+        if (manifest.audio_output === 'server') {
+            console.log('🔈 Audio en modo servidor - caché del navegador desactivada');
+            return;
+        }
+
+        audioClient.context = new (window.AudioContext || window.webkitAudioContext)();
+        audioClient.jitterBufferMs = manifest.jitter_buffer_ms;
+
+        const loads = Object.entries(manifest.samples).map(async ([sampleId, sample]) => {
+            const data = await fetch(sample.url).then(r => r.arrayBuffer());
+            audioClient.buffers[sampleId] = await audioClient.context.decodeAudioData(data);
+        });
+        await Promise.all(loads);
+
+        audioClient.ready = true;
+        console.log(`🎼 ${Object.keys(audioClient.buffers).length} samples precargados (jitter buffer ${audioClient.jitterBufferMs} ms)`);
+    } catch (error) {
+        console.error('Error inicializando audio del navegador:', error);
+    }
+}
+
+// Reproducir un evento note_on del servidor
+function playNoteEvent(event) {
+    if (!audioClient.ready || !event) return;
+
+    const ctx = audioClient.context;
+    const buffer = audioClient.buffers[event.sample_id];
+    if (!buffer) return;
+
+    // Los navegadores suspenden el AudioContext hasta una interacción del usuario
+    if (ctx.state === 'suspended') {
+        ctx.resume();
+    }
+
+    // Jitter buffer: conservar el espaciado original entre notas del servidor
+    // sin superar el retardo configurado
+    const now = ctx.currentTime;
+    const maxDelay = audioClient.jitterBufferMs / 1000;
+    let playAt = now + maxDelay;
+    if (audioClient.lastServerTime !== null) {
+        const spacing = (event.server_time - audioClient.lastServerTime) / 1000;
+        const spaced = audioClient.lastPlayTime + spacing;
+        playAt = Math.min(Math.max(spaced, now), now + maxDelay);
+    }
+    audioClient.lastServerTime = event.server_time;
+    audioClient.lastPlayTime = playAt;
+
+    const source = ctx.createBufferSource();
+    const gain = ctx.createGain();
+    gain.gain.value = event.velocity !== undefined ? event.velocity : 1.0;
+    source.buffer = buffer;
+    source.connect(gain).connect(ctx.destination);
+    source.start(playAt);
+}
+
+// Ajustar el jitter buffer en tiempo de ejecución
+function setJitterBuffer(ms) {
+    audioClient.jitterBufferMs = Math.max(0, ms);
+}
+
+document.addEventListener('DOMContentLoaded', initAudioClient);
+
+// Hacer funciones disponibles globalmente
+window.playNoteEvent = playNoteEvent;
+window.setJitterBuffer = setJitterBuffer;
+
+console.log("🔈 Audio_client.js cargado correctamente");
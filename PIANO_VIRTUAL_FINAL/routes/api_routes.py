@@ -2,47 +2,52 @@
 Rutas API para el Piano Virtual Invisible
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 import os
 
-def register_api_routes(app):
-    """Registra rutas API en la aplicación Flask"""
-    
+from utils.audio_utils import play_note_async
+from utils.notes_catalog import get_notes_catalog
+
+def register_api_routes(app, audio_dir=None, note_output=None):
+    """
+    Registra rutas API en la aplicación Flask
+
+    Args:
+        app: Aplicación Flask
+        audio_dir: Carpeta raíz de los samples (octavaN/)
+        note_output: Función (nota, velocidad) -> (éxito, evento note_on o None);
+            app.py pasa output_note para usar la misma salida que el socket
+    """
+
     api_bp = Blueprint('api', __name__, url_prefix='/api')
-    
+
+    AUDIO_DIR = audio_dir or os.path.join(app.root_path, 'dataset', 'dataset_audio')
+    notes_catalog = get_notes_catalog(AUDIO_DIR)
+
+    def engine_output(note, velocity=1.0):
+        """Salida por defecto: motor de audio del servidor"""
+        audio_path = os.path.join(AUDIO_DIR, f"octava{note[-1]}")
+        return play_note_async(note, audio_path, velocity=velocity), None
+
+    output = note_output or engine_output
+
     @api_bp.route('/notes', methods=['GET'])
     def get_notes():
-        """Obtiene la lista de notas disponibles"""
-        from public.utils.audio_utils import get_available_notes
-        
-        notes = []
-        AUDIO_DIR = os.path.join(app.root_path, 'dataset', 'dataset_audio')
-        
-        for octave in range(2, 7):  # Octavas 2-6
-            octave_dir = os.path.join(AUDIO_DIR, f"octava{octave}")
-            if os.path.exists(octave_dir):
-                octave_notes = [os.path.splitext(f)[0] for f in os.listdir(octave_dir) if f.endswith('.wav')]
-                notes.extend(octave_notes)
-        
-        return jsonify({'notes': sorted(notes)})
-    
+        """Obtiene la lista de notas disponibles (con ETag / Last-Modified)"""
+        return notes_catalog.json_response(request)
+
     @api_bp.route('/play-note/<note>', methods=['GET'])
     def play_note_endpoint(note):
-        """Reproduce una nota musical"""
-        from public.utils.audio_utils import play_note
-        
-        AUDIO_DIR = os.path.join(app.root_path, 'dataset', 'dataset_audio')
-        
-        # Extraer octava
+        """Reproduce una nota musical (misma salida que el evento play_note)"""
+        # La salida decide si la nota existe: el banco de notas también sintetiza
+        # las que no tienen archivo en el catálogo
         if note and note[-1].isdigit():
-            octave = note[-1]
-            octave_dir = f"octava{octave}"
-            audio_path = os.path.join(AUDIO_DIR, octave_dir)
-            success = play_note(note, audio_path)
-            
+            velocity = request.args.get('velocity', 1.0, type=float)
+            success, note_event = output(note, velocity)
+
             if success:
-                return jsonify({'status': 'success', 'note': note})
-        
+                return jsonify({'status': 'success', 'note': note, 'note_on': note_event})
+
         return jsonify({'status': 'error', 'message': f'No se pudo reproducir la nota {note}'}), 404
-    
-    app.register_blueprint(api_bp)
\ No newline at end of file
+
+    app.register_blueprint(api_bp)
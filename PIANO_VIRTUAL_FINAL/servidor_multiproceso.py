@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Piano Virtual Invisible - Despliegue Multi-Proceso
+--------------------------------------------------
+Lanza N procesos de app.py (uno por núcleo) detrás de un balanceador TCP con
+sesiones pegajosas. Los workers comparten una cola de mensajes de Socket.IO,
+así que `emit(..., broadcast=True)` llega a los clientes de todos los workers.
+
+Uso:
+    python servidor_multiproceso.py --workers 4
+    python servidor_multiproceso.py --workers 4 --message-queue redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from utils.broker_utils import LocalBroker, parse_broker_url
+
+def start_workers(n_workers, base_port, message_queue, async_mode):
+    """Inicia los procesos worker, cada uno en su propio puerto"""
+    workers = []
+    for i in range(n_workers):
+        port = base_port + i
+        env = dict(os.environ,
+                   PIANO_HOST='127.0.0.1',
+                   PIANO_PORT=str(port),
+                   PIANO_ASYNC_MODE=async_mode,
+                   PIANO_MESSAGE_QUEUE=message_queue)
+        process = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'app.py')], env=env)
+        workers.append((port, process))
+        print(f"🚀 Worker {i + 1}/{n_workers} iniciado en puerto {port} (pid {process.pid})")
+    return workers
+
+def wait_for_workers(workers, timeout):
+    """
+    Espera a que cada worker acepte conexiones en su puerto
+
+    app.py solo abre el puerto tras cargar TensorFlow, MediaPipe y los
+    modelos, así que un puerto abierto indica que el worker está listo.
+
+    Returns:
+        list: Puertos listos (los workers que terminaron o no llegaron a
+            tiempo se excluyen del balanceo)
+    """
+    deadline = time.time() + timeout
+    pending = dict(workers)
+    ready = []
+    while pending and time.time() < deadline:
+        for port, process in list(pending.items()):
+            if process.poll() is not None:
+                print(f"❌ El worker del puerto {port} terminó (código {process.returncode})")
+                del pending[port]
+                continue
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                    pass
+            except OSError:
+                continue
+            print(f"✅ Worker del puerto {port} listo")
+            ready.append(port)
+            del pending[port]
+        if pending:
+            time.sleep(0.5)
+    for port in pending:
+        print(f"⚠️ El worker del puerto {port} no respondió en {timeout:.0f}s; queda fuera del balanceo")
+    return sorted(ready)
+
+def pick_worker(ports, key):
+    """Asigna siempre la misma clave al mismo worker (hash estable)"""
+    digest = hashlib.md5(key.encode('utf-8')).digest()
+    return ports[int.from_bytes(digest[:4], 'big') % len(ports)]
+
+async def pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+def make_proxy_handler(ports, sticky):
+    """
+    Crea el manejador del balanceador
+
+    sticky='ip': todas las conexiones de una IP van al mismo worker
+    (necesario con el transporte long-polling de Socket.IO).
+    sticky='conexion': cada conexión TCP se asigna por separado
+    (válido solo si los clientes usan transports=['websocket']).
+    """
+    counter = {'next': 0}
+
+    async def handle(client_reader, client_writer):
+        peer = client_writer.get_extra_info('peername') or ('desconocido', 0)
+        if sticky == 'ip':
+            port = pick_worker(ports, peer[0])
+        else:
+            port = ports[counter['next'] % len(ports)]
+            counter['next'] += 1
+        try:
+            worker_reader, worker_writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(pipe(client_reader, worker_writer), pipe(worker_reader, client_writer))
+
+    return handle
+
+async def run_proxy(host, port, ports, sticky):
+    server = await asyncio.start_server(make_proxy_handler(ports, sticky), host, port)
+    print(f"🌐 Balanceador en http://{host}:{port} → workers {ports} (sticky: {sticky})")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Piano Virtual multi-proceso')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000, help='Puerto público del balanceador')
+    parser.add_argument('--worker-base-port', type=int, default=5101)
+    parser.add_argument('--message-queue', default='local://127.0.0.1:6380',
+                        help='redis://... o local://host:puerto (broker integrado)')
+    parser.add_argument('--async-mode', default='eventlet', choices=['eventlet', 'gevent', 'threading'])
+    parser.add_argument('--sticky', default='ip', choices=['ip', 'conexion'])
+    parser.add_argument('--ready-timeout', type=float, default=120,
+                        help='Segundos máximos de espera a que cada worker cargue los modelos')
+    args = parser.parse_args()
+
+    broker = None
+    if args.message_queue.startswith('local://'):
+        broker = LocalBroker(parse_broker_url(args.message_queue)).start()
+
+    workers = start_workers(args.workers, args.worker_base_port, args.message_queue, args.async_mode)
+
+    def shutdown(*_):
+        print("\n⏹️ Deteniendo workers...")
+        for _, process in workers:
+            process.terminate()
+        for _, process in workers:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if broker:
+            broker.stop()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    # Aceptar tráfico solo cuando los workers han cargado los modelos
+    try:
+        ports = wait_for_workers(workers, args.ready_timeout)
+    except KeyboardInterrupt:
+        shutdown()
+    if not ports:
+        print("❌ Ningún worker está listo")
+        shutdown()
+    try:
+        asyncio.run(run_proxy(args.host, args.port, ports, args.sticky))
+    except KeyboardInterrupt:
+        shutdown()
+
+if __name__ == '__main__':
+    main()
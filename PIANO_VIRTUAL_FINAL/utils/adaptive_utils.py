@@ -0,0 +1,83 @@
+"""
+Control adaptativo de resolución, calidad JPEG y FPS por cliente
+adaptive_utils.py - Lazo cerrado entre la latencia del servidor y el cliente
+
+El servidor devuelve en cada frame_processed unas indicaciones ('hints')
+que el cliente aplica al siguiente envío:
+    - width: ancho del frame; MediaPipe necesita ~256 px alrededor de la mano,
+      así que si la mano aparece grande se puede reducir la resolución
+    - quality: calidad JPEG
+    - fps: frames por segundo, para que el coste por cliente no supere el presupuesto
+"""
+
+MIN_WIDTH = 320
+MAX_WIDTH = 1280
+MIN_FPS = 8
+MAX_FPS = 30
+MIN_QUALITY = 0.5
+MAX_QUALITY = 0.8
+
+class AdaptiveController:
+    """Controlador por sesión que mantiene la CPU del cliente bajo un presupuesto"""
+
+    def __init__(self, cpu_budget_ms=250.0, hand_target_px=256, smoothing=0.2):
+        self.cpu_budget_ms = cpu_budget_ms    # ms de CPU por segundo de vídeo
+        self.hand_target_px = hand_target_px  # tamaño de mano deseado en el frame
+        self.smoothing = smoothing
+
+        self.processing_ms = None  # EWMA del tiempo de proceso
+        self.detection_rate = 1.0  # EWMA de frames con mano detectada
+        self.width = 640
+        self.quality = MAX_QUALITY
+        self.fps = 15
+
+    def update(self, processing_ms, frame_width, hand_size_px=None):
+        """
+        Actualiza el controlador con el último frame
+
+        Args:
+            processing_ms: Tiempo de proceso del frame en el servidor
+            frame_width: Ancho del frame recibido
+            hand_size_px: Lado mayor del bounding box de la mano (px) o None
+
+        Returns:
+            dict: Hints para el cliente (width, quality, fps)
+        """
+        a = self.smoothing
+        if self.processing_ms is None:
+            self.processing_ms = processing_ms
+        else:
+            self.processing_ms += a * (processing_ms - self.processing_ms)
+        detected = 1.0 if hand_size_px else 0.0
+        self.detection_rate += a * (detected - self.detection_rate)
+
+        # Resolución: ajustar para que la mano mida ~hand_target_px (con margen)
+        if hand_size_px:
+            scale = (self.hand_target_px * 1.5) / hand_size_px
+            desired = frame_width * scale
+            self.width += a * (desired - self.width)
+        elif self.detection_rate < 0.5:
+            # Se pierde la mano: volver a subir la resolución
+            self.width *= 1.15
+        self.width = min(max(self.width, MIN_WIDTH), MAX_WIDTH)
+
+        # FPS: coste por segundo = ms por frame × fps <= presupuesto
+        budget_fps = self.cpu_budget_ms / max(self.processing_ms, 1e-3)
+        self.fps = min(max(budget_fps, MIN_FPS), MAX_FPS)
+
+        # Calidad JPEG: bajar solo si ni con MIN_FPS se cumple el presupuesto
+        load = self.processing_ms * self.fps / self.cpu_budget_ms
+        if load > 1.0:
+            self.quality = max(MIN_QUALITY, self.quality - 0.05)
+        elif load < 0.7:
+            self.quality = min(MAX_QUALITY, self.quality + 0.02)
+
+        return self.get_hints()
+
+    def get_hints(self):
+        """Hints actuales para el cliente"""
+        return {
+            'width': int(round(self.width / 16) * 16),
+            'quality': round(self.quality, 2),
+            'fps': int(round(self.fps))
+        }
@@ -0,0 +1,196 @@
+"""
+Motor de audio de baja latencia para el Piano Virtual
+audio_engine.py - Un solo hilo de audio alimentado por una cola de eventos
+
+Los handlers de Socket.IO solo encolan eventos (note_on / note_off); el hilo
+del motor asigna voces (canales de pygame), roba la voz más antigua cuando
+no quedan libres y aplica fades de release.
+
+Los eventos llegan desde hilos reales (run_cpu_bound) incluso en modo
+eventlet/gevent, así que el hilo, la señal de despertar y el lock son
+primitivas nativas (native_threading), no las parcheadas de `threading`.
+"""
+
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from utils.native_threading import NativeEvent, NativeThread, allocate_lock
+
+class AudioEngine:
+    """Motor de audio con asignación de voces y sonda de latencia"""
+
+    def __init__(self, num_voices=16, release_ms=80, volume=1.0, note_bank=None):
+        self.num_voices = num_voices
+        self.release_ms = release_ms
+        self.volume = volume
+        self.note_bank = note_bank  # NoteBank precargado (búsqueda O(1))
+
+        # Cola de eventos: deque.append/popleft son atómicos (sin locks)
+        self.events = deque()
+        self.wakeup = NativeEvent()
+
+        self.sounds = {}         # ruta -> pygame.mixer.Sound
+        self.channels = []
+        self.voice_notes = []    # nota asignada a cada canal
+        self.voice_started = []  # instante de inicio de cada voz
+
+        # Sonda de latencia: encolado -> inicio en el mixer (segundos)
+        self.latencies = deque(maxlen=1000)
+        self.voices_stolen = 0
+
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Configura las voces del mixer e inicia el hilo del motor"""
+        if self.running:
+            return self
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        pygame.mixer.set_num_channels(self.num_voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.num_voices)]
+        self.voice_notes = [None] * self.num_voices
+        self.voice_started = [0.0] * self.num_voices
+
+        self.running = True
+        self.thread = NativeThread(self._run).start()
+        print(f"🎛️ Motor de audio iniciado: {self.num_voices} voces, release {self.release_ms} ms")
+        return self
+
+    def stop(self):
+        """Detiene el hilo del motor"""
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def note_on(self, note, audio_dir, velocity=1.0):
+        """
+        Encola una nota para reproducir
+
+        Args:
+            note: Nota a reproducir (ej. "DO4")
+            audio_dir: Directorio de la octava con los archivos de audio
+            velocity: Intensidad 0-1
+
+        Returns:
+            bool: True si existe el sample y la nota quedó encolada
+        """
+        # Banco en memoria: sin acceso a disco
+        sound = self.note_bank.get(note) if self.note_bank is not None else None
+        if sound is None:
+            sound = find_note_file(note, audio_dir)
+        if sound is None:
+            print(f"⚠️ No se encontró archivo de audio para {note} en {audio_dir}")
+            return False
+        self.events.append(('on', note, sound, velocity, time.perf_counter()))
+        self.wakeup.set()
+        return True
+
+    def note_off(self, note):
+        """Encola el release de una nota"""
+        self.events.append(('off', note, None, 0.0, time.perf_counter()))
+        self.wakeup.set()
+
+    def get_latency_stats(self):
+        """
+        Estadísticas de latencia encolado -> mixer
+
+        Returns:
+            dict: Número de muestras y percentiles en milisegundos
+        """
+        if not self.latencies:
+            return {'count': 0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0,
+                    'voices_stolen': self.voices_stolen}
+        values = np.array(self.latencies) * 1000
+        p50, p99 = np.percentile(values, [50, 99])
+        return {'count': int(values.size), 'p50_ms': float(p50), 'p99_ms': float(p99),
+                'max_ms': float(values.max()), 'voices_stolen': self.voices_stolen}
+
+    def _run(self):
+        while self.running:
+            self.wakeup.wait(timeout=0.5)
+            self.wakeup.clear()
+            while self.events:
+                kind, note, sound, velocity, enqueued = self.events.popleft()
+                try:
+                    if kind == 'on':
+                        self._start_voice(note, sound, velocity, enqueued)
+                    else:
+                        self._release_voice(note)
+                except Exception as e:
+                    print(f"Error en motor de audio ({note}): {e}")
+
+    def _start_voice(self, note, sound, velocity, enqueued):
+        if isinstance(sound, str):
+            # Ruta de archivo (sin banco): cargar una vez y cachear
+            sound_path = sound
+            sound = self.sounds.get(sound_path)
+            if sound is None:
+                sound = pygame.mixer.Sound(sound_path)
+                self.sounds[sound_path] = sound
+
+        index = self._allocate_voice()
+        channel = self.channels[index]
+        channel.set_volume(max(0.0, min(1.0, velocity * self.volume)))
+        channel.play(sound)
+        now = time.perf_counter()
+        self.voice_notes[index] = note
+        self.voice_started[index] = now
+        self.latencies.append(now - enqueued)
+
+    def _allocate_voice(self):
+        # Primero una voz libre
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+        # Si no hay, robar la más antigua
+        oldest = int(np.argmin(self.voice_started))
+        self.channels[oldest].stop()
+        self.voices_stolen += 1
+        return oldest
+
+    def _release_voice(self, note):
+        for i, channel in enumerate(self.channels):
+            if self.voice_notes[i] == note and channel.get_busy():
+                channel.fadeout(self.release_ms)
+                self.voice_notes[i] = None
+
+def find_note_file(note, audio_dir):
+    """
+    Busca el archivo de audio de una nota
+
+    Args:
+        note: Nota (ej. "DO4")
+        audio_dir: Directorio de la octava
+
+    Returns:
+        str: Ruta del archivo o None
+    """
+    note_path = os.path.join(audio_dir, f"{note}.wav")
+    if os.path.exists(note_path):
+        return note_path
+    if os.path.isdir(audio_dir):
+        for file in os.listdir(audio_dir):
+            if file.lower() == f"{note.lower()}.wav":
+                return os.path.join(audio_dir, file)
+    return None
+
+# Instancia compartida del motor
+_engine = None
+_engine_lock = allocate_lock()
+
+def get_audio_engine(num_voices=16, release_ms=80, note_bank=None):
+    """Obtiene (e inicia si hace falta) el motor de audio compartido"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioEngine(num_voices=num_voices, release_ms=release_ms,
+                                  note_bank=note_bank).start()
+        elif note_bank is not None:
+            _engine.note_bank = note_bank
+        return _engine
@@ -4,7 +4,9 @@ Utilidades para manejo de audio en el Piano Virtual
 
 import os
 import pygame
-import threading
+
+from utils.audio_engine import find_note_file, get_audio_engine
+from utils.notes_catalog import get_notes_catalog
 
 def play_note(note, audio_dir):
     """
@@ -18,20 +20,8 @@ def play_note(note, audio_dir):
         bool: True si se reproduce correctamente
     """
     try:
-        # Buscar el archivo de audio
-        sound_path = None
-        
-        # Primero buscar directamente en el directorio de octava
-        note_path = os.path.join(audio_dir, f"{note}.wav")
-        if os.path.exists(note_path):
-            sound_path = note_path
-        
-        # Si no se encuentra, buscar sin importar mayúsculas/minúsculas
-        if not sound_path:
-            for file in os.listdir(audio_dir):
-                if file.lower() == f"{note.lower()}.wav":
-                    sound_path = os.path.join(audio_dir, file)
-                    break
+        # Buscar el archivo de audio (también sin importar mayúsculas/minúsculas)
+        sound_path = find_note_file(note, audio_dir)
         
         # Reproducir sonido
         if sound_path and os.path.exists(sound_path):
@@ -47,27 +37,28 @@ def play_note(note, audio_dir):
         print(f"Error reproduciendo {note}: {e}")
         return False
 
-def play_note_async(note, audio_dir):
-    """Reproduce una nota en un hilo separado"""
-    thread = threading.Thread(target=lambda: play_note(note, audio_dir))
-    thread.daemon = True
-    thread.start()
-    return True
+def play_note_async(note, audio_dir, velocity=1.0):
+    """
+    Reproduce una nota a través del motor de audio (sin crear hilos por nota)
+    
+    Args:
+        note: Nota a reproducir (ej. "DO4")
+        audio_dir: Directorio con archivos de audio
+        velocity: Intensidad 0-1
+        
+    Returns:
+        bool: True si la nota quedó encolada
+    """
+    return get_audio_engine().note_on(note, audio_dir, velocity=velocity)
+
+def stop_note(note):
+    """Libera una nota con un fade corto"""
+    get_audio_engine().note_off(note)
 
 def get_available_notes(audio_dir):
-    """Obtiene la lista de notas disponibles"""
-    notes = []
-    
+    """Obtiene la lista de notas disponibles (desde el catálogo en caché)"""
     try:
-        if os.path.exists(audio_dir):
-            # Buscar en carpetas
-            for octave in range(2, 7):  # Octavas 2-6
-                octave_dir = os.path.join(audio_dir, f"octava{octave}")
-                if os.path.exists(octave_dir):
-                    octave_notes = [os.path.splitext(f)[0] for f in os.listdir(octave_dir) if f.endswith('.wav')]
-                    notes.extend(octave_notes)
-        
-        return sorted(notes)
+        return list(get_notes_catalog(audio_dir).get_notes())
     except Exception as e:
         print(f"Error obteniendo notas disponibles: {e}")
-        return []
\ No newline at end of file
+        return []
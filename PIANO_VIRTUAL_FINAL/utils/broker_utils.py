@@ -0,0 +1,123 @@
+"""
+Broker local de mensajes para el despliegue multi-proceso
+broker_utils.py - Sustituto de Redis para pruebas y despliegues en una sola máquina
+
+El broker reenvía cada mensaje publicado a todos los suscriptores, igual que
+un canal pub/sub de Redis. LocalBrokerManager lo conecta con python-socketio
+para que `emit(..., broadcast=True)` llegue a los clientes de todos los workers.
+"""
+
+import threading
+from multiprocessing.connection import Listener, Client
+
+import socketio
+
+from utils.native_threading import run_blocking
+
+DEFAULT_BROKER_ADDRESS = ('127.0.0.1', 6380)
+BROKER_AUTHKEY = b'piano-virtual'
+
+def parse_broker_url(url):
+    """
+    Convierte 'local://host:puerto' en una dirección (host, puerto)
+
+    Args:
+        url: URL del broker local
+
+    Returns:
+        tuple: (host, puerto)
+    """
+    address = url.split('://', 1)[1] if '://' in url else url
+    if not address:
+        return DEFAULT_BROKER_ADDRESS
+    host, _, port = address.rpartition(':')
+    return (host or DEFAULT_BROKER_ADDRESS[0], int(port or DEFAULT_BROKER_ADDRESS[1]))
+
+class LocalBroker:
+    """Broker pub/sub mínimo sobre multiprocessing.connection"""
+
+    def __init__(self, address=DEFAULT_BROKER_ADDRESS):
+        self.address = address
+        self.listener = None
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        """Inicia el broker en un hilo en segundo plano"""
+        self.listener = Listener(self.address, authkey=BROKER_AUTHKEY)
+        self.running = True
+        thread = threading.Thread(target=self._accept_loop, daemon=True)
+        thread.start()
+        print(f"📮 Broker local escuchando en {self.address[0]}:{self.address[1]}")
+        return self
+
+    def stop(self):
+        """Detiene el broker"""
+        self.running = False
+        if self.listener:
+            self.listener.close()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                conn = self.listener.accept()
+            except Exception:
+                break
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn):
+        try:
+            role = conn.recv()
+            if role == 'sub':
+                with self.lock:
+                    self.subscribers.append(conn)
+                return
+            # Publicador: reenviar cada mensaje a todos los suscriptores
+            while True:
+                message = conn.recv()
+                self._broadcast(message)
+        except (EOFError, OSError):
+            pass
+
+    def _broadcast(self, message):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.send(message)
+            except (EOFError, OSError):
+                with self.lock:
+                    if subscriber in self.subscribers:
+                        self.subscribers.remove(subscriber)
+
+class LocalBrokerManager(socketio.PubSubManager):
+    """Client manager de Socket.IO respaldado por LocalBroker"""
+
+    name = 'local'
+
+    def __init__(self, url='local://127.0.0.1:6380', channel='socketio', write_only=False, logger=None):
+        self.address = parse_broker_url(url)
+        self.publisher = None
+        self.publish_lock = threading.Lock()
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def _publish(self, data):
+        with self.publish_lock:
+            if self.publisher is None:
+                self.publisher = Client(self.address, authkey=BROKER_AUTHKEY)
+                self.publisher.send('pub')
+            try:
+                self.publisher.send(data)
+            except (EOFError, OSError):
+                # Reconectar una vez si el broker se reinició
+                self.publisher = Client(self.address, authkey=BROKER_AUTHKEY)
+                self.publisher.send('pub')
+                self.publisher.send(data)
+
+    def _listen(self):
+        subscriber = Client(self.address, authkey=BROKER_AUTHKEY)
+        subscriber.send('sub')
+        while True:
+            # recv() bloquea el proceso: en eventlet/gevent se espera en un hilo real
+            yield run_blocking(subscriber.recv)
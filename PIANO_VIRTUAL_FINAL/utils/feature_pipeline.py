@@ -0,0 +1,163 @@
+"""
+Pipeline de features versionado
+feature_pipeline.py - Landmarks (H, 21, 3) → features por mano, igual en entrenamiento y servidor
+
+Versiones:
+    - raw-1: coordenadas normalizadas de imagen tal cual (63 por mano). Es
+      lo que esperan los modelos entrenados antes de existir este módulo.
+    - hand-1: origen en la muñeca, escala por el tamaño de la palma,
+      rotación opcional (muñeca → base del dedo medio hacia arriba) y,
+      opcionalmente, los 5 ángulos de flexión de los dedos. El mismo gesto
+      en otra zona de la imagen o a otra distancia da el mismo vector.
+
+La configuración se guarda junto a cada modelo (modelo.h5 →
+modelo.features.json); al cargar se comprueba que la versión es conocida y
+que las dimensiones coinciden con el modelo y el scaler (y, si se guardó,
+la huella del scaler: dos pipelines de 63 features no se distinguen por la
+dimensión). Un modelo sin ese archivo es anterior al pipeline y se asume raw-1.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.features_utils import LANDMARKS_PER_HAND, FEATURES_PER_HAND
+from utils.gesture_features import as_hand_array, finger_flexion_angles, WRIST, MIDDLE_MCP
+
+RAW_VERSION = "raw-1"
+HAND_VERSION = "hand-1"
+PIPELINE_VERSIONS = (RAW_VERSION, HAND_VERSION)
+
+# Palma: muñeca → bases de índice, medio y meñique (menos sensible a un dedo mal detectado)
+PALM_POINTS = [5, MIDDLE_MCP, 17]
+
+class FeaturePipeline:
+    """Transformación de landmarks a features de una mano, serializable con el modelo"""
+
+    def __init__(self, version=RAW_VERSION, rotate=False, angles=False):
+        if version not in PIPELINE_VERSIONS:
+            raise ValueError(f"Pipeline de features desconocido: {version} (soportados: {PIPELINE_VERSIONS})")
+        if version == RAW_VERSION and (rotate or angles):
+            raise ValueError(f"{RAW_VERSION} no admite rotación ni ángulos")
+        self.version = version
+        self.rotate = rotate
+        self.angles = angles
+        self.scaler_fingerprint = None  # Huella del scaler con el que se entrenó (si se guardó)
+
+    @property
+    def features_per_hand(self):
+        """Dimensión de las features de una mano"""
+        return FEATURES_PER_HAND + (5 if self.angles else 0)
+
+    @property
+    def input_sizes(self):
+        """Dimensiones de entrada válidas: una mano por fila o ambas manos"""
+        return (self.features_per_hand, 2 * self.features_per_hand)
+
+    def transform(self, hands):
+        """
+        Features de varias manos a la vez
+
+        Args:
+            hands: Array (H, 21, 3) o (21, 3)
+
+        Returns:
+            numpy.ndarray: (H, features_per_hand) float32
+        """
+        hands = as_hand_array(hands)
+        if self.version == RAW_VERSION:
+            return hands.reshape(len(hands), -1)
+
+        centered = hands - hands[:, WRIST:WRIST + 1]
+        palm = np.linalg.norm(centered[:, PALM_POINTS, :2], axis=2).mean(axis=1)
+        normalized = centered / np.maximum(palm, 1e-6)[:, None, None]
+
+        if self.rotate:
+            # Girar en el plano xy para que muñeca → base del medio apunte hacia arriba (-y)
+            axis = normalized[:, MIDDLE_MCP, :2]
+            angle = np.arctan2(axis[:, 0], -axis[:, 1])
+            cos, sin = np.cos(angle)[:, None], np.sin(angle)[:, None]
+            x, y = normalized[:, :, 0].copy(), normalized[:, :, 1].copy()
+            normalized[:, :, 0] = cos * x - sin * y
+            normalized[:, :, 1] = sin * x + cos * y
+
+        features = normalized.reshape(len(hands), -1)
+        if self.angles:
+            features = np.concatenate([features, finger_flexion_angles(hands) / 180.0], axis=1)
+        return features.astype(np.float32, copy=False)
+
+    def to_metadata(self):
+        """Configuración serializable (se guarda con el modelo)"""
+        metadata = {
+            "version": self.version,
+            "rotate": self.rotate,
+            "angles": self.angles,
+            "landmarks_per_hand": LANDMARKS_PER_HAND,
+            "features_per_hand": self.features_per_hand
+        }
+        if self.scaler_fingerprint:
+            metadata["scaler_fingerprint"] = self.scaler_fingerprint
+        return metadata
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        """Reconstruye el pipeline y verifica que la dimensión guardada coincide"""
+        pipeline = cls(metadata.get("version", RAW_VERSION),
+                       rotate=bool(metadata.get("rotate", False)),
+                       angles=bool(metadata.get("angles", False)))
+        stored = metadata.get("features_per_hand", pipeline.features_per_hand)
+        if stored != pipeline.features_per_hand:
+            raise ValueError(f"Pipeline {pipeline.version}: {stored} features guardadas, "
+                             f"{pipeline.features_per_hand} calculadas")
+        pipeline.scaler_fingerprint = metadata.get("scaler_fingerprint")
+        return pipeline
+
+    def __repr__(self):
+        return f"FeaturePipeline({self.version}, rotate={self.rotate}, angles={self.angles})"
+
+def pipeline_path_for(model_path):
+    """Archivo de configuración del pipeline de un modelo (modelo.h5 → modelo.features.json)"""
+    return os.path.splitext(model_path)[0] + '.features.json'
+
+def scaler_fingerprint(scaler):
+    """Huella corta de las medias y escalas de un StandardScaler"""
+    digest = hashlib.sha1()
+    for name in ('mean_', 'scale_'):
+        values = getattr(scaler, name, None)
+        if values is not None:
+            digest.update(np.asarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+def load_pipeline(path):
+    """Pipeline guardado junto al modelo; raw-1 si el modelo es anterior a este archivo"""
+    if not path or not os.path.exists(path):
+        return FeaturePipeline(RAW_VERSION)
+    with open(path, 'r', encoding='utf-8') as f:
+        return FeaturePipeline.from_metadata(json.load(f))
+
+def save_pipeline(pipeline, path, scaler=None):
+    """Guarda la configuración del pipeline junto al modelo (con la huella del scaler si se da)"""
+    if scaler is not None:
+        pipeline.scaler_fingerprint = scaler_fingerprint(scaler)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(pipeline.to_metadata(), f, indent=2)
+
+def check_compatibility(pipeline, input_features, scaler=None):
+    """
+    Verifica que modelo, scaler y pipeline encajan
+
+    Raises:
+        ValueError: Si la dimensión del modelo o del scaler no corresponde al
+            pipeline, o el scaler no es con el que se entrenó el modelo
+    """
+    if input_features not in pipeline.input_sizes:
+        raise ValueError(f"El modelo espera {input_features} features pero el pipeline {pipeline.version} "
+                         f"produce {pipeline.features_per_hand} por mano")
+    scaler_features = getattr(scaler, 'n_features_in_', None)
+    if scaler_features is not None and scaler_features != input_features:
+        raise ValueError(f"El scaler espera {scaler_features} features y el modelo {input_features}")
+    if scaler is not None and pipeline.scaler_fingerprint and \
+            scaler_fingerprint(scaler) != pipeline.scaler_fingerprint:
+        raise ValueError(f"El scaler no corresponde al modelo (pipeline {pipeline.version})")
@@ -0,0 +1,128 @@
+"""
+Utilidades para construir features del modelo a partir de landmarks
+features_utils.py - Soporta modelos de una mano (63) y de dos manos (126)
+"""
+
+import numpy as np
+
+# Dimensiones de entrada soportadas por el servidor
+LANDMARKS_PER_HAND = 21
+FEATURES_PER_HAND = LANDMARKS_PER_HAND * 3   # 63
+FEATURES_TWO_HANDS = FEATURES_PER_HAND * 2   # 126
+
+# Orden de las manos en el vector de 126 (igual que captura_notas.py)
+HAND_ORDER = ('Left', 'Right')
+
+def landmarks_to_array(landmarks):
+    """
+    Convierte landmarks (objetos MediaPipe o listas [x, y, z]) a un array (21, 3)
+
+    Args:
+        landmarks: Landmarks de una mano o None
+
+    Returns:
+        numpy.ndarray: Array float32 (21, 3) o None si no hay datos válidos
+    """
+    if landmarks is None:
+        return None
+
+    if isinstance(landmarks, np.ndarray):
+        array = landmarks.astype(np.float32, copy=False)
+    else:
+        landmarks = list(landmarks)
+        if not landmarks:
+            return None
+        if hasattr(landmarks[0], 'x'):  # MediaPipe landmark
+            array = np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+        else:  # Lista de coordenadas
+            array = np.asarray(landmarks, dtype=np.float32)
+
+    if array.shape != (LANDMARKS_PER_HAND, 3):
+        return None
+    return array
+
+def build_feature_batch(hands_by_label, input_features, pipeline=None):
+    """
+    Construye el batch de entrada para el modelo según su dimensión
+
+    Args:
+        hands_by_label: dict {'Left': landmarks, 'Right': landmarks}
+        input_features: Una mano por fila (63 en raw-1) o ambas manos por fila (126)
+        pipeline: FeaturePipeline del modelo (None = coordenadas crudas, raw-1)
+
+    Returns:
+        tuple: (batch (N, input_features), mask (N, input_features), labels de cada fila)
+    """
+    per_hand = pipeline.features_per_hand if pipeline is not None else FEATURES_PER_HAND
+    
+    # Todas las manos presentes en un solo array (H, 21, 3)
+    arrays = []
+    labels = []
+    for label in HAND_ORDER:
+        array = landmarks_to_array(hands_by_label.get(label))
+        if array is not None:
+            arrays.append(array)
+            labels.append(label)
+    if not arrays:
+        return None, None, []
+    
+    hands = np.stack(arrays)
+    rows = pipeline.transform(hands) if pipeline is not None else hands.reshape(len(hands), -1)
+    
+    if input_features == 2 * per_hand:
+        # Ambas manos en una fila; las ausentes en cero y marcadas en la máscara
+        features = np.zeros((len(HAND_ORDER), per_hand), dtype=np.float32)
+        present = np.zeros(len(HAND_ORDER), dtype=bool)
+        for row, label in zip(rows, labels):
+            features[HAND_ORDER.index(label)] = row
+            present[HAND_ORDER.index(label)] = True
+        return (features.reshape(1, -1), np.repeat(present, per_hand)[np.newaxis], ['Both'])
+    
+    if input_features == per_hand:
+        # Una fila por mano para una sola pasada del modelo
+        return rows, np.ones_like(rows, dtype=bool), labels
+    
+    return None, None, []
+
+def get_model_input_features(model, features_per_hand=FEATURES_PER_HAND):
+    """
+    Detecta la dimensión de entrada soportada a partir del modelo cargado
+
+    Args:
+        model: Modelo Keras cargado
+        features_per_hand: Features por mano del pipeline del modelo
+
+    Returns:
+        int: Una o dos manos por fila (63/126 en raw-1) o None si la forma no es soportada
+    """
+    try:
+        input_shape = model.input_shape
+        if isinstance(input_shape, list):
+            input_shape = input_shape[0]
+        features = int(input_shape[-1])
+        if features in (features_per_hand, 2 * features_per_hand):
+            return features
+        return None
+    except Exception as e:
+        print(f"Error detectando input shape del modelo: {e}")
+        return None
+
+def select_note_head(prediction, n_classes):
+    """
+    Selecciona la salida de notas en modelos multi-head
+
+    Args:
+        prediction: Salida de model.predict (array o lista de arrays)
+        n_classes: Número de clases del label encoder
+
+    Returns:
+        numpy.ndarray: Probabilidades (N, n_classes)
+    """
+    if isinstance(prediction, dict):
+        prediction = list(prediction.values())
+    if isinstance(prediction, (list, tuple)):
+        for head in prediction:
+            if np.asarray(head).shape[-1] == n_classes:
+                return np.asarray(head)
+        return np.asarray(prediction[0])
+    return np.asarray(prediction)
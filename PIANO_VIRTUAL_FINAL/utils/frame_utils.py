@@ -0,0 +1,31 @@
+"""
+Decodificación de frames del cliente
+frame_utils.py - JPEG en base64 → RGB para MediaPipe con el mínimo de copias
+
+Camino original por frame: bytes base64 → np.frombuffer → imdecode (BGR)
+→ cv2.flip (copia) → cv2.cvtColor (copia). El espejo ya no se aplica a la
+imagen (LandmarkTransform lo aplica a los landmarks) y la conversión a RGB
+escribe sobre el array que devolvió imdecode, así que solo queda la
+reserva del propio imdecode.
+"""
+
+import base64
+
+import cv2
+import numpy as np
+
+def decode_frame(image_data):
+    """
+    Decodifica un frame JPEG en base64 a RGB (sin voltear)
+
+    Args:
+        image_data: Cadena base64 (sin el prefijo data:image/...;base64,)
+
+    Returns:
+        numpy.ndarray: Frame RGB (H, W, 3) o None si no se pudo decodificar
+    """
+    img_array = np.frombuffer(base64.b64decode(image_data), np.uint8)
+    frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
@@ -0,0 +1,298 @@
+"""
+Librería vectorizada de features geométricas de gestos
+gesture_features.py - Ángulos, estados de dedos, dirección y pinzas sobre arrays (H, 21, 3)
+
+Todas las funciones reciben un array (H, 21, 3) con H manos (o frames) y
+calculan el resultado de todas a la vez con broadcasting, en lugar de
+acceder landmark a landmark. gesture_utils.py y hands_utils.py las usan
+como implementación de sus funciones públicas.
+"""
+
+import numpy as np
+
+from utils.features_utils import landmarks_to_array, LANDMARKS_PER_HAND
+
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+
+# Cadenas MCP → PIP → DIP → TIP (pulgar: CMC → MCP → IP → TIP)
+FINGER_CHAINS = np.array([
+    [1, 2, 3, 4],      # Pulgar
+    [5, 6, 7, 8],      # Índice
+    [9, 10, 11, 12],   # Medio
+    [13, 14, 15, 16],  # Anular
+    [17, 18, 19, 20]   # Meñique
+])
+FINGER_TIPS = FINGER_CHAINS[:, 3]
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])  # Articulación usada por la detección simple
+FINGER_NAMES = ("Pulgar", "Índice", "Medio", "Anular", "Meñique")
+INDEX_FINGER = 1  # Posición del índice en los arrays (H, 5)
+
+# Dirección de navegación
+NAVIGATION_LEFT = -1
+NAVIGATION_NONE = 0
+NAVIGATION_RIGHT = 1
+
+def as_hand_array(landmarks):
+    """
+    Normaliza la entrada a un array (H, 21, 3)
+
+    Args:
+        landmarks: Landmarks de MediaPipe, LandmarkPoint, lista [x, y, z],
+            array (21, 3) o array (H, 21, 3)
+
+    Returns:
+        numpy.ndarray: Array float32 (H, 21, 3) o None si no es válido
+    """
+    if isinstance(landmarks, np.ndarray) and landmarks.ndim == 3:
+        if landmarks.shape[1:] != (LANDMARKS_PER_HAND, 3):
+            return None
+        return landmarks.astype(np.float32, copy=False)
+
+    array = landmarks_to_array(landmarks)
+    return None if array is None else array[None]
+
+def _inner_angles(points):
+    """Ángulos (grados) en los puntos interiores de cadenas (..., N, 3) → (..., N - 2)"""
+    incoming = points[..., :-2, :] - points[..., 1:-1, :]         # hacia el punto anterior
+    outgoing = points[..., 2:, :] - points[..., 1:-1, :]          # hacia el siguiente
+    dot = np.einsum('...k,...k->...', incoming, outgoing)
+    norms = np.linalg.norm(incoming, axis=-1) * np.linalg.norm(outgoing, axis=-1)
+    cosine = np.clip(dot / np.maximum(norms, 1e-7), -1.0, 1.0)
+    return np.degrees(np.arccos(cosine))
+
+def joint_angles(hands):
+    """
+    Ángulos de flexión (grados) de todas las articulaciones
+
+    El ángulo en cada articulación es el que forman los segmentos hacia el
+    punto anterior y el siguiente de la cadena muñeca → MCP → PIP → DIP → TIP:
+    180° es un dedo recto y valores menores indican flexión.
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+
+    Returns:
+        numpy.ndarray: (H, 5, 3) ángulos en MCP, PIP y DIP de cada dedo
+    """
+    chains = hands[:, FINGER_CHAINS]                              # (H, 5, 4, 3)
+    wrist = np.broadcast_to(hands[:, None, None, WRIST], chains[:, :, :1].shape)
+    points = np.concatenate([wrist, chains], axis=2)              # (H, 5, 5, 3)
+    return _inner_angles(points)
+
+def chain_flexion_angle(hands, chain):
+    """
+    Ángulo medio PIP/DIP de una cadena MCP → PIP → DIP → TIP arbitraria
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+        chain: Índices [mcp, pip, dip, tip]
+
+    Returns:
+        numpy.ndarray: (H,) grados; 180° es un dedo recto
+    """
+    return _inner_angles(hands[:, chain]).mean(axis=-1)
+
+def finger_flexion_angles(hands):
+    """
+    Ángulo de flexión de cada dedo: media de los ángulos en PIP y DIP
+
+    Es invariante a la inclinación y rotación de la mano, a diferencia de
+    comparar la coordenada y de la punta con la de la articulación.
+
+    Returns:
+        numpy.ndarray: (H, 5) grados
+    """
+    return joint_angles(hands)[:, :, 1:].mean(axis=-1)
+
+def bent_fingers(hands, thresholds):
+    """
+    Dedos doblados según un umbral de ángulo por dedo (sin estado)
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+        thresholds: Escalar o secuencia de 5 umbrales en grados
+
+    Returns:
+        numpy.ndarray: (H, 5) bool
+    """
+    return finger_flexion_angles(hands) < np.asarray(thresholds, dtype=np.float32)
+
+class FingerBendDetector:
+    """
+    Detector de flexión con histéresis por dedo
+
+    Un dedo pasa a doblado cuando su ángulo baja de su umbral y solo vuelve
+    a extendido cuando supera umbral + histéresis, así el jitter de
+    MediaPipe alrededor del umbral no produce flancos de pulsación
+    (update_with_onsets) ni, por tanto, notas repetidas.
+    """
+
+    def __init__(self, thresholds, hysteresis=15):
+        self.thresholds = np.asarray(thresholds, dtype=np.float32)
+        self.hysteresis = hysteresis
+        self.state = None
+
+    def reset(self):
+        """Olvida el estado (p. ej. la mano dejó de detectarse)"""
+        self.state = None
+
+    def update(self, hands):
+        """
+        Actualiza el estado con un nuevo frame
+
+        Args:
+            hands: Array (H, 21, 3) o landmarks de una mano
+
+        Returns:
+            numpy.ndarray: (H, 5) bool con los dedos doblados
+        """
+        hands = as_hand_array(hands)
+        if hands is None:
+            self.reset()
+            return np.zeros((0, 5), dtype=bool)
+
+        angles = finger_flexion_angles(hands)
+        if self.state is None or self.state.shape != angles.shape:
+            self.state = angles < self.thresholds
+        else:
+            release = self.thresholds + self.hysteresis
+            self.state = np.where(self.state, angles < release, angles < self.thresholds)
+        return self.state.copy()
+
+    def update_with_onsets(self, hands):
+        """
+        Como update, y además los flancos de pulsación (extendido → doblado)
+
+        Un dedo que sigue doblado no vuelve a contar como pulsación; tras
+        reset() el primer frame doblado sí cuenta.
+
+        Returns:
+            tuple: (doblados (H, 5) bool, pulsados en este frame (H, 5) bool)
+        """
+        previous = self.state
+        state = self.update(hands)
+        if previous is None or previous.shape != state.shape:
+            return state, state.copy()
+        return state, state & ~previous
+
+def fingers_up(hands, hand_labels=None):
+    """
+    Estado levantado/bajado de los cinco dedos (misma lógica que detect_all_fingers_state)
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+        hand_labels: Lista de "Right"/"Left" por mano (por defecto "Left")
+
+    Returns:
+        numpy.ndarray: (H, 5) bool [pulgar, índice, medio, anular, meñique]
+    """
+    states = hands[:, FINGER_TIPS, 1] < hands[:, FINGER_PIPS, 1]
+
+    # Pulgar: hacia la derecha en la mano derecha, hacia la izquierda en la izquierda
+    is_right = np.array([label == "Right" for label in hand_labels]) if hand_labels is not None \
+        else np.zeros(len(hands), dtype=bool)
+    thumb_right = hands[:, 4, 0] > hands[:, 3, 0]
+    thumb_left = hands[:, 4, 0] < hands[:, 3, 0]
+    states[:, 0] = np.where(is_right, thumb_right, thumb_left)
+    return states
+
+def tip_distances(hands, tip_indices, base_indices):
+    """
+    Distancia 2D punta-base para cualquier conjunto de dedos
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+        tip_indices: Índices de las puntas
+        base_indices: Índices de las bases (mismo tamaño)
+
+    Returns:
+        numpy.ndarray: (H, len(tip_indices)) distancias normalizadas
+    """
+    delta = hands[:, tip_indices, :2] - hands[:, base_indices, :2]
+    return np.linalg.norm(delta, axis=-1)
+
+def fingers_extended(hands, threshold=0.15):
+    """
+    Dedos extendidos: la punta está lejos de su MCP
+
+    Returns:
+        numpy.ndarray: (H, 5) bool
+    """
+    return tip_distances(hands, FINGER_TIPS, FINGER_CHAINS[:, 0]) > threshold
+
+def pointing_mask(hands, margin=0.05):
+    """
+    Gesto de apuntar: la punta del índice está por encima del resto de puntas
+
+    Returns:
+        numpy.ndarray: (H,) bool
+    """
+    index_y = hands[:, INDEX_TIP, 1]
+    others_y = hands[:, [12, 16, 20], 1]
+    return np.all(index_y[:, None] < others_y - margin, axis=1)
+
+def pointing_direction(hands):
+    """
+    Dirección unitaria muñeca → punta del índice en el plano de la imagen
+
+    Returns:
+        numpy.ndarray: (H, 2)
+    """
+    direction = hands[:, INDEX_TIP, :2] - hands[:, WRIST, :2]
+    return direction / (np.linalg.norm(direction, axis=-1, keepdims=True) + 1e-7)
+
+def navigation_directions(hands, threshold=0.7):
+    """
+    Navegación izquierda/derecha según la dirección del índice
+
+    Returns:
+        numpy.ndarray: (H,) int con NAVIGATION_LEFT, NAVIGATION_NONE o NAVIGATION_RIGHT
+    """
+    dx = pointing_direction(hands)[:, 0]
+    return np.where(dx < -threshold, NAVIGATION_LEFT,
+                    np.where(dx > threshold, NAVIGATION_RIGHT, NAVIGATION_NONE))
+
+def pinch_distances(hands, normalize=True):
+    """
+    Distancias 3D de la punta del pulgar a las puntas del resto de dedos
+
+    Args:
+        hands: numpy.ndarray (H, 21, 3)
+        normalize: Dividir por el tamaño de la palma (muñeca → MCP medio)
+
+    Returns:
+        numpy.ndarray: (H, 4) [índice, medio, anular, meñique]
+    """
+    distances = np.linalg.norm(hands[:, FINGER_TIPS[1:]] - hands[:, None, THUMB_TIP], axis=-1)
+    if normalize:
+        palm = np.linalg.norm(hands[:, MIDDLE_MCP] - hands[:, WRIST], axis=-1)
+        distances = distances / np.maximum(palm, 1e-7)[:, None]
+    return distances
+
+def compute_gesture_features(hands, hand_labels=None):
+    """
+    Calcula todas las features geométricas de un batch de manos
+
+    Args:
+        hands: Array (H, 21, 3) o cualquier entrada aceptada por as_hand_array
+        hand_labels: Lista de "Right"/"Left" por mano
+
+    Returns:
+        dict: angles (H, 5, 3), up (H, 5), extended (H, 5), pointing (H,),
+            direction (H, 2), navigation (H,), pinch (H, 4); None si la entrada no es válida
+    """
+    hands = as_hand_array(hands)
+    if hands is None:
+        return None
+    return {
+        'angles': joint_angles(hands),
+        'up': fingers_up(hands, hand_labels),
+        'extended': fingers_extended(hands),
+        'pointing': pointing_mask(hands),
+        'direction': pointing_direction(hands),
+        'navigation': navigation_directions(hands),
+        'pinch': pinch_distances(hands)
+    }
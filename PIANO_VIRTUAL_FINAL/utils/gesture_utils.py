@@ -2,7 +2,7 @@
 Utilidades para detección de gestos
 """
 
-import numpy as np
+from utils.gesture_features import as_hand_array, pointing_mask, tip_distances
 
 def is_pointing_gesture(landmarks):
     """
@@ -10,47 +10,33 @@ def is_pointing_gesture(landmarks):
     (dedo índice extendido, otros dedos cerrados) gesture_utils.py
     
     Args:
-        landmarks: Puntos de referencia de la mano
+        landmarks: Puntos de referencia de la mano (objetos MediaPipe o array (21, 3))
         
     Returns:
         bool: True si está apuntando
     """
-    try:
-        # Verificar posición del dedo índice vs otros dedos
-        index_tip_y = landmarks[8].y
-        middle_tip_y = landmarks[12].y
-        ring_tip_y = landmarks[16].y
-        pinky_tip_y = landmarks[20].y
-        
-        # Índice debe estar más extendido (coordenada Y menor) que otros dedos
-        return (index_tip_y < middle_tip_y - 0.05 and 
-                index_tip_y < ring_tip_y - 0.05 and 
-                index_tip_y < pinky_tip_y - 0.05)
-    except Exception as e:
-        print(f"Error en is_pointing_gesture: {e}")
+    hands = as_hand_array(landmarks)
+    if hands is None:
         return False
+    
+    # Índice debe estar más extendido (coordenada Y menor) que otros dedos
+    return bool(pointing_mask(hands, margin=0.05)[0])
 
 def is_finger_extended(landmarks, finger_indices):
     """
     Determina si un dedo está extendido
     
     Args:
-        landmarks: Puntos de referencia de la mano
+        landmarks: Puntos de referencia de la mano (objetos MediaPipe o array (21, 3))
         finger_indices: Índices del dedo a verificar
         
     Returns:
         bool: True si el dedo está extendido
     """
-    try:
-        # Punta y articulaciones del dedo
-        tip = np.array([landmarks[finger_indices[0]].x, landmarks[finger_indices[0]].y])
-        mcp = np.array([landmarks[finger_indices[3]].x, landmarks[finger_indices[3]].y])
-        
-        # Calcular distancia
-        distance = np.linalg.norm(tip - mcp)
-        
-        # Un dedo extendido tiene mayor distancia desde la base
-        return distance > 0.15  # Umbral basado en pruebas
-    except Exception as e:
-        print(f"Error en is_finger_extended: {e}")
-        return False
\ No newline at end of file
+    hands = as_hand_array(landmarks)
+    if hands is None:
+        return False
+    
+    # Un dedo extendido tiene mayor distancia desde la base
+    distance = tip_distances(hands, [finger_indices[0]], [finger_indices[3]])[0, 0]
+    return bool(distance > 0.15)  # Umbral basado en pruebas
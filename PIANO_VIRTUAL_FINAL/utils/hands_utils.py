@@ -3,7 +3,8 @@ Utilidades para procesamiento Multi-Finger
 hands_utils.py - Versión simplificada para detección de múltiples dedos
 """
 
-import numpy as np
+from utils.gesture_features import (as_hand_array, fingers_up, navigation_directions, chain_flexion_angle,
+                                    NAVIGATION_LEFT, NAVIGATION_RIGHT, FINGER_TIPS, FINGER_NAMES)
 
 def is_finger_up_simple(landmarks, finger_tip_idx, finger_pip_idx):
     """
@@ -108,32 +109,18 @@ def detect_all_fingers_state(landmarks, hand_label):
     Basado en tu código de referencia
     
     Args:
-        landmarks: Puntos de referencia de la mano
+        landmarks: Puntos de referencia de la mano (objetos MediaPipe o array (21, 3))
         hand_label: "Right" o "Left"
         
     Returns:
         list: Lista de booleanos [pulgar, índice, medio, anular, meñique]
     """
-    try:
-        # Índices de puntas y articulaciones (como tu código de referencia)
-        finger_tips = [4, 8, 12, 16, 20]  # Pulgar, Índice, Medio, Anular, Meñique
-        finger_pips = [3, 6, 10, 14, 18]  # Articulaciones medias
-        
-        finger_states = []
-        
-        for i in range(5):
-            if i == 0:  # Pulgar (lógica especial)
-                finger_up = is_thumb_up_simple(landmarks, hand_label)
-            else:  # Otros dedos
-                finger_up = is_finger_up_simple(landmarks, finger_tips[i], finger_pips[i])
-            
-            finger_states.append(finger_up)
-        
-        return finger_states
-        
-    except Exception as e:
-        print(f"Error en detect_all_fingers_state: {e}")
+    hands = as_hand_array(landmarks)
+    if hands is None:
         return [False] * 5
+    
+    # Los cinco dedos a la vez (pulgar con lógica especial según la mano)
+    return fingers_up(hands, [hand_label])[0].tolist()
 
 def extract_finger_positions(landmarks):
     """
@@ -145,44 +132,41 @@ def extract_finger_positions(landmarks):
     Returns:
         list: Lista de diccionarios con posiciones de dedos
     """
-    try:
-        finger_tips = [4, 8, 12, 16, 20]  # Índices de puntas de dedos
-        finger_names = ["Pulgar", "Índice", "Medio", "Anular", "Meñique"]
-        
-        finger_positions = []
-        
-        for i, (tip_idx, name) in enumerate(zip(finger_tips, finger_names)):
-            finger_positions.append({
-                'finger': name,
-                'tip_index': tip_idx,
-                'x': landmarks[tip_idx].x,
-                'y': landmarks[tip_idx].y,
-                'z': landmarks[tip_idx].z
-            })
-        
-        return finger_positions
-        
-    except Exception as e:
-        print(f"Error en extract_finger_positions: {e}")
+    hands = as_hand_array(landmarks)
+    if hands is None:
         return []
+    
+    tips = hands[0, FINGER_TIPS].tolist()
+    return [{'finger': name, 'tip_index': int(tip_idx), 'x': x, 'y': y, 'z': z}
+            for name, tip_idx, (x, y, z) in zip(FINGER_NAMES, FINGER_TIPS, tips)]
 
-# Funciones de compatibilidad con el código anterior (deprecadas pero mantenidas)
 def is_finger_bent(landmarks, finger_indices=[8, 7, 6, 5], threshold_angle=120):
-    """Función de compatibilidad - usa la nueva lógica simplificada"""
-    try:
-        # Usar lógica simplificada para compatibilidad
-        tip_idx = finger_indices[0]
-        pip_idx = finger_indices[1]
-        return not is_finger_up_simple(landmarks, tip_idx, pip_idx)
-    except:
+    """
+    Detecta si un dedo está doblado por el ángulo de sus articulaciones
+    
+    Args:
+        landmarks: Puntos de referencia de la mano (objetos MediaPipe o array (21, 3))
+        finger_indices: Índices del dedo [punta, DIP, PIP, MCP]
+        threshold_angle: Ángulo medio PIP/DIP (grados) por debajo del cual está doblado
+        
+    Returns:
+        bool: True si el dedo está doblado
+    """
+    hands = as_hand_array(landmarks)
+    if hands is None:
         return False
+    
+    # Cadena MCP → PIP → DIP → punta (inclinar la mano no cambia los ángulos)
+    chain = list(finger_indices)[::-1]
+    return bool(chain_flexion_angle(hands, chain)[0] < threshold_angle)
+
+# Funciones de compatibilidad con el código anterior (deprecadas pero mantenidas)
 
 def determine_note_from_position(landmarks, img_width, img_height, keyboard_config, **kwargs):
     """Función de compatibilidad - usa la nueva lógica"""
     try:
         # Obtener posición del dedo índice para compatibilidad
-        finger_x = landmarks[8].x
-        finger_y = landmarks[8].y
+        finger_x, finger_y = as_hand_array(landmarks)[0, 8, :2].tolist()
         
         # Convertir configuración del teclado a formato esperado
         piano_config = {
@@ -200,22 +184,14 @@ def determine_note_from_position(landmarks, img_width, img_height, keyboard_conf
 
 def detect_navigation_gesture(landmarks):
     """Función de compatibilidad - navegación simplificada"""
-    try:
-        # Lógica básica de navegación (puedes mejorarla después)
-        wrist = np.array([landmarks[0].x, landmarks[0].y])
-        index_tip = np.array([landmarks[8].x, landmarks[8].y])
-        
-        # Calcular dirección
-        direction = index_tip - wrist
-        direction_normalized = direction / (np.linalg.norm(direction) + 1e-7)
-        
-        # Verificar si apunta horizontalmente
-        if abs(direction_normalized[0]) > 0.7:
-            if direction_normalized[0] < -0.7:
-                return 'left'
-            elif direction_normalized[0] > 0.7:
-                return 'right'
-        
+    hands = as_hand_array(landmarks)
+    if hands is None:
         return None
-    except:
-        return None
\ No newline at end of file
+    
+    # Dirección muñeca → punta del índice; navega si apunta horizontalmente
+    direction = navigation_directions(hands, threshold=0.7)[0]
+    if direction == NAVIGATION_LEFT:
+        return 'left'
+    if direction == NAVIGATION_RIGHT:
+        return 'right'
+    return None
\ No newline at end of file
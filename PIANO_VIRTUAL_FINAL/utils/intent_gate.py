@@ -0,0 +1,181 @@
+"""
+Compuerta de intención de tocar
+intent_gate.py - Regresión logística (numpy) POSITIVE vs NEGATIVE sobre features geométricas baratas
+
+Se ejecuta en el servidor antes que la detección de flexión, el
+clasificador de notas y el audio: si la mano no está en un gesto de tocar
+(mano abierta, puño cerrado, transición, fuera de zona...), el frame se
+descarta sin más trabajo.
+
+Features por mano (20): los 15 ángulos de flexión (MCP/PIP/DIP de cada
+dedo, /180), la punta del índice en la imagen (x, y; fuera de zona), su
+posición relativa a la muñeca en tamaños de palma (x, y) y el tamaño de la
+palma en la imagen (distancia a la cámara). Se entrena al arrancar con los
+gesture_data que ya carga app.py; el umbral se calibra para conservar una
+fracción mínima de las pulsaciones (recall) del dataset.
+
+Lleva sus propias estadísticas de servicio: frames vistos y filtrados,
+coste de la compuerta y coste medio del trabajo posterior que evita.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.features_utils import landmarks_to_array
+from utils.gesture_features import as_hand_array, joint_angles, WRIST, INDEX_TIP, MIDDLE_MCP
+from utils.native_threading import allocate_lock
+
+INTENT_FEATURES = 20
+
+def intent_features(hands):
+    """
+    Features de la compuerta para varias manos a la vez
+
+    Args:
+        hands: Array (H, 21, 3)
+
+    Returns:
+        numpy.ndarray: (H, INTENT_FEATURES) float32
+    """
+    angles = joint_angles(hands).reshape(len(hands), -1) / 180.0          # (H, 15)
+    tip = hands[:, INDEX_TIP, :2]                                           # (H, 2)
+    palm = np.linalg.norm(hands[:, MIDDLE_MCP, :2] - hands[:, WRIST, :2], axis=1)
+    relative = (tip - hands[:, WRIST, :2]) / np.maximum(palm, 1e-6)[:, None]
+    return np.concatenate([angles, tip, relative, palm[:, None]], axis=1).astype(np.float32, copy=False)
+
+class IntentGate:
+    """Clasificador binario "intención de tocar" con estadísticas de uso"""
+
+    def __init__(self, min_recall=0.98, l2=1e-3):
+        self.min_recall = min_recall
+        self.l2 = l2
+        self.threshold = 0.5
+        self.n_samples = 0
+        self.lock = allocate_lock()  # allows() corre en hilos reales (run_cpu_bound)
+        self.reset_stats()
+
+    def fit(self, hands, labels, epochs=300, learning_rate=0.5):
+        """
+        Entrena la regresión logística (descenso de gradiente por lotes, clases balanceadas)
+
+        Args:
+            hands: Array (N, 21, 3) de landmarks
+            labels: (N,) 1 = gesto de tocar (POSITIVE), 0 = negativo
+        """
+        features = intent_features(hands)
+        labels = np.asarray(labels, dtype=np.float32)
+        self.mean = features.mean(axis=0)
+        self.std = np.maximum(features.std(axis=0), 1e-6)
+        features = (features - self.mean) / self.std
+        self.n_samples = len(features)
+
+        # Peso por clase para que los negativos (menos muestras) cuenten igual
+        positives = max(labels.sum(), 1.0)
+        negatives = max(len(labels) - labels.sum(), 1.0)
+        sample_weight = np.where(labels > 0, 0.5 / positives, 0.5 / negatives)
+
+        self.weights = np.zeros(features.shape[1], dtype=np.float32)
+        self.bias = 0.0
+        for _ in range(epochs):
+            error = (self._sigmoid(features @ self.weights + self.bias) - labels) * sample_weight
+            self.weights -= learning_rate * (features.T @ error + self.l2 * self.weights)
+            self.bias -= learning_rate * float(error.sum())
+
+        # Umbral: el mayor que conserva min_recall de las pulsaciones de entrenamiento
+        probabilities = self._sigmoid(features @ self.weights + self.bias)
+        if (labels > 0).any():
+            self.threshold = float(min(0.5, np.quantile(probabilities[labels > 0], 1.0 - self.min_recall)))
+        return self
+
+    @classmethod
+    def from_gesture_data(cls, gesture_data, min_recall=0.98):
+        """
+        Construye la compuerta con las muestras de captura_notas.py
+
+        POSITIVE = tocar, NEGATIVE = no tocar; la navegación no interviene
+        (tiene su propio detector antes que la compuerta).
+
+        Returns:
+            IntentGate o None si falta alguna de las dos clases
+        """
+        hands, labels = [], []
+        for sample in gesture_data:
+            category = sample.get('gesture_category', 'POSITIVE')
+            if category == 'NAVIGATION':
+                continue
+            for key in ('landmarks_left_hand', 'landmarks_right_hand'):
+                array = landmarks_to_array(sample.get(key) or None)
+                if array is not None:
+                    hands.append(array)
+                    labels.append(0 if category == 'NEGATIVE' else 1)
+        if len(set(labels)) < 2:
+            return None
+        return cls(min_recall).fit(np.stack(hands), labels)
+
+    @staticmethod
+    def _sigmoid(x):
+        return 1.0 / (1.0 + np.exp(-np.clip(x, -30.0, 30.0)))
+
+    def predict_proba(self, hands):
+        """
+        Probabilidad de intención de tocar de varias manos
+
+        Args:
+            hands: Array (H, 21, 3)
+
+        Returns:
+            numpy.ndarray: (H,) probabilidades
+        """
+        features = (intent_features(hands) - self.mean) / self.std
+        return self._sigmoid(features @ self.weights + self.bias)
+
+    def allows(self, landmarks):
+        """
+        Decide si un frame sigue hacia la clasificación (primera mano) y lo cuenta
+
+        Returns:
+            tuple: (bool pasa, probabilidad)
+        """
+        start = time.perf_counter()
+        hands = as_hand_array(landmarks)
+        probability = float(self.predict_proba(hands[:1])[0]) if hands is not None else 0.0
+        allowed = probability >= self.threshold
+        with self.lock:
+            self.frames_seen += 1
+            self.frames_rejected += 0 if allowed else 1
+            self.gate_seconds += time.perf_counter() - start
+        return allowed, probability
+
+    def record_downstream(self, seconds):
+        """Registra el coste (flexión + clasificación + audio) de un frame que pasó la compuerta"""
+        with self.lock:
+            self.downstream.append(seconds)
+
+    def reset_stats(self):
+        """Reinicia los contadores de servicio"""
+        self.frames_seen = 0
+        self.frames_rejected = 0
+        self.gate_seconds = 0.0
+        self.downstream = deque(maxlen=1000)
+
+    def get_stats(self):
+        """
+        Estadísticas de servicio
+
+        Returns:
+            dict: frames vistos/filtrados, µs medios de la compuerta, ms medios
+                del trabajo posterior y ms ahorrados (estimados: filtrados × coste medio)
+        """
+        with self.lock:
+            downstream_ms = float(np.mean(self.downstream)) * 1000 if self.downstream else 0.0
+            seen = self.frames_seen
+            return {
+                'frames_seen': seen,
+                'frames_rejected': self.frames_rejected,
+                'rejected_ratio': self.frames_rejected / seen if seen else 0.0,
+                'gate_us': self.gate_seconds / seen * 1e6 if seen else 0.0,
+                'downstream_ms': downstream_ms,
+                'saved_ms': self.frames_rejected * downstream_ms
+            }
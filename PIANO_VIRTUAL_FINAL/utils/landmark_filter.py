@@ -0,0 +1,103 @@
+"""
+Filtrado de landmarks por sesión
+landmark_filter.py - Filtro One-Euro vectorizado sobre (21, 3) con predicción a corto plazo
+
+El jitter de MediaPipe en la punta del índice hace que determine_note_from_position
+salte entre teclas vecinas. El filtro One-Euro suaviza mucho cuando la mano
+está quieta (corte bajo) y casi nada cuando se mueve rápido (el corte sube
+con la velocidad), así que no añade retardo en los cambios de tecla.
+
+La derivada filtrada permite además extrapolar la posición unos milisegundos
+para compensar la latencia de proceso, lo que permite bajar los FPS del
+cliente sin perder precisión de tecla.
+"""
+
+import math
+
+import numpy as np
+
+class OneEuroFilter:
+    """
+    Filtro One-Euro para un array de landmarks normalizados
+
+    Guarda estado entre frames y no es thread-safe: app.py lo usa por sesión
+    bajo ClientSession.frame_lock, que procesa un frame de cada cliente a la vez.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0):
+        """
+        Args:
+            min_cutoff: Frecuencia de corte mínima (Hz) con la mano quieta
+            beta: Aumento del corte por unidad de velocidad (coordenadas/s)
+            d_cutoff: Frecuencia de corte de la derivada (Hz)
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Olvida el estado (mano perdida o mano distinta)"""
+        self.value = None
+        self.derivative = None
+        self.timestamp = None
+        self.key = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        """Factor de suavizado exponencial para una frecuencia de corte"""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, landmarks, timestamp, key=None):
+        """
+        Filtra un nuevo frame
+
+        Args:
+            landmarks: numpy.ndarray (21, 3) (o cualquier forma constante)
+            timestamp: Instante del frame en segundos
+            key: Identidad de la mano (p. ej. 'Left'); si cambia se reinicia el filtro
+
+        Returns:
+            numpy.ndarray: Landmarks filtrados (float32)
+        """
+        x = np.asarray(landmarks, dtype=np.float32)
+
+        if self.value is None or key != self.key or self.value.shape != x.shape:
+            self.value = x.copy()
+            self.derivative = np.zeros_like(x)
+            self.timestamp = timestamp
+            self.key = key
+            return self.value.copy()
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            # Frame repetido o fuera de orden: no retrocede el estado
+            return self.value.copy()
+        self.timestamp = timestamp
+
+        # Derivada suavizada con corte fijo
+        raw_derivative = (x - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative += a_d * (raw_derivative - self.derivative)
+
+        # Corte adaptativo por coordenada según la velocidad
+        cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+        self.value += alpha * (x - self.value)
+        return self.value.copy()
+
+    def predict(self, horizon_s):
+        """
+        Extrapola la posición filtrada con la velocidad filtrada
+
+        Args:
+            horizon_s: Horizonte de predicción en segundos
+
+        Returns:
+            numpy.ndarray: Landmarks predichos o None si no hay estado
+        """
+        if self.value is None:
+            return None
+        return self.value + self.derivative * horizon_s
@@ -0,0 +1,118 @@
+"""
+Transformaciones de coordenadas en el espacio de landmarks
+landmark_transform.py - Espejo, rotación, recorte y escala aplicados después del tracking
+
+Antes se volteaba la imagen completa (cv2.flip) solo para que las x de los
+landmarks salieran espejadas para la UI y para detect_navigation_gesture.
+Espejar un array (21, 3) cuesta mucho menos que voltear un frame 1280×720:
+MediaPipe procesa el frame tal cual llega y aquí se transforman los landmarks.
+
+Nota: MediaPipe asigna la lateralidad ('Left'/'Right') suponiendo una imagen
+espejada (cámara frontal); si no se voltea la imagen, las etiquetas se
+intercambian para conservar el mismo significado que con cv2.flip.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from utils.features_utils import landmarks_to_array
+
+# Punto con la misma interfaz (.x, .y, .z) que los landmarks de MediaPipe
+LandmarkPoint = namedtuple('LandmarkPoint', ['x', 'y', 'z'])
+
+SWAPPED_HANDEDNESS = {'Left': 'Right', 'Right': 'Left'}
+
+class LandmarkTransform:
+    """Transformación de landmarks normalizados (imagen de entrada → coordenadas de la UI)"""
+
+    def __init__(self, mirror=True, rotation=0, offset=(0.0, 0.0), scale=1.0):
+        """
+        Args:
+            mirror: Espejar horizontalmente (equivale a cv2.flip(frame, 1))
+            rotation: Rotación en grados (sentido horario en pantalla) a aplicar
+            offset: Origen (x, y) normalizado del recorte dentro del frame completo
+            scale: Tamaño del recorte relativo al frame completo
+        """
+        self.mirror = mirror
+        self.rotation = rotation
+        self.offset = offset
+        self.scale = scale
+
+    def apply(self, landmarks, width=1, height=1):
+        """
+        Transforma uno o varios conjuntos de landmarks
+
+        Args:
+            landmarks: numpy.ndarray (..., 21, 3) con x, y, z normalizados
+            width: Ancho del frame (solo necesario para rotaciones)
+            height: Alto del frame (solo necesario para rotaciones)
+
+        Returns:
+            numpy.ndarray: Copia transformada con la misma forma
+        """
+        points = np.array(landmarks, dtype=np.float32)
+        x = points[..., 0]
+        y = points[..., 1]
+
+        # Recorte → coordenadas del frame completo
+        if self.scale != 1.0 or tuple(self.offset) != (0.0, 0.0):
+            x *= self.scale
+            x += self.offset[0]
+            y *= self.scale
+            y += self.offset[1]
+            points[..., 2] *= self.scale
+
+        # Rotación alrededor del centro, en píxeles para respetar la relación de aspecto
+        if self.rotation % 360:
+            angle = np.deg2rad(self.rotation)
+            cos_a, sin_a = np.cos(angle), np.sin(angle)
+            px = (x - 0.5) * width
+            py = (y - 0.5) * height
+            x[...] = (px * cos_a - py * sin_a) / width + 0.5
+            y[...] = (px * sin_a + py * cos_a) / height + 0.5
+
+        # Espejo horizontal
+        if self.mirror:
+            np.subtract(1.0, x, out=x)
+
+        return points
+
+    def apply_handedness(self, label):
+        """Etiqueta de lateralidad equivalente tras la transformación"""
+        if self.mirror:
+            return SWAPPED_HANDEDNESS.get(label, label)
+        return label
+
+    def transform_results(self, results, width=1, height=1):
+        """
+        Transforma la salida de hands.process
+
+        Args:
+            results: Resultado de MediaPipe Hands
+            width: Ancho del frame
+            height: Alto del frame
+
+        Returns:
+            list: [(etiqueta, array (21, 3)), ...] en el orden de MediaPipe
+        """
+        if not results.multi_hand_landmarks:
+            return []
+
+        hands = np.stack([landmarks_to_array(hand.landmark) for hand in results.multi_hand_landmarks])
+        hands = self.apply(hands, width, height)
+
+        labels = [None] * len(hands)
+        if results.multi_handedness:
+            for i, handedness in enumerate(results.multi_handedness[:len(hands)]):
+                labels[i] = self.apply_handedness(handedness.classification[0].label)
+        return list(zip(labels, hands))
+
+def to_landmark_points(landmarks):
+    """
+    Convierte un array (21, 3) en una lista de LandmarkPoint
+
+    Permite usar las funciones existentes (is_finger_bent,
+    detect_navigation_gesture, ...) que acceden a landmark.x / .y / .z.
+    """
+    return [LandmarkPoint(float(x), float(y), float(z)) for x, y, z in landmarks]
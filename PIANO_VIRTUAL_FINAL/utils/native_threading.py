@@ -0,0 +1,169 @@
+"""
+Primitivas de hilos reales del sistema
+native_threading.py - Locks, señales e hilos que no sustituye el monkey patching de eventlet/gevent
+
+Con PIANO_ASYNC_MODE=eventlet|gevent, app.py parchea `threading` antes de
+importar el resto de módulos: threading.Lock/Event/Thread pasan a ser
+primitivas verdes. El trabajo CPU-bound corre en hilos reales (tpool o el
+threadpool de gevent) y un Event verde activado desde esos hilos no
+despierta al que espera en el hub, y un lock verde compartido entre hilos
+reales no es seguro. Este módulo construye las primitivas sobre las
+funciones originales de `_thread`, válidas desde cualquier hilo.
+"""
+
+import _thread
+import sys
+from contextlib import contextmanager
+
+def green_mode():
+    """
+    Librería que ha parcheado los hilos
+
+    Returns:
+        str: 'eventlet', 'gevent' o None (threading normal)
+    """
+    if 'eventlet' in sys.modules:
+        from eventlet import patcher
+        if patcher.is_monkey_patched('thread'):
+            return 'eventlet'
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            return 'gevent'
+    return None
+
+def _original_thread_functions():
+    """(allocate_lock, start_new_thread) sin parchear"""
+    mode = green_mode()
+    if mode == 'eventlet':
+        from eventlet.patcher import original
+        module = original('_thread')
+        return module.allocate_lock, module.start_new_thread
+    if mode == 'gevent':
+        from gevent.monkey import get_original
+        return tuple(get_original('_thread', ['allocate_lock', 'start_new_thread']))
+    return _thread.allocate_lock, _thread.start_new_thread
+
+def allocate_lock():
+    """Lock del sistema (sustituto de threading.Lock)"""
+    return _original_thread_functions()[0]()
+
+class NativeEvent:
+    """
+    Señal de despertar entre hilos reales (semáforo binario sobre un lock nativo)
+
+    Misma interfaz que threading.Event para el uso del motor de audio:
+    set() desde cualquier hilo, wait(timeout) y clear() en el consumidor.
+    """
+
+    def __init__(self):
+        self._signal = allocate_lock()
+        self._signal.acquire()  # Bloqueado = sin señal
+
+    def set(self):
+        try:
+            self._signal.release()
+        except RuntimeError:
+            pass  # Ya estaba señalado
+
+    def wait(self, timeout=None):
+        """Espera la señal y la consume; True si llegó antes del timeout"""
+        return self._signal.acquire(True, -1 if timeout is None else timeout)
+
+    def clear(self):
+        self._signal.acquire(False)
+
+class NativeThread:
+    """Hilo real del sistema con start/join (sustituto de threading.Thread)"""
+
+    def __init__(self, target, args=()):
+        self.target = target
+        self.args = args
+        self._finished = NativeEvent()
+
+    def _run(self):
+        try:
+            self.target(*self.args)
+        finally:
+            self._finished.set()
+
+    def start(self):
+        _original_thread_functions()[1](self._run, ())
+        return self
+
+    def join(self, timeout=None):
+        if self._finished.wait(timeout):
+            self._finished.set()  # Otros join también deben volver
+
+class ResourcePool:
+    """
+    Pool de objetos no thread-safe (p. ej. detectores de MediaPipe) para hilos reales
+
+    Cada hilo toma un objeto libre o crea uno nuevo hasta `size`; si todos
+    están ocupados espera a que se libere alguno. Así hasta `size` hilos
+    trabajan en paralelo sin compartir el estado interno de un objeto.
+    """
+
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.size = max(1, size)
+        self.lock = allocate_lock()
+        self.released = NativeEvent()
+        self.free = []
+        self.created = 0
+
+    def reset(self, factory, seed=None):
+        """Cambia la fábrica y descarta los objetos libres (solo al arrancar, sin tráfico)"""
+        with self.lock:
+            self.factory = factory
+            self.free = [seed] if seed is not None else []
+            self.created = len(self.free)
+
+    def acquire(self):
+        """Toma un objeto libre, crea uno nuevo o espera a que se libere"""
+        while True:
+            with self.lock:
+                if self.free:
+                    return self.free.pop()
+                create = self.created < self.size
+                if create:
+                    self.created += 1
+            if create:
+                try:
+                    return self.factory()
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+            self.released.wait(0.05)
+
+    def release(self, item):
+        """Devuelve un objeto al pool"""
+        with self.lock:
+            self.free.append(item)
+        self.released.set()
+
+    @contextmanager
+    def borrow(self):
+        """with pool.borrow() as item: ... (lo devuelve siempre)"""
+        item = self.acquire()
+        try:
+            yield item
+        finally:
+            self.release(item)
+
+def run_blocking(func, *args):
+    """
+    Ejecuta una llamada bloqueante (E/S de bajo nivel) sin congelar el hub
+
+    En eventlet/gevent la delega a un hilo real del pool; en threading la
+    llama directamente.
+    """
+    mode = green_mode()
+    if mode == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(func, *args)
+    if mode == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args)
+    return func(*args)
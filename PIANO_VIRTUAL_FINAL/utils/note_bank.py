@@ -0,0 +1,171 @@
+"""
+Banco de notas en memoria para el Piano Virtual
+note_bank.py - Carga todos los samples al inicio y sintetiza los que faltan
+
+La rejilla completa es de 5 octavas (2-6) × 12 semitonos. Los huecos se
+rellenan re-muestreando el sample existente más cercano, así cualquier nota
+se resuelve con una búsqueda O(1) en un diccionario, sin tocar el disco.
+"""
+
+import io
+import os
+import time
+import wave
+
+import numpy as np
+import pygame
+
+# Mismos nombres que hands_utils.get_note_from_finger_position
+NOTES_PER_OCTAVE = ['DO', 'DOS', 'RE', 'RES', 'MI', 'FA', 'FAS', 'SOL', 'SOLS', 'LA', 'LAS', 'SI']
+MIN_OCTAVE = 2
+MAX_OCTAVE = 6
+
+def normalize_note_name(note):
+    """Normaliza 'do#4', 'DOS4' o 'DO#4' a la forma 'DOS4'"""
+    return note.strip().upper().replace('#', 'S')
+
+def note_to_semitone(note):
+    """
+    Convierte una nota a índice de semitono absoluto (DO2 = 0)
+
+    Returns:
+        int: Semitono o None si la nota no es válida
+    """
+    note = normalize_note_name(note)
+    if not note or not note[-1].isdigit():
+        return None
+    name, octave = note[:-1], int(note[-1])
+    if name not in NOTES_PER_OCTAVE:
+        return None
+    return (octave - MIN_OCTAVE) * 12 + NOTES_PER_OCTAVE.index(name)
+
+def semitone_to_note(semitone):
+    """Convierte un índice de semitono absoluto a nombre de nota"""
+    octave, index = divmod(semitone, 12)
+    return f"{NOTES_PER_OCTAVE[index]}{octave + MIN_OCTAVE}"
+
+def resample_pitch(samples, semitones):
+    """
+    Desplaza el tono de un sample re-muestreándolo (interpolación lineal vectorizada)
+
+    Args:
+        samples: Array int16 (n,) o (n, canales)
+        semitones: Desplazamiento en semitonos (positivo = más agudo)
+
+    Returns:
+        numpy.ndarray: Array int16 con el tono desplazado
+    """
+    ratio = 2.0 ** (semitones / 12.0)
+    n_in = samples.shape[0]
+    n_out = max(1, int(n_in / ratio))
+
+    positions = np.arange(n_out, dtype=np.float64) * ratio
+    left = positions.astype(np.int64)
+    np.minimum(left, n_in - 1, out=left)
+    right = np.minimum(left + 1, n_in - 1)
+    frac = (positions - left).astype(np.float32)
+    if samples.ndim > 1:
+        frac = frac[:, np.newaxis]
+
+    source = samples.astype(np.float32, copy=False)
+    result = source[left] + (source[right] - source[left]) * frac
+    return np.clip(result, -32768, 32767).astype(np.int16)
+
+class NoteBank:
+    """Banco de notas precargadas (pygame.mixer.Sound por nota)"""
+
+    def __init__(self):
+        self.sounds = {}        # nota normalizada -> Sound
+        self.synthesized = []   # notas generadas por re-muestreo
+        self.build_seconds = 0.0
+        self.wav_cache = {}     # nota normalizada -> bytes WAV (para el navegador)
+
+    def build(self, audio_root):
+        """
+        Carga los samples de octava2..octava6 y rellena los huecos
+
+        Args:
+            audio_root: Carpeta con las subcarpetas octavaN
+
+        Returns:
+            NoteBank: self
+        """
+        start = time.perf_counter()
+        originals = {}  # semitono -> array int16
+
+        for octave in range(MIN_OCTAVE, MAX_OCTAVE + 1):
+            octave_dir = os.path.join(audio_root, f"octava{octave}")
+            if not os.path.isdir(octave_dir):
+                continue
+            for file in os.listdir(octave_dir):
+                if not file.lower().endswith('.wav'):
+                    continue
+                note = normalize_note_name(os.path.splitext(file)[0])
+                semitone = note_to_semitone(note)
+                if semitone is None:
+                    continue
+                try:
+                    sound = pygame.mixer.Sound(os.path.join(octave_dir, file))
+                except Exception as e:
+                    print(f"⚠️ No se pudo cargar {file}: {e}")
+                    continue
+                self.sounds[note] = sound
+                originals[semitone] = pygame.sndarray.array(sound)
+
+        total = (MAX_OCTAVE - MIN_OCTAVE + 1) * 12
+        missing = [s for s in range(total) if s not in originals]
+
+        if originals and missing:
+            available = np.array(sorted(originals))
+            for semitone in missing:
+                # Sample existente más cercano (preferir el grave en empates)
+                nearest = int(available[np.argmin(np.abs(available - semitone))])
+                shifted = resample_pitch(originals[nearest], semitone - nearest)
+                note = semitone_to_note(semitone)
+                self.sounds[note] = pygame.sndarray.make_sound(np.ascontiguousarray(shifted))
+                self.synthesized.append(note)
+
+        self.build_seconds = time.perf_counter() - start
+        print(f"🎼 Banco de notas: {len(originals)} samples, {len(self.synthesized)} sintetizados "
+              f"({self.build_seconds * 1000:.0f} ms)")
+        return self
+
+    def get(self, note):
+        """Devuelve el Sound de una nota o None (O(1))"""
+        return self.sounds.get(normalize_note_name(note))
+
+    def __contains__(self, note):
+        return normalize_note_name(note) in self.sounds
+
+    def __len__(self):
+        return len(self.sounds)
+
+    def get_wav_bytes(self, note):
+        """
+        Devuelve el sample de una nota codificado como WAV (para el modo cliente)
+
+        Incluye las notas sintetizadas, que no existen en disco.
+
+        Args:
+            note: Nota (ej. "DOS4")
+
+        Returns:
+            bytes: Archivo WAV o None si la nota no está en el banco
+        """
+        note = normalize_note_name(note)
+        if note in self.wav_cache:
+            return self.wav_cache[note]
+        sound = self.sounds.get(note)
+        if sound is None:
+            return None
+
+        frequency, size, channels = pygame.mixer.get_init()
+        samples = pygame.sndarray.array(sound).astype(np.int16)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(frequency)
+            wav.writeframes(np.ascontiguousarray(samples).tobytes())
+        self.wav_cache[note] = buffer.getvalue()
+        return self.wav_cache[note]
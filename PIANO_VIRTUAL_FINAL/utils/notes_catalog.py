@@ -0,0 +1,109 @@
+"""
+Catálogo de notas disponibles para el Piano Virtual
+notes_catalog.py - Se construye una vez y se invalida cuando cambian las carpetas
+
+Sustituye los os.listdir de octava2..octava6 que se hacían en cada petición.
+El catálogo guarda el cuerpo JSON ya serializado junto con su ETag y
+Last-Modified para que el navegador pueda recibir 304 Not Modified.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import Response
+
+class NotesCatalog:
+    """Catálogo de notas con detección de cambios por mtime"""
+
+    def __init__(self, audio_root, min_octave=2, max_octave=6, check_interval=1.0):
+        self.audio_root = audio_root
+        self.octave_dirs = [os.path.join(audio_root, f"octava{octave}")
+                            for octave in range(min_octave, max_octave + 1)]
+        self.check_interval = check_interval
+
+        self.lock = threading.Lock()
+        self.signature = None
+        self.last_check = 0.0
+
+        self.notes = []
+        self.body = b''
+        self.etag = ''
+        self.last_modified = None
+
+    def _directory_signature(self):
+        """mtime de cada carpeta: cambia al añadir, borrar o renombrar archivos"""
+        signature = []
+        for directory in [self.audio_root] + self.octave_dirs:
+            try:
+                signature.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _rebuild(self, signature):
+        notes = []
+        for octave_dir in self.octave_dirs:
+            if os.path.isdir(octave_dir):
+                notes.extend(os.path.splitext(f)[0] for f in os.listdir(octave_dir) if f.endswith('.wav'))
+
+        self.notes = sorted(notes)
+        self.body = json.dumps({'notes': self.notes}).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        newest = max((m for m in signature if m is not None), default=time.time_ns())
+        self.last_modified = datetime.fromtimestamp(newest / 1e9, tz=timezone.utc)
+        self.signature = signature
+        print(f"🗂️ Catálogo de notas actualizado: {len(self.notes)} notas")
+
+    def refresh(self, force=False):
+        """Reconstruye el catálogo si las carpetas cambiaron (como mucho una vez por intervalo)"""
+        now = time.monotonic()
+        if not force and self.signature is not None and now - self.last_check < self.check_interval:
+            return
+        with self.lock:
+            self.last_check = now
+            signature = self._directory_signature()
+            if force or signature != self.signature:
+                self._rebuild(signature)
+
+    def get_notes(self):
+        """
+        Obtiene la lista ordenada de notas disponibles
+
+        Returns:
+            list: Nombres de notas (ej. ['DO2', 'DOS2', ...])
+        """
+        self.refresh()
+        return self.notes
+
+    def json_response(self, request):
+        """
+        Respuesta HTTP precomputada con ETag / Last-Modified
+
+        Args:
+            request: Petición Flask actual (para If-None-Match / If-Modified-Since)
+
+        Returns:
+            flask.Response: 200 con el catálogo o 304 si el cliente ya lo tiene
+        """
+        self.refresh()
+        response = Response(self.body, mimetype='application/json')
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        response.cache_control.no_cache = True  # Revalidar siempre (barato gracias al 304)
+        return response.make_conditional(request)
+
+# Un catálogo por carpeta de audio
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_notes_catalog(audio_root):
+    """Obtiene el catálogo compartido de una carpeta de audio"""
+    audio_root = os.path.abspath(audio_root)
+    with _catalogs_lock:
+        if audio_root not in _catalogs:
+            _catalogs[audio_root] = NotesCatalog(audio_root)
+        return _catalogs[audio_root]
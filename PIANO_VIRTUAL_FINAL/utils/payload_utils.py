@@ -0,0 +1,72 @@
+"""
+Codificación compacta de landmarks para frame_processed
+payload_utils.py - Keyframes int16 y deltas int8 cuantizados
+
+Formato binario (little-endian):
+    keyframe: 21 × 3 int16 = 126 bytes, valor = round(coordenada × scale)
+    delta:    21 × 3 int8  =  63 bytes, diferencia con el frame anterior cuantizado
+
+Los deltas se calculan sobre los valores ya cuantizados, así el cliente
+reconstruye exactamente lo mismo que el servidor y no se acumula error.
+"""
+
+import numpy as np
+
+DEFAULT_SCALE = 16384          # Resolución 1/16384 en coordenadas normalizadas
+DEFAULT_KEYFRAME_INTERVAL = 30
+
+class LandmarkDeltaEncoder:
+    """Codificador de landmarks (21, 3) por sesión"""
+
+    def __init__(self, scale=DEFAULT_SCALE, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.scale = scale
+        self.keyframe_interval = keyframe_interval
+        self.previous = None
+        self.frames_since_keyframe = 0
+
+    def reset(self):
+        """Fuerza un keyframe en el siguiente frame (p. ej. la mano desapareció)"""
+        self.previous = None
+        self.frames_since_keyframe = 0
+
+    def encode(self, landmarks):
+        """
+        Codifica un array de landmarks normalizados
+
+        Args:
+            landmarks: numpy.ndarray (21, 3) con x, y, z normalizados
+
+        Returns:
+            tuple: (bytes, dict con el tipo de frame)
+        """
+        quantized = np.clip(np.rint(landmarks * self.scale), -32768, 32767).astype('<i2')
+
+        if self.previous is not None and self.frames_since_keyframe < self.keyframe_interval:
+            delta = quantized.astype(np.int32) - self.previous
+            if delta.min() >= -128 and delta.max() <= 127:
+                self.previous = quantized.astype(np.int32)
+                self.frames_since_keyframe += 1
+                return delta.astype(np.int8).tobytes(), {'type': 'delta'}
+
+        self.previous = quantized.astype(np.int32)
+        self.frames_since_keyframe = 1
+        return quantized.tobytes(), {'type': 'key'}
+
+def decode_landmarks(packed, frame_type, previous, scale=DEFAULT_SCALE):
+    """
+    Decodificador de referencia (mismo algoritmo que decodeLandmarks en templates/index.html)
+
+    Args:
+        packed: bytes recibidos
+        frame_type: 'key' o 'delta'
+        previous: Valores cuantizados anteriores (int32 (21, 3)) o None
+        scale: Escala de cuantización
+
+    Returns:
+        tuple: (landmarks float32 (21, 3), valores cuantizados int32)
+    """
+    if frame_type == 'key':
+        quantized = np.frombuffer(packed, dtype='<i2').reshape(21, 3).astype(np.int32)
+    else:
+        quantized = previous + np.frombuffer(packed, dtype=np.int8).reshape(21, 3)
+    return (quantized / scale).astype(np.float32), quantized
@@ -0,0 +1,158 @@
+"""
+Clasificador por prototipos sobre el dataset capturado
+prototype_classifier.py - Centroides por clase o k-NN (KD-tree) con confianza por distancia
+
+Se construye al arrancar con los gesture_data que ya carga app.py y sirve
+de fallback rápido (decenas de µs por mano) cuando el modelo profesional
+no está cargado o no llega al umbral de confianza, antes de recurrir a
+la posición geométrica del índice.
+
+Las features salen del mismo FeaturePipeline que el modelo (raw-1 por
+defecto: la posición en la imagen decide la tecla) y se estandarizan con
+la media y desviación del propio dataset. Las muestras NEGATIVE forman una
+clase de rechazo: si gana, no se toca ninguna nota.
+
+Confianza (× penalización si el ganador está más lejos que el radio
+típico de su clase):
+    - centroid: gana el centroide más cercano; reparto d2 / (d1 + d2) con
+      el segundo más cercano (un voto entre k centroides, uno por clase,
+      casi nunca llegaría al umbral)
+    - knn: reparto de votos (inverso de la distancia) entre los k vecinos
+"""
+
+import numpy as np
+
+from utils.features_utils import landmarks_to_array
+from utils.feature_pipeline import FeaturePipeline, RAW_VERSION
+from utils.gesture_features import as_hand_array
+
+REJECT_LABEL = "__NEGATIVE__"  # Clase de los gestos negativos (no tocar)
+
+class PrototypeClassifier:
+    """Clasificador de notas por centroides o vecinos más cercanos"""
+
+    def __init__(self, mode="centroid", k=5, pipeline=None):
+        if mode not in ("centroid", "knn"):
+            raise ValueError(f"Modo de prototipos desconocido: {mode}")
+        self.mode = mode
+        self.k = k
+        self.pipeline = pipeline or FeaturePipeline(RAW_VERSION)
+        self.classes = []
+        self.n_samples = 0
+
+    def fit(self, hands, labels):
+        """
+        Construye los prototipos
+
+        Args:
+            hands: Array (N, 21, 3) de landmarks
+            labels: Secuencia (N,) de etiquetas (REJECT_LABEL para negativos)
+        """
+        features = self.pipeline.transform(hands)
+        self.mean = features.mean(axis=0)
+        self.std = np.maximum(features.std(axis=0), 1e-6)
+        features = (features - self.mean) / self.std
+
+        self.classes, label_index = np.unique(np.asarray(labels), return_inverse=True)
+        self.classes = list(self.classes)
+        self.n_samples = len(features)
+
+        # Centroides (C, F) y radio típico de cada clase (percentil 90 de la distancia al centroide)
+        counts = np.bincount(label_index, minlength=len(self.classes))
+        self.centroids = np.zeros((len(self.classes), features.shape[1]), dtype=np.float32)
+        np.add.at(self.centroids, label_index, features)
+        self.centroids /= counts[:, None]
+        distances = np.linalg.norm(features - self.centroids[label_index], axis=1)
+        self.radius = np.array([np.percentile(distances[label_index == c], 90) if counts[c] else 1.0
+                                for c in range(len(self.classes))], dtype=np.float32)
+        self.radius = np.maximum(self.radius, 1e-3)
+
+        if self.mode == "knn":
+            from scipy.spatial import cKDTree
+            self.tree = cKDTree(features)
+            self.sample_labels = label_index
+        return self
+
+    @classmethod
+    def from_gesture_data(cls, gesture_data, mode="centroid", k=5, pipeline=None):
+        """
+        Construye el clasificador con las muestras de captura_notas.py
+
+        Usa cada mano presente de las muestras POSITIVE (etiqueta = nota) y
+        NEGATIVE (REJECT_LABEL); la navegación no interviene.
+
+        Returns:
+            PrototypeClassifier o None si no hay muestras utilizables
+        """
+        hands, labels = [], []
+        for sample in gesture_data:
+            category = sample.get('gesture_category', 'POSITIVE')
+            if category == 'NAVIGATION':
+                continue
+            label = REJECT_LABEL if category == 'NEGATIVE' else sample.get('target_note_or_chord')
+            if not label:
+                continue
+            for key in ('landmarks_left_hand', 'landmarks_right_hand'):
+                array = landmarks_to_array(sample.get(key) or None)
+                if array is not None:
+                    hands.append(array)
+                    labels.append(label)
+        if not hands or len(set(labels) - {REJECT_LABEL}) == 0:
+            return None
+        return cls(mode, k, pipeline).fit(np.stack(hands), labels)
+
+    def predict(self, hands):
+        """
+        Clase y confianza de varias manos
+
+        Args:
+            hands: Array (H, 21, 3)
+
+        Returns:
+            tuple: (etiquetas (H,) list, confianzas (H,) numpy.ndarray)
+        """
+        features = (self.pipeline.transform(hands) - self.mean) / self.std
+
+        if self.mode == "centroid":
+            # Centroide más cercano; confianza por la distancia relativa al segundo
+            distances = np.linalg.norm(features[:, None, :] - self.centroids[None], axis=2)  # (H, C)
+            nearest = np.argsort(distances, axis=1)[:, :2]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            best = nearest[:, 0]
+            if nearest.shape[1] > 1:
+                share = nearest_distances[:, 1] / (nearest_distances.sum(axis=1) + 1e-6)
+            else:
+                share = np.ones(len(features))
+        else:
+            k = min(self.k, self.n_samples)
+            nearest_distances, neighbours = self.tree.query(features, k=k)
+            nearest_distances = nearest_distances.reshape(len(features), k)
+            candidates = self.sample_labels[neighbours.reshape(len(features), k)]
+
+            # Votos ponderados por el inverso de la distancia
+            weights = 1.0 / (nearest_distances + 1e-6)
+            votes = np.zeros((len(features), len(self.classes)), dtype=np.float64)
+            np.add.at(votes, (np.arange(len(features))[:, None], candidates), weights)
+            best = votes.argmax(axis=1)
+            share = votes[np.arange(len(features)), best] / votes.sum(axis=1)
+
+        # Penalizar si el prototipo ganador está fuera del radio típico de su clase
+        best_distance = np.linalg.norm(features - self.centroids[best], axis=1)
+        excess = np.maximum(0.0, best_distance / self.radius[best] - 1.0)
+        confidences = share * np.exp(-excess)
+        return [self.classes[i] for i in best], confidences
+
+    def predict_one(self, landmarks):
+        """
+        Nota de una mano
+
+        Returns:
+            tuple: (nota o None, confianza); None también si gana la clase de rechazo
+        """
+        hands = as_hand_array(landmarks)
+        if hands is None:
+            return None, 0.0
+        labels, confidences = self.predict(hands[:1])
+        if labels[0] == REJECT_LABEL:
+            return None, float(confidences[0])
+        return labels[0], float(confidences[0])
@@ -0,0 +1,111 @@
+"""
+Estado por cliente para el Piano Virtual
+session_utils.py - Una ClientSession por conexión Socket.IO (request.sid)
+"""
+
+import json
+import os
+import threading
+
+from utils.payload_utils import LandmarkDeltaEncoder
+from utils.adaptive_utils import AdaptiveController
+from utils.landmark_transform import LandmarkTransform
+from utils.gesture_features import FingerBendDetector
+from utils.landmark_filter import OneEuroFilter
+from utils.native_threading import allocate_lock
+from config import (FINGER_BEND_THRESHOLDS, FINGER_BEND_HYSTERESIS, LANDMARK_FILTER_MIN_CUTOFF,
+                    LANDMARK_FILTER_BETA, LANDMARK_FILTER_D_CUTOFF)
+
+# Formatos de respuesta de frame_processed
+PAYLOAD_FORMATS = ('json', 'compact')
+
+# Carpeta donde grabar los landmarks de cada sesión (None = desactivado)
+_record_dir = None
+
+class ClientSession:
+    """Estado de un cliente conectado"""
+
+    def __init__(self, sid):
+        self.sid = sid
+        self.payload_format = 'json'  # Formato original hasta que el cliente negocie
+        self.encoder = LandmarkDeltaEncoder()
+        self.adaptive = AdaptiveController()
+        self.transform = LandmarkTransform(mirror=True)  # Vista espejo (cámara frontal)
+        self.bend_detector = FingerBendDetector(FINGER_BEND_THRESHOLDS, FINGER_BEND_HYSTERESIS)
+        self.landmark_filter = OneEuroFilter(LANDMARK_FILTER_MIN_CUTOFF, LANDMARK_FILTER_BETA,
+                                             LANDMARK_FILTER_D_CUTOFF)
+        self.recording = None
+        self.frames_processed = 0
+        # Un frame a la vez: encoder, filtro y detector de flexión guardan estado
+        # entre frames y las respuestas deben salir en orden. Lock nativo porque
+        # se libera tras el trabajo en un hilo real (run_cpu_bound)
+        self.frame_lock = allocate_lock()
+
+    def configure(self, options):
+        """
+        Aplica las opciones negociadas por el cliente
+
+        Args:
+            options: dict enviado en el evento 'configure'
+
+        Returns:
+            dict: Configuración efectiva
+        """
+        payload_format = options.get('format', self.payload_format)
+        if payload_format in PAYLOAD_FORMATS:
+            self.payload_format = payload_format
+        if 'keyframe_interval' in options:
+            self.encoder.keyframe_interval = max(1, int(options['keyframe_interval']))
+        if 'mirror' in options:
+            self.transform.mirror = bool(options['mirror'])
+        if 'rotation' in options:
+            self.transform.rotation = int(options['rotation'])
+        self.encoder.reset()
+        return {'format': self.payload_format,
+                'keyframe_interval': self.encoder.keyframe_interval,
+                'scale': self.encoder.scale,
+                'mirror': self.transform.mirror,
+                'rotation': self.transform.rotation}
+
+    def record_landmarks(self, timestamp, landmarks):
+        """Añade un frame (sin filtrar) a la grabación de la sesión, si está activada"""
+        if _record_dir is None:
+            return
+        if self.recording is None:
+            self.recording = open(os.path.join(_record_dir, f"{self.sid}.jsonl"), 'a', encoding='utf-8')
+        self.recording.write(json.dumps({'t': timestamp, 'landmarks': landmarks.tolist()}) + '\n')
+
+    def close(self):
+        """Libera los recursos de la sesión"""
+        if self.recording is not None:
+            self.recording.close()
+            self.recording = None
+
+# Registro de sesiones activas
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(sid):
+    """Obtiene (o crea) la sesión de un cliente"""
+    with _sessions_lock:
+        session = _sessions.get(sid)
+        if session is None:
+            session = _sessions[sid] = ClientSession(sid)
+        return session
+
+def drop_session(sid):
+    """Elimina la sesión de un cliente desconectado"""
+    with _sessions_lock:
+        session = _sessions.pop(sid, None)
+    if session is not None:
+        session.close()
+
+def set_record_dir(path):
+    """Activa la grabación de landmarks por sesión en `path`"""
+    global _record_dir
+    os.makedirs(path, exist_ok=True)
+    _record_dir = path
+
+def count_sessions():
+    """Número de sesiones activas"""
+    return len(_sessions)